@@ -17,11 +17,19 @@ class BaseAdapter(DiffSync):
 
     settings_class = None
     settings = None
+    limit = None
 
-    def __init__(self, nornir, settings):
-        """Initialize the base adapter and store the Nornir object locally."""
+    def __init__(self, nornir, settings, limit=None):
+        """Initialize the base adapter and store the Nornir object locally.
+
+        Args:
+            nornir (Nornir): Nornir object with the inventory to load
+            settings (dict): settings specific to this adapter
+            limit (str, optional): limit applied to the inventory, if any
+        """
         super().__init__()
         self.nornir = nornir
+        self.limit = limit
         self.settings = self._validate_settings(settings)
 
     def _validate_settings(self, settings):
@@ -38,6 +46,33 @@ class BaseAdapter(DiffSync):
         """Load the local cache with data from the remove system."""
         raise NotImplementedError
 
+    def prepare_sync(self, diff):
+        """Prepare the adapter before a diff is applied to it, nothing to do by default.
+
+        Args:
+            diff (Diff): diff that will be applied to this adapter
+        """
+
+    @classmethod
+    def get_diff_elements(cls, elements, obj_type, actions=("create",)):
+        """Find the elements of a given type and action in a diff, at any level.
+
+        Args:
+            elements (Diff|DiffElement): diff or element to search
+            obj_type (str): type of the elements to find
+            actions (tuple, optional): actions of the elements to find. Defaults to ("create",).
+
+        Returns:
+            list: DiffElement
+        """
+        found = []
+        for element in elements.get_children():
+            if element.type == obj_type and element.action in actions:
+                found.append(element)
+            found.extend(cls.get_diff_elements(element, obj_type, actions))
+
+        return found
+
     def get_or_create_vlan(self, vlan, site=None):
         """Check if a vlan already exist before creating it. Returns the existing object if it already exist.
 
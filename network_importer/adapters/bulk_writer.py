@@ -0,0 +1,175 @@
+"""Queue the changes of the SOT models and send them in batches with the bulk API endpoints.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+import threading
+from collections import defaultdict, namedtuple
+
+LOGGER = logging.getLogger("network-importer")
+
+# Order in which the objects are created and updated, an object can only reference the objects created before
+CREATE_ORDER = ["vlan", "interface", "prefix", "ip_address", "cable"]
+DELETE_ORDER = list(reversed(CREATE_ORDER))
+
+Operation = namedtuple("Operation", ["item", "endpoint", "get_params"])
+
+
+class BulkWriter:
+    """Queue the create, update and delete operations per model type and send them in batches.
+
+    The parameters of each object are only generated when the batch is sent, after the objects it depends on
+    have been created and their remote_id has been updated. The operations can be queued from multiple threads.
+    """
+
+    def __init__(self, request_class, error_class, batch_size, **request_kwargs):
+        """Initialize the writer.
+
+        Args:
+            request_class (Request): Request class of pynetbox or pynautobot
+            error_class (Exception): RequestError class of the same library
+            batch_size (int): maximum number of objects to include in each request
+            **request_kwargs: additional arguments for the request_class
+        """
+        self.request_class = request_class
+        self.error_class = error_class
+        self.batch_size = max(batch_size, 1)
+        self.request_kwargs = request_kwargs
+
+        self.creates = defaultdict(list)
+        self.updates = defaultdict(list)
+        self.deletes = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def create(self, item, endpoint, get_params):
+        """Queue the creation of an object, its remote_id will be updated when it's created.
+
+        Args:
+            item (DiffSyncModel): object to create
+            endpoint (Endpoint): pynetbox or pynautobot endpoint
+            get_params (callable): function returning the parameters of the object in the SOT format
+        """
+        with self.lock:
+            self.creates[item.get_type()].append(Operation(item, endpoint, get_params))
+
+    def update(self, item, endpoint, get_params):
+        """Queue the update of an existing object.
+
+        Args:
+            item (DiffSyncModel): object to update
+            endpoint (Endpoint): pynetbox or pynautobot endpoint
+            get_params (callable): function returning the parameters to update in the SOT format
+        """
+        with self.lock:
+            self.updates[item.get_type()].append(Operation(item, endpoint, get_params))
+
+    def delete(self, item, endpoint):
+        """Queue the deletion of an existing object.
+
+        Args:
+            item (DiffSyncModel): object to delete
+            endpoint (Endpoint): pynetbox or pynautobot endpoint
+        """
+        with self.lock:
+            self.deletes[item.get_type()].append(Operation(item, endpoint, None))
+
+    def flush(self):
+        """Send all queued operations.
+
+        The objects are deleted first, in the reverse order, to release the resources they hold (cable terminations,
+        unique ip addresses ...) before the objects replacing them are created. Then the objects are created and
+        updated.
+        """
+        for modelname in DELETE_ORDER:
+            self._send_deletes(self.deletes.pop(modelname, []))
+
+        for modelname in CREATE_ORDER:
+            operations = self.creates.pop(modelname, [])
+            if modelname == "interface":
+                # The members of a lag must be created after the lag to reference its remote_id
+                self._send_creates([op for op in operations if not op.item.is_lag_member])
+                self._send_creates([op for op in operations if op.item.is_lag_member])
+            else:
+                self._send_creates(operations)
+
+        for modelname in CREATE_ORDER:
+            self._send_updates(self.updates.pop(modelname, []))
+
+    def _get_request(self, endpoint):
+        return self.request_class(
+            base=endpoint.url, http_session=endpoint.api.http_session, token=endpoint.token, **self.request_kwargs
+        )
+
+    def _get_batches(self, operations):
+        """Generate the params of each operation and split them in batches, the operations in error are skipped."""
+        batch = []
+        for operation in operations:
+            try:
+                params = operation.get_params() if operation.get_params else None
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Unable to prepare %s %s (%s)", operation.item.get_type(), operation.item, str(exc))
+                continue
+
+            batch.append((operation, params))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def _send(self, verb, batch, data):
+        """Send one batch, if the batch is rejected the operations are sent one by one to isolate the errors.
+
+        Returns:
+            list: response of the SOT for each operation, None for the operations that failed
+        """
+        endpoint = batch[0][0].endpoint
+        try:
+            response = self._get_request(endpoint)._make_call(verb=verb, data=data)  # pylint: disable=protected-access
+            return response if isinstance(response, list) else [response] * len(batch)
+        except self.error_class as exc:
+            if len(batch) == 1:
+                LOGGER.warning(
+                    "Unable to %s %s %s (%s)", verb, batch[0][0].item.get_type(), batch[0][0].item, exc.error
+                )
+                return [None]
+
+        LOGGER.debug("Bulk %s of %s %s failed, sending them one by one", verb, len(batch), endpoint.name)
+        return [self._send(verb, [operation], [params])[0] for operation, params in zip(batch, data)]
+
+    def _send_creates(self, operations):
+        for batch in self._get_batches(operations):
+            results = self._send("post", batch, [params for _, params in batch])
+            for (operation, _), result in zip(batch, results):
+                if result:
+                    operation.item.remote_id = result["id"]
+            LOGGER.info(
+                "Created %s %s objects in bulk", len([res for res in results if res]), batch[0][0].endpoint.name
+            )
+
+    def _send_updates(self, operations):
+        for batch in self._get_batches(operations):
+            results = self._send(
+                "patch", batch, [dict(params, id=operation.item.remote_id) for operation, params in batch]
+            )
+            LOGGER.info(
+                "Updated %s %s objects in bulk", len([res for res in results if res]), batch[0][0].endpoint.name
+            )
+
+    def _send_deletes(self, operations):
+        for batch in self._get_batches(operations):
+            results = self._send("delete", batch, [{"id": operation.item.remote_id} for operation, _ in batch])
+            LOGGER.info(
+                "Deleted %s %s objects in bulk", len([res for res in results if res]), batch[0][0].endpoint.name
+            )
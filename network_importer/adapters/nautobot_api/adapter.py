@@ -1,13 +1,23 @@
 """NautobotAPIAdapter class."""
+import os
+import hashlib
 import logging
 import warnings
+from collections import defaultdict
 
 import pynautobot
+from pynautobot.core.query import Request
 from packaging.version import Version, InvalidVersion
 
 from diffsync.exceptions import ObjectAlreadyExists, ObjectNotFound
 import network_importer.config as config  # pylint: disable=import-error
+from network_importer.http_session import get_http_session
+from network_importer.utils import fetch_all_pages
+from network_importer.exceptions import AdapterLoadFatalError  # pylint: disable=import-error
 from network_importer.adapters.base import BaseAdapter  # pylint: disable=import-error
+from network_importer.adapters.bulk_writer import BulkWriter  # pylint: disable=import-error
+from network_importer.adapters.state_cache import SOTStateCache  # pylint: disable=import-error
+from network_importer.performance import add_info  # pylint: disable=import-error
 from network_importer.adapters.nautobot_api.models import (  # pylint: disable=import-error
     NautobotSite,
     NautobotDevice,
@@ -17,6 +27,7 @@ from network_importer.adapters.nautobot_api.models import (  # pylint: disable=i
     NautobotPrefix,
     NautobotVlan,
 )
+from network_importer.adapters.nautobot_api.graphql import SITES_QUERY, GraphQLObject, convert_interface
 from network_importer.adapters.nautobot_api.tasks import query_device_info_from_nautobot
 from network_importer.adapters.nautobot_api.settings import InventorySettings, AdapterSettings
 
@@ -42,6 +53,10 @@ class NautobotAPIAdapter(BaseAdapter):
     top_level = ["site", "device", "cable"]
 
     nautobot = None
+    state_cache = None
+    bulk_writer = None
+    device_tags_pending = set()
+    missing_cable_endpoints = set()
     nautobot_version = None
 
     settings_class = AdapterSettings
@@ -103,24 +118,30 @@ class NautobotAPIAdapter(BaseAdapter):
         """Initialize pynautobot and load all data from nautobot in the local cache."""
         inventory_settings = InventorySettings(**config.SETTINGS.inventory.settings)
         self.nautobot = pynautobot.api(url=inventory_settings.address, token=inventory_settings.token)
-        if not inventory_settings.verify_ssl:
-            self.nautobot.http_session.verify = False
-        else:
-            self.nautobot.http_session.verify = True
+        self.nautobot.http_session = get_http_session(verify_ssl=inventory_settings.verify_ssl)
 
         self._check_nautobot_version()
 
-        sites = {}
-        device_names = []
+        if self.settings.bulk_write:
+            self.bulk_writer = BulkWriter(
+                Request,
+                pynautobot.core.query.RequestError,
+                batch_size=self.settings.bulk_write_batch_size,
+                api_version=self.nautobot.api_version,
+            )
 
-        results = self.nornir.run(task=query_device_info_from_nautobot)
+        if self.settings.use_graphql:
+            self.load_nautobot_graphql()
+            self.load_nautobot_device_tags()
+            return
 
-        for device_name, items in results.items():
-            if items[0].failed:
-                continue
+        if self.settings.incremental_load:
+            self.init_state_cache()
 
-            result = items[0].result
-            nb_device = result["device"]
+        sites = {}
+        device_names = []
+
+        for device_name, nb_device in self.get_inventory_devices().items():
             site_name = nb_device["site"].get("slug")
 
             if site_name not in sites:
@@ -138,10 +159,11 @@ class NautobotAPIAdapter(BaseAdapter):
             device = self.apply_model_flag(device, nb_device)
             self.add(device)
 
-        # Load Prefix and Vlan per site
-        for site in self.get_all(self.site):
-            self.load_nautobot_prefix(site)
-            self.load_nautobot_vlan(site)
+        self.load_nautobot_device_tags()
+
+        # Load Prefix and Vlan for multiple sites at once
+        self.load_nautobot_prefixes(self.get_all(self.site))
+        self.load_nautobot_vlans(self.get_all(self.site))
 
         # Load interfaces and IP addresses for each devices
         devices = self.get_all(self.device)
@@ -154,6 +176,333 @@ class NautobotAPIAdapter(BaseAdapter):
         for site in self.get_all(self.site):
             self.load_nautobot_cable(site=site, device_names=device_names)
 
+        if self.state_cache:
+            self.state_cache.save()
+            add_info(
+                "sot_state_cache", f"{self.state_cache.nbr_updated} updated, {self.state_cache.nbr_deleted} deleted"
+            )
+
+    def init_state_cache(self):
+        """Initialize the local cache of the objects loaded from Nautobot, stored in the cache_directory."""
+        inventory_settings = InventorySettings(**config.SETTINGS.inventory.settings)
+        filename = hashlib.sha256(inventory_settings.address.encode("utf-8")).hexdigest()[:16]
+        self.state_cache = SOTStateCache(
+            path=os.path.join(config.SETTINGS.main.cache_directory, f"nautobot_state_{filename}.json.gz"),
+            max_age=self.settings.incremental_load_max_age,
+        )
+        self.state_cache.load()
+
+    def query_nautobot_graphql(self, query, variables):
+        """Send a query to the GraphQL API of Nautobot and return the data.
+
+        Args:
+            query (str): GraphQL query
+            variables (dict): variables of the query
+
+        Raises:
+            AdapterLoadFatalError: if the query failed or returned some errors
+
+        Returns:
+            dict: data returned by Nautobot
+        """
+        try:
+            response = self.nautobot.graphql.query(query=query, variables=variables)
+        except pynautobot.core.graphql.GraphQLException as exc:
+            raise AdapterLoadFatalError(f"Unable to load the data from Nautobot with GraphQL: {exc}") from exc
+
+        if response.json.get("errors"):
+            raise AdapterLoadFatalError(
+                f"Unable to load the data from Nautobot with GraphQL: {response.json['errors']}"
+            )
+
+        return response.json["data"]
+
+    def load_nautobot_graphql(self):
+        """Import all devices, interfaces, IP addresses, prefixes, vlans and cables from Nautobot with GraphQL.
+
+        The data is loaded with one query per group of settings.sites_per_query sites and
+        converted with the same functions as the data returned by the REST API.
+        """
+        hostnames = defaultdict(list)
+        for hostname, host in self.nornir.inventory.hosts.items():
+            hostnames[host.site_name].append(hostname)
+
+        site_names = sorted(hostnames.keys())
+        batch_size = max(self.settings.sites_per_query, 1)
+
+        devices, prefixes, vlans = [], [], []
+        for idx in range(0, len(site_names), batch_size):
+            batch = site_names[idx : idx + batch_size]
+            data = self.query_nautobot_graphql(
+                SITES_QUERY,
+                variables=dict(
+                    site=batch,
+                    device=sorted(hostname for site_name in batch for hostname in hostnames[site_name]),
+                    with_prefixes=bool(config.SETTINGS.main.import_prefixes),
+                    with_vlans=config.SETTINGS.main.import_vlans not in [False, "no"],
+                    with_ips=bool(config.SETTINGS.main.import_ips),
+                ),
+            )
+            devices.extend(data.get("devices") or [])
+            prefixes.extend(data.get("prefixes") or [])
+            vlans.extend(data.get("vlans") or [])
+
+        LOGGER.debug(
+            "%s | Found %s devices, %s prefixes and %s vlans with GraphQL in %s sites",
+            self.name,
+            len(devices),
+            len(prefixes),
+            len(vlans),
+            len(site_names),
+        )
+
+        # Devices and sites are loaded first, the vlans are using them to find the associated devices
+        for nb_device in devices:
+            self.add_nautobot_graphql_device(GraphQLObject(nb_device))
+
+        for nb_prefix in GraphQLObject.wrap(prefixes):
+            site = self.get_or_none(self.site, nb_prefix.site.slug)
+            if not site:
+                LOGGER.debug(
+                    "Skipping prefix %s, no device loaded for the site %s", nb_prefix.prefix, nb_prefix.site.slug
+                )
+                continue
+            self.add_nautobot_prefix(site=site, nb_prefix=nb_prefix)
+
+        for nb_vlan in GraphQLObject.wrap(vlans):
+            site = self.get_or_none(self.site, nb_vlan.site.slug)
+            if not site:
+                LOGGER.debug("Skipping vlan %s, no device loaded for the site %s", nb_vlan.vid, nb_vlan.site.slug)
+                continue
+            vlan = self.vlan.create_from_pynautobot(diffsync=self, obj=nb_vlan, site_name=site.name)
+            self.add(vlan)
+            site.add_child(vlan)
+
+        for nb_device in devices:
+            device = self.get(self.device, identifier=nb_device["name"])
+            site = self.get(self.site, identifier=device.site_name)
+            for nb_intf in nb_device.get("interfaces") or []:
+                self.add_nautobot_graphql_interface(site=site, device=device, intf=convert_interface(nb_intf))
+
+    def add_nautobot_graphql_device(self, nb_device):
+        """Add a device returned by GraphQL to the local store, and its site if needed.
+
+        Args:
+            nb_device (GraphQLObject): Device returned by GraphQL
+        """
+        try:
+            site = self.get(self.site, identifier=nb_device.site.slug)
+        except ObjectNotFound:
+            site = self.site(name=nb_device.site.slug, remote_id=nb_device.site.id)
+            self.add(site)
+
+        device = self.device(name=nb_device.name, site_name=site.name, remote_id=nb_device.id)
+
+        # Same order as the primary_ip returned by the REST API when PREFER_IPV4 is not set
+        primary_ip = nb_device.primary_ip6 or nb_device.primary_ip4
+        if primary_ip:
+            device.primary_ip = primary_ip.address
+
+        device = self.apply_model_flag(device, nb_device)
+        self.add(device)
+
+    def add_nautobot_graphql_interface(self, site, device, intf):
+        """Add an interface returned by GraphQL to the local store with its IP addresses and its cable.
+
+        Args:
+            site (NautobotSite): Site the device is part of
+            device (NautobotDevice): Device the interface is part of
+            intf (GraphQLObject): Interface returned by GraphQL, converted with convert_interface
+        """
+        interface = self.convert_interface_from_nautobot(site=site, device=device, intf=intf)
+
+        for ipaddr in intf.ip_addresses:
+            ip_address = self.ip_address.create_from_pynautobot(diffsync=self, obj=ipaddr, device_name=device.name)
+            ip_address, _ = self.get_or_add(ip_address)
+            try:
+                interface.add_child(ip_address)
+            except ObjectAlreadyExists:
+                LOGGER.error(
+                    "%s | Duplicate IP found for %s (%s) ; IP already imported.", self.name, ip_address, device.name
+                )
+
+        if not intf.cable or not intf.cable_peer_interface:
+            return
+
+        cable = self.cable(
+            device_a_name=device.name,
+            interface_a_name=interface.name,
+            device_z_name=intf.cable_peer_interface.device.name,
+            interface_z_name=intf.cable_peer_interface.name,
+            remote_id=intf.cable.id,
+            status="connected",
+        )
+
+        try:
+            self.add(cable)
+        except ObjectAlreadyExists:
+            pass
+
+    def sync_complete(self, source, *args, **kwargs):
+        """Send the changes queued by the bulk writer to Nautobot once the sync is complete."""
+        if self.bulk_writer:
+            self.bulk_writer.flush()
+
+        super().sync_complete(source, *args, **kwargs)
+
+    def get_inventory_devices(self):
+        """Return the Nautobot record of each device in the inventory.
+
+        The records captured by the inventory are reused, only the devices without a record
+        (loaded with another inventory) are queried from Nautobot.
+
+        Returns:
+            dict: Nautobot record of each device, indexed by device name
+        """
+        nb_devices = {}
+        missing_devices = []
+        for device_name, host in self.nornir.inventory.hosts.items():
+            if host.data.get("device_record"):
+                nb_devices[device_name] = host.data["device_record"]
+            else:
+                missing_devices.append(device_name)
+
+        if not missing_devices:
+            return nb_devices
+
+        results = self.nornir.filter(filter_func=lambda host: host.name in missing_devices).run(
+            task=query_device_info_from_nautobot
+        )
+        for device_name, items in results.items():
+            if not items[0].failed:
+                nb_devices[device_name] = items[0].result["device"]
+
+        return {
+            device_name: nb_devices[device_name]
+            for device_name in self.nornir.inventory.hosts
+            if device_name in nb_devices
+        }
+
+    def filter_nautobot(self, endpoint, **filters):
+        """Return all objects of a Nautobot endpoint matching some filters.
+
+        When settings.incremental_load is enabled, only the objects updated since the previous execution are fetched.
+
+        Args:
+            endpoint (pynautobot Endpoint): Endpoint to query
+            **filters: filters to apply to the query
+
+        Returns:
+            list: pynautobot records
+        """
+        if self.state_cache:
+            return self.state_cache.filter(endpoint, filters, self.fetch_nautobot)
+
+        return self.fetch_nautobot(endpoint, **filters)
+
+    def fetch_nautobot(self, endpoint, **filters):
+        """Query a Nautobot endpoint, the pages are fetched concurrently when settings.concurrent_pages is defined.
+
+        Args:
+            endpoint (pynautobot Endpoint): Endpoint to query
+            **filters: filters to apply to the query
+
+        Returns:
+            list: pynautobot records
+        """
+        if not self.settings.concurrent_pages:
+            return endpoint.filter(**filters)
+
+        return fetch_all_pages(
+            endpoint,
+            Request,
+            filters,
+            page_size=self.settings.page_size,
+            max_workers=self.settings.concurrent_pages,
+            api_version=self.nautobot.api_version,
+        )
+
+    def get_nautobot_request(self, endpoint, remote_id):
+        """Return the request to send to a Nautobot object directly by id, without retrieving it first.
+
+        Args:
+            endpoint (pynautobot Endpoint): Endpoint of the object
+            remote_id: id of the object in Nautobot
+
+        Returns:
+            Request: pynautobot request
+        """
+        return Request(
+            key=remote_id,
+            base=endpoint.url,
+            token=endpoint.token,
+            http_session=endpoint.api.http_session,
+            api_version=self.nautobot.api_version,
+        )
+
+    def update_nautobot(self, endpoint, remote_id, data):
+        """Update an object in Nautobot with a PATCH request sent directly by id.
+
+        Args:
+            endpoint (pynautobot Endpoint): Endpoint of the object
+            remote_id: id of the object in Nautobot
+            data (dict): attributes to update in the Nautobot format
+
+        Returns:
+            dict: object returned by Nautobot
+        """
+        return self.get_nautobot_request(endpoint, remote_id).patch(data)
+
+    def delete_nautobot(self, endpoint, remote_id):
+        """Delete an object in Nautobot with a DELETE request sent directly by id.
+
+        Args:
+            endpoint (pynautobot Endpoint): Endpoint of the object
+            remote_id: id of the object in Nautobot
+
+        Returns:
+            bool: True if the object has been deleted
+        """
+        return self.get_nautobot_request(endpoint, remote_id).delete()
+
+    def load_nautobot_device_tags(self):
+        """Import all tags used to associate the vlans with the devices at once and store their id on the devices.
+
+        The missing tags of the devices associated with the vlans to create or update are identified by prepare_sync
+        and created at once by create_nautobot_device_tags when the first tag is needed.
+        """
+        if config.SETTINGS.main.import_vlans in [False, "no"]:
+            return
+
+        tag_prefix = "device="
+        tags = {tag.name: tag.id for tag in self.filter_nautobot(self.nautobot.extras.tags, q=tag_prefix)}
+        for device in self.get_all(self.device):
+            if f"{tag_prefix}{device.name}" in tags:
+                device.device_tag_id = tags[f"{tag_prefix}{device.name}"]
+
+    def create_nautobot_device_tags(self):
+        """Create at once the tags identified by prepare_sync, if the creation fails they are created one by one."""
+        devices = [
+            device
+            for device in self.get_all(self.device)
+            if device.name in self.device_tags_pending and not device.device_tag_id
+        ]
+        self.device_tags_pending = set()
+
+        if not devices:
+            return
+
+        try:
+            tags = self.nautobot.extras.tags.create([device.get_device_tag_params() for device in devices])
+        except pynautobot.core.query.RequestError as exc:
+            LOGGER.warning("Unable to create the tags of %s devices in %s (%s)", len(devices), self.name, exc.error)
+            return
+
+        for device, tag in zip(devices, tags):
+            device.device_tag_id = tag.id
+
+        LOGGER.info("Created %s device tags in Nautobot", len(tags))
+
     def load_nautobot_device(self, site, device):
         """Import all interfaces and IP address from Nautobot for a given device.
 
@@ -173,21 +522,51 @@ class NautobotAPIAdapter(BaseAdapter):
         if not config.SETTINGS.main.import_prefixes:
             return
 
-        prefixes = self.nautobot.ipam.prefixes.filter(site=site.name, status="active")
+        prefixes = self.filter_nautobot(self.nautobot.ipam.prefixes, site=site.name, status="active")
 
         for nb_prefix in prefixes:
-            prefix = self.prefix(
-                prefix=nb_prefix.prefix,
-                site_name=site.name,
-                remote_id=nb_prefix.id,
-            )
-            prefix = self.apply_model_flag(prefix, nb_prefix)
+            self.add_nautobot_prefix(site=site, nb_prefix=nb_prefix)
 
-            if nb_prefix.vlan:
-                prefix.vlan = self.vlan.create_unique_id(vid=nb_prefix.vlan.vid, site_name=site.name)
+    def load_nautobot_prefixes(self, sites):
+        """Import all prefixes from Nautobot for multiple sites, settings.sites_per_query sites at a time.
 
-            self.add(prefix)
-            site.add_child(prefix)
+        Args:
+            sites (list[NautobotSite]): Sites to import prefix for
+        """
+        if not config.SETTINGS.main.import_prefixes:
+            return
+
+        for batch in self._get_sites_batches(sites):
+            prefixes = defaultdict(list)
+            for nb_prefix in self.filter_nautobot(
+                self.nautobot.ipam.prefixes, site=list(batch.keys()), status="active"
+            ):
+                if nb_prefix.site:
+                    prefixes[nb_prefix.site.slug].append(nb_prefix)
+
+            for site_name, site in batch.items():
+                for nb_prefix in prefixes[site_name]:
+                    self.add_nautobot_prefix(site=site, nb_prefix=nb_prefix)
+
+    def add_nautobot_prefix(self, site, nb_prefix):
+        """Add a prefix returned by Nautobot to the local store.
+
+        Args:
+            site (NautobotSite): Site the prefix is part of
+            nb_prefix (pynautobot prefix object): Prefix returned by Nautobot
+        """
+        prefix = self.prefix(
+            prefix=nb_prefix.prefix,
+            site_name=site.name,
+            remote_id=nb_prefix.id,
+        )
+        prefix = self.apply_model_flag(prefix, nb_prefix)
+
+        if nb_prefix.vlan:
+            prefix.vlan = self.vlan.create_unique_id(vid=nb_prefix.vlan.vid, site_name=site.name)
+
+        self.add(prefix)
+        site.add_child(prefix)
 
     def load_nautobot_vlan(self, site):
         """Import all vlans from Nautobot for a given site.
@@ -198,13 +577,39 @@ class NautobotAPIAdapter(BaseAdapter):
         if config.SETTINGS.main.import_vlans in [False, "no"]:
             return
 
-        vlans = self.nautobot.ipam.vlans.filter(site=site.name)
+        vlans = self.filter_nautobot(self.nautobot.ipam.vlans, site=site.name)
 
         for nb_vlan in vlans:
             vlan = self.vlan.create_from_pynautobot(diffsync=self, obj=nb_vlan, site_name=site.name)
             self.add(vlan)
             site.add_child(vlan)
 
+    def load_nautobot_vlans(self, sites):
+        """Import all vlans from Nautobot for multiple sites, settings.sites_per_query sites at a time.
+
+        Args:
+            sites (list[NautobotSite]): Sites to import vlan for
+        """
+        if config.SETTINGS.main.import_vlans in [False, "no"]:
+            return
+
+        for batch in self._get_sites_batches(sites):
+            vlans = defaultdict(list)
+            for nb_vlan in self.filter_nautobot(self.nautobot.ipam.vlans, site=list(batch.keys())):
+                if nb_vlan.site:
+                    vlans[nb_vlan.site.slug].append(nb_vlan)
+
+            for site_name, site in batch.items():
+                for nb_vlan in vlans[site_name]:
+                    vlan = self.vlan.create_from_pynautobot(diffsync=self, obj=nb_vlan, site_name=site.name)
+                    self.add(vlan)
+                    site.add_child(vlan)
+
+    def _get_sites_batches(self, sites):
+        """Split a list of sites in batches of settings.sites_per_query sites, indexed by name."""
+        batch_size = max(self.settings.sites_per_query, 1)
+        return [{site.name: site for site in sites[idx : idx + batch_size]} for idx in range(0, len(sites), batch_size)]
+
     def convert_interface_from_nautobot(
         self, device, intf, site=None
     ):  # pylint: disable=too-many-branches,too-many-statements
@@ -308,7 +713,7 @@ class NautobotAPIAdapter(BaseAdapter):
             site (NautobotSite): DiffSync object representing a site
             device (NautobotDevice): DiffSync object representing the device
         """
-        intfs = self.nautobot.dcim.interfaces.filter(device=device.name)
+        intfs = self.filter_nautobot(self.nautobot.dcim.interfaces, device=device.name)
         for intf in intfs:
             self.convert_interface_from_nautobot(site=site, device=device, intf=intf)
 
@@ -324,7 +729,7 @@ class NautobotAPIAdapter(BaseAdapter):
         if not config.SETTINGS.main.import_ips:
             return
 
-        ips = self.nautobot.ipam.ip_addresses.filter(device=device.name)
+        ips = self.filter_nautobot(self.nautobot.ipam.ip_addresses, device=device.name)
         for ipaddr in ips:
             ip_address = self.ip_address.create_from_pynautobot(diffsync=self, obj=ipaddr, device_name=device.name)
             ip_address, _ = self.get_or_add(ip_address)
@@ -350,7 +755,7 @@ class NautobotAPIAdapter(BaseAdapter):
             site (Site): Site object to import cables for
             device_names (list): List of device names that are part of the inventory
         """
-        cables = self.nautobot.dcim.cables.filter(site=site.name)
+        cables = self.filter_nautobot(self.nautobot.dcim.cables, site=site.name)
 
         nbr_cables = 0
         for nb_cable in cables:
@@ -418,6 +823,9 @@ class NautobotAPIAdapter(BaseAdapter):
         Returns:
             NautobotInterface, bool: Interface in DiffSync format
         """
+        if (device_name, intf_name) in self.missing_cable_endpoints:
+            return False
+
         intfs = self.nautobot.dcim.interfaces.filter(name=intf_name, device=device_name)
 
         if len(intfs) == 0:
@@ -432,12 +840,100 @@ class NautobotAPIAdapter(BaseAdapter):
             )
             return False
 
-        intf = self.interface(name=intf_name, device_name=device_name, remote_id=intfs[0].id)
-        intf = self.apply_model_flag(intf, intfs[0])
+        return self.add_nautobot_cable_endpoint(device_name=device_name, intf_name=intf_name, nb_intf=intfs[0])
 
-        if intfs[0].connected_endpoint_type:
-            intf.connected_endpoint_type = intfs[0].connected_endpoint_type
+    def add_nautobot_cable_endpoint(self, device_name, intf_name, nb_intf):
+        """Add an interface used by a cable but not loaded with the devices to the local store.
+
+        Args:
+            device_name (str): name of the device in Nautobot
+            intf_name (str): name of the interface in Nautobot
+            nb_intf (pynautobot Record): interface returned by Nautobot
+
+        Returns:
+            NautobotInterface: Interface in DiffSync format
+        """
+        intf = self.interface(name=intf_name, device_name=device_name, remote_id=nb_intf.id)
+        intf = self.apply_model_flag(intf, nb_intf)
+
+        if nb_intf.connected_endpoint_type:
+            intf.connected_endpoint_type = nb_intf.connected_endpoint_type
 
         self.add(intf)
 
         return intf
+
+    def prepare_sync(self, diff):
+        """Find at once all interfaces used by the cables to create that are not present in the local store.
+
+        The interfaces created by the same diff are skipped, they will be in the local store before the cables.
+        Also identify the devices associated with the vlans to create or update that don't have a tag yet.
+
+        Args:
+            diff (Diff): diff that will be applied to Nautobot
+        """
+        self.device_tags_pending = {
+            device_name
+            for element in self.get_diff_elements(diff, self.vlan.get_type(), actions=("create", "update"))
+            for device_name in element.get_attrs_diffs().get("+", {}).get("associated_devices", [])
+            if not getattr(self.get_or_none(self.device, device_name), "device_tag_id", True)
+        }
+
+        created_intfs = {
+            (element.keys["device_name"], element.keys["name"])
+            for element in self.get_diff_elements(diff, self.interface.get_type())
+        }
+
+        endpoints = set()
+        for element in self.get_diff_elements(diff, self.cable.get_type()):
+            for side in ["a", "z"]:
+                endpoint = (element.keys[f"device_{side}_name"], element.keys[f"interface_{side}_name"])
+                if endpoint in created_intfs:
+                    continue
+                if not self.get_or_none(self.interface, dict(device_name=endpoint[0], name=endpoint[1])):
+                    endpoints.add(endpoint)
+
+        if endpoints:
+            self.load_nautobot_cable_endpoints(endpoints)
+
+    def load_nautobot_cable_endpoints(self, endpoints):
+        """Import the interfaces of multiple cable endpoints, settings.cable_endpoints_per_query devices at a time.
+
+        The endpoints not found in Nautobot, or found more than once, are recorded in missing_cable_endpoints
+        to not query them again when the cables are created.
+
+        Args:
+            endpoints (set): tuples of device name and interface name
+        """
+        self.missing_cable_endpoints = set()
+        intf_names = defaultdict(set)
+        for device_name, intf_name in endpoints:
+            intf_names[device_name].add(intf_name)
+
+        device_names = sorted(intf_names.keys())
+        batch_size = max(self.settings.cable_endpoints_per_query, 1)
+
+        found = defaultdict(list)
+        for idx in range(0, len(device_names), batch_size):
+            batch = device_names[idx : idx + batch_size]
+            names = sorted(set().union(*[intf_names[device_name] for device_name in batch]))
+            for nb_intf in self.fetch_nautobot(self.nautobot.dcim.interfaces, device=batch, name=names):
+                endpoint = (nb_intf.device.name, nb_intf.name)
+                if endpoint in endpoints:
+                    found[endpoint].append(nb_intf)
+
+        for endpoint in endpoints:
+            if len(found[endpoint]) == 1:
+                self.add_nautobot_cable_endpoint(
+                    device_name=endpoint[0], intf_name=endpoint[1], nb_intf=found[endpoint][0]
+                )
+            else:
+                self.missing_cable_endpoints.add(endpoint)
+
+        LOGGER.debug(
+            "%s | Found %s of %s cable endpoints missing locally in %s devices",
+            self.name,
+            len(endpoints) - len(self.missing_cable_endpoints),
+            len(endpoints),
+            len(device_names),
+        )
@@ -0,0 +1,130 @@
+"""GraphQL queries and helpers used by the NautobotAPIAdapter to load the data from Nautobot."""
+
+# Query used to load all devices of a group of sites, with their interfaces, IP addresses, prefixes and vlans
+# The prefixes, the vlans and the ip addresses are only requested if they will be imported
+SITES_QUERY = """
+query ($site: [String], $device: [String], $with_prefixes: Boolean!, $with_vlans: Boolean!, $with_ips: Boolean!) {
+  devices(site: $site, name: $device) {
+    id
+    name
+    site { id slug }
+    primary_ip4 { address }
+    primary_ip6 { address }
+    tags { id name slug }
+    interfaces {
+      id
+      name
+      description
+      mtu
+      enabled
+      type
+      mode
+      lag { name }
+      tagged_vlans { vid }
+      untagged_vlan { vid }
+      tags { id name slug }
+      cable { id }
+      cable_peer_interface { name device { name } }
+      connected_interface { id }
+      connected_circuit_termination { id }
+      ip_addresses @include(if: $with_ips) { id address tags { id name slug } }
+    }
+  }
+  prefixes(site: $site, status: "active") @include(if: $with_prefixes) {
+    id
+    prefix
+    site { slug }
+    vlan { vid }
+    tags { id name slug }
+  }
+  vlans(site: $site) @include(if: $with_vlans) {
+    id
+    vid
+    name
+    site { slug }
+    tags { id name slug }
+  }
+}
+"""
+
+
+class GraphQLObject:
+    """Read-only view of an object returned by GraphQL, accessible the same way as a pynautobot record."""
+
+    def __init__(self, data):
+        """Initialize the object from the dict returned by GraphQL."""
+        self._data = data
+
+    @classmethod
+    def wrap(cls, value):
+        """Convert the nested dicts and lists of dicts of a GraphQL result into GraphQLObject."""
+        if isinstance(value, dict):
+            return cls(value)
+        if isinstance(value, list):
+            return [cls.wrap(item) for item in value]
+        return value
+
+    def __getattr__(self, name):
+        """Return the value of a field, None if the field hasn't been queried."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.wrap(self._data.get(name))
+
+    def __getitem__(self, name):
+        """Return the value of a field, None if the field hasn't been queried."""
+        return self.wrap(self._data.get(name))
+
+    def __iter__(self):
+        """Iterate over the fields of the object, similar to pynautobot records."""
+        return iter(self._data.items())
+
+    def __repr__(self):
+        """Return the name of the object if available, like pynautobot records."""
+        return str(
+            self._data.get("name") or self._data.get("address") or self._data.get("prefix") or self._data.get("id")
+        )
+
+
+def convert_choice(value):
+    """Convert a choice returned as an enum by GraphQL (A_1000BASE_T) into the format of the REST API (1000base-t).
+
+    Args:
+        value (str): value returned by GraphQL
+
+    Returns:
+        dict: choice with the same value as the REST API, None if the value is not defined
+    """
+    if not value:
+        return None
+
+    value = value.lower()
+    if value.startswith("a_"):
+        value = value[2:]
+
+    return {"value": value.replace("_", "-")}
+
+
+def convert_interface(data):
+    """Convert an interface returned by GraphQL into the format of the REST API.
+
+    Args:
+        data (dict): interface returned by GraphQL
+
+    Returns:
+        GraphQLObject: interface with the same fields as the one returned by the REST API
+    """
+    intf = dict(data)
+    intf["type"] = convert_choice(data.get("type"))
+    intf["mode"] = convert_choice(data.get("mode"))
+
+    intf["connected_endpoint_type"] = None
+    if data.get("connected_interface"):
+        intf["connected_endpoint_type"] = "dcim.interface"
+    elif data.get("connected_circuit_termination"):
+        intf["connected_endpoint_type"] = "circuits.circuittermination"
+
+    intf["ip_addresses"] = [
+        dict(ipaddr, assigned_object={"name": data["name"]}) for ipaddr in data.get("ip_addresses") or []
+    ]
+
+    return GraphQLObject(intf)
@@ -3,20 +3,24 @@
 # pylint: disable=R0913,R0914,E1101,W0613
 
 import sys
-from typing import Any, List
+from typing import Any
 import pynautobot
+from pynautobot.core.query import Request
 from pydantic import ValidationError
 
 from nornir.core.inventory import Defaults, Groups, Hosts, Inventory, ParentGroups, ConnectionOptions
 from nornir.core.plugins.inventory import InventoryPluginRegister
 from network_importer.inventory import NetworkImporterInventory, NetworkImporterHost
-from network_importer.utils import build_filter_params
+from network_importer.utils import build_filter_params, fetch_all_pages
+from network_importer.http_session import get_http_session
 from network_importer.adapters.nautobot_api.settings import InventorySettings
 
 
 class NautobotAPIInventory(NetworkImporterInventory):
     """Nautobot API Inventory Class."""
 
+    vc_per_query = 100  # Number of virtual chassis included in each query to fetch their devices
+
     # pylint: disable=dangerous-default-value, too-many-branches, too-many-statements
     def __init__(
         self,
@@ -56,18 +60,66 @@ class NautobotAPIInventory(NetworkImporterInventory):
 
         # Instantiate nautobot session using pynautobot
         self.session = pynautobot.api(url=self.settings.address, token=self.settings.token)
-        if not self.settings.verify_ssl:
-            self.session.http_session.verify = False
+        self.session.http_session = get_http_session(verify_ssl=self.settings.verify_ssl)
+
+    def get_devices(self, filters):
+        """Return the devices matching some filters, the pages are fetched concurrently if concurrent_pages is defined.
+
+        Args:
+            filters (dict): filters to apply to the query
+
+        Returns:
+            list: pynautobot devices
+        """
+        if self.settings.concurrent_pages:
+            return fetch_all_pages(
+                self.session.dcim.devices,
+                Request,
+                filters,
+                page_size=self.settings.page_size,
+                max_workers=self.settings.concurrent_pages,
+                api_version=self.session.api_version,
+            )
+
+        return self.session.dcim.devices.filter(**filters)
+
+    def load_devices(self):
+        """Fetch the devices to include in the inventory, filtered by Nautobot on the platforms and the virtual chassis.
+
+        The members of the virtual chassis are not part of the main query, only the master of each virtual chassis
+        is fetched, by id. All members of the virtual chassis without master are fetched, like the other devices.
+
+        Returns:
+            list: pynautobot devices
+        """
+        filters = dict(self.filter_parameters)
+        if self.supported_platforms and "platform" not in filters:
+            filters["platform"] = self.supported_platforms
+
+        devices = list(self.get_devices(dict(filters, virtual_chassis_member=False)))
+
+        master_ids, vc_ids = set(), set()
+        for virtual_chassis in self.session.dcim.virtual_chassis.all():
+            if virtual_chassis.master:
+                master_ids.add(virtual_chassis.master.id)
+            else:
+                vc_ids.add(virtual_chassis.id)
+
+        for filter_name, ids in [("id", sorted(master_ids)), ("virtual_chassis_id", sorted(vc_ids))]:
+            for idx in range(0, len(ids), self.vc_per_query):
+                devices.extend(self.get_devices(dict(filters, **{filter_name: ids[idx : idx + self.vc_per_query]})))
+
+        return devices
 
     def load(self):
         """Load inventory by fetching devices from nautobot."""
-        if self.filter_parameters:
-            devices: List[pynautobot.modules.dcim.Devices] = self.session.dcim.devices.filter(**self.filter_parameters)
-        else:
-            devices: List[pynautobot.modules.dcim.Devices] = self.session.dcim.devices.all()
+        devices = self.load_devices()
 
-        # fetch all platforms from nautobot and build mapping:   platform:  napalm_driver
-        platforms = self.session.dcim.platforms.all()
+        # fetch the supported platforms from Nautobot and build mapping:   platform:  napalm_driver
+        if self.supported_platforms:
+            platforms = self.session.dcim.platforms.filter(slug=self.supported_platforms)
+        else:
+            platforms = self.session.dcim.platforms.all()
         platforms_mapping = {platform.slug: platform.napalm_driver for platform in platforms if platform.napalm_driver}
 
         hosts = Hosts()
@@ -90,8 +142,7 @@ class NautobotAPIInventory(NetworkImporterInventory):
                 host.data["virtual_chassis"] = False
 
             # If supported_platforms is provided
-            # skip all devices that do not match the list of supported platforms
-            # TODO need to see if we can filter when doing the query directly
+            # skip all devices that do not match the list of supported platforms, already filtered in the query
             if self.supported_platforms:
                 if not dev.platform:
                     continue
@@ -120,6 +171,14 @@ class NautobotAPIInventory(NetworkImporterInventory):
             host.data["custom_fields"] = dev.custom_fields
             host.data["site_id"] = dev.site.id
             host.data["device_id"] = dev.id
+
+            # Keep the fields of the device used by the SOT adapter, to avoid querying Nautobot again for each device
+            host.data["device_record"] = {
+                "id": dev.id,
+                "site": {"id": dev.site.id, "slug": dev.site.slug},
+                "primary_ip": {"address": dev.primary_ip.address} if dev.primary_ip else None,
+                "tags": dict(dev).get("tags", []),
+            }
             host.data["role"] = dev.device_role.slug
             host.data["model"] = dev.device_type.slug
 
@@ -1,5 +1,5 @@
 """Extension of the base Models for the NautobotAPIAdapter."""
-from typing import Optional
+from typing import List, Optional
 import logging
 
 import pynautobot
@@ -35,10 +35,15 @@ class NautobotDevice(Device):
 
     device_tag_id: Optional[str]
 
+    def get_device_tag_params(self):
+        """Return the parameters of the tag used to associate this device with its vlans in Nautobot."""
+        return dict(name=f"device={self.name}", slug=f"device__{''.join(c if c.isalnum() else '_' for c in self.name)}")
+
     def get_device_tag_id(self):
         """Get the Nautobot id of the tag for this device.
 
         If the ID is already present locally return it
+        If the tags are pending in the adapter (see prepare_sync), create all of them at once
         If not try to retrieve it from Nautobot or create it in Nautobot if needed
 
         Returns:
@@ -47,11 +52,14 @@ class NautobotDevice(Device):
         if self.device_tag_id:
             return self.device_tag_id
 
+        if self.diffsync.device_tags_pending:
+            self.diffsync.create_nautobot_device_tags()
+            if self.device_tag_id:
+                return self.device_tag_id
+
         tag = self.diffsync.nautobot.extras.tags.get(name=f"device={self.name}")
         if not tag:
-            tag = self.diffsync.nautobot.extras.tags.create(
-                name=f"device={self.name}", slug=f"device__{''.join(c if c.isalnum() else '_' for c in self.name)}"
-            )
+            tag = self.diffsync.nautobot.extras.tags.create(**self.get_device_tag_params())
 
         self.device_tag_id = tag.id
         return self.device_tag_id
@@ -174,6 +182,12 @@ class NautobotInterface(Interface):
         """
         item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
 
+        if diffsync.bulk_writer:
+            diffsync.bulk_writer.create(
+                item, diffsync.nautobot.dcim.interfaces, lambda: item.translate_attrs_for_nautobot(attrs)
+            )
+            return item
+
         try:
             nb_params = item.translate_attrs_for_nautobot(attrs)
             intf = diffsync.nautobot.dcim.interfaces.create(**nb_params)
@@ -219,11 +233,17 @@ class NautobotInterface(Interface):
             return self
 
         current_attrs.update(attrs)
+
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.update(
+                self, self.diffsync.nautobot.dcim.interfaces, lambda: self.translate_attrs_for_nautobot(current_attrs)
+            )
+            return super().update(attrs)
+
         nb_params = self.translate_attrs_for_nautobot(current_attrs)
         LOGGER.debug("Update interface : %s", nb_params)
         try:
-            intf = self.diffsync.nautobot.dcim.interfaces.get(self.remote_id)
-            intf.update(data=nb_params)
+            self.diffsync.update_nautobot(self.diffsync.nautobot.dcim.interfaces, self.remote_id, nb_params)
             LOGGER.info("Updated Interface %s %s (%s) in Nautobot", self.device_name, self.name, self.remote_id)
         except pynautobot.core.query.RequestError as exc:
             LOGGER.warning(
@@ -261,9 +281,14 @@ class NautobotInterface(Interface):
                     self.device_name,
                 )
                 return None
+
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.delete(self, self.diffsync.nautobot.dcim.interfaces)
+            super().delete()
+            return self
+
         try:
-            intf = self.diffsync.nautobot.dcim.interfaces.get(self.remote_id)
-            intf.delete()
+            self.diffsync.delete_nautobot(self.diffsync.nautobot.dcim.interfaces, self.remote_id)
         except pynautobot.core.query.RequestError as exc:
             LOGGER.warning(
                 "Unable to delete Interface %s on %s in %s (%s)",
@@ -330,6 +355,15 @@ class NautobotIPAddress(IPAddress):
         Returns:
             NautobotIPAddress: DiffSync object
         """
+        if diffsync.bulk_writer:
+            item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
+            diffsync.bulk_writer.create(
+                item,
+                diffsync.nautobot.ipam.ip_addresses,
+                lambda: dict(item.translate_attrs_for_nautobot(attrs), status="active"),
+            )
+            return item
+
         try:
             item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
             nb_params = item.translate_attrs_for_nautobot(attrs)
@@ -368,18 +402,25 @@ class NautobotIPAddress(IPAddress):
                     self.device_name,
                 )
                 return None
+
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.delete(self, self.diffsync.nautobot.ipam.ip_addresses)
+            super().delete()
+            return self
+
         try:
-            ipaddr = self.diffsync.nautobot.ipam.ip_addresses.get(self.remote_id)
-            if ipaddr:
-                ipaddr.delete()
-            else:
+            self.diffsync.delete_nautobot(self.diffsync.nautobot.ipam.ip_addresses, self.remote_id)
+        except pynautobot.core.query.RequestError as exc:
+            if exc.req.status_code == 404:
                 LOGGER.warning(
                     "Unable to delete IP address %s on %s in %s because IP address object cannot be located",
                     self.address,
                     self.device_name,
                     self.diffsync.name,
                 )
-        except pynautobot.core.query.RequestError as exc:
+                super().delete()
+                return self
+
             LOGGER.warning(
                 "Unable to delete IP Address %s on %s in %s (%s)",
                 self.address,
@@ -430,6 +471,13 @@ class NautobotPrefix(Prefix):
             NautobotPrefix: DiffSync object
         """
         item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
+
+        if diffsync.bulk_writer:
+            diffsync.bulk_writer.create(
+                item, diffsync.nautobot.ipam.prefixes, lambda: item.translate_attrs_for_nautobot(attrs)
+            )
+            return item
+
         nb_params = item.translate_attrs_for_nautobot(attrs)
 
         try:
@@ -461,11 +509,16 @@ class NautobotPrefix(Prefix):
         if attrs == current_attrs:
             return self
 
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.update(
+                self, self.diffsync.nautobot.ipam.prefixes, lambda: self.translate_attrs_for_nautobot(attrs)
+            )
+            return super().update(attrs)
+
         nb_params = self.translate_attrs_for_nautobot(attrs)
 
         try:
-            prefix = self.diffsync.nautobot.ipam.prefixes.get(self.remote_id)
-            prefix.update(data=nb_params)
+            self.diffsync.update_nautobot(self.diffsync.nautobot.ipam.prefixes, self.remote_id, nb_params)
             LOGGER.info("Updated Prefix %s (%s) in Nautobot", self.prefix, self.remote_id)
         except pynautobot.core.query.RequestError as exc:
             LOGGER.warning(
@@ -483,6 +536,7 @@ class NautobotVlan(Vlan):
     """Extension of the Vlan model."""
 
     remote_id: Optional[str]
+    remote_tags: List[dict] = list()
     tag_prefix: str = "device="
 
     def translate_attrs_for_nautobot(self, attrs):
@@ -542,7 +596,13 @@ class NautobotVlan(Vlan):
         Returns:
             NautobotVlan: DiffSync object
         """
-        item = cls(vid=obj.vid, site_name=site_name, name=obj.name, remote_id=obj.id)
+        item = cls(
+            vid=obj.vid,
+            site_name=site_name,
+            name=obj.name,
+            remote_id=obj.id,
+            remote_tags=[{"id": tag["id"], "name": tag["name"]} for tag in obj.tags],
+        )
 
         # Check the existing tags to learn which device is already associated with this vlan
         # Exclude all devices that are not part of the inventory
@@ -570,6 +630,13 @@ class NautobotVlan(Vlan):
         Returns:
             NautobotVlan: DiffSync object
         """
+        if diffsync.bulk_writer:
+            item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
+            diffsync.bulk_writer.create(
+                item, diffsync.nautobot.ipam.vlans, lambda: item.translate_attrs_for_nautobot(attrs)
+            )
+            return item
+
         try:
             item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
             nb_params = item.translate_attrs_for_nautobot(attrs)
@@ -582,17 +649,19 @@ class NautobotVlan(Vlan):
 
         return item
 
-    def update_clean_tags(self, nb_params, obj):
+    def update_clean_tags(self, nb_params, obj=None):
         """Update list of vlan tags with additinal tags that already exists on the object in nautobot.
 
         Args:
             nb_params (dict): dict of parameters in nautobot format
-            obj (pynautobot): Vlan object from pynautobot
+            obj (pynautobot): Vlan object from pynautobot, the tags captured at load time are used if not provided
         """
+        tags = obj.tags if obj else self.remote_tags
+
         # Before updating the remote vlan we need to check the existing list of tags
         # to ensure that we won't delete an existing tags
-        if "tags" in nb_params and nb_params["tags"] and obj.tags:
-            for tag in obj.tags:
+        if "tags" in nb_params and nb_params["tags"] and tags:
+            for tag in tags:
                 if self.tag_prefix not in tag["name"]:
                     nb_params["tags"].append(tag["id"])
                 else:
@@ -612,12 +681,19 @@ class NautobotVlan(Vlan):
         Returns:
             NautobotVlan: DiffSync object
         """
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.update(
+                self,
+                self.diffsync.nautobot.ipam.vlans,
+                lambda: self.update_clean_tags(nb_params=self.translate_attrs_for_nautobot(attrs)),
+            )
+            return super().update(attrs)
+
         nb_params = self.translate_attrs_for_nautobot(attrs)
 
         try:
-            vlan = self.diffsync.nautobot.ipam.vlans.get(self.remote_id)
-            clean_params = self.update_clean_tags(nb_params=nb_params, obj=vlan)
-            vlan.update(data=clean_params)
+            clean_params = self.update_clean_tags(nb_params=nb_params)
+            self.diffsync.update_nautobot(self.diffsync.nautobot.ipam.vlans, self.remote_id, clean_params)
             LOGGER.info("Updated Vlan %s (%s) in Nautobot", self.get_unique_id(), self.remote_id)
         except pynautobot.core.query.RequestError as exc:
             LOGGER.warning("Unable to update Vlan %s in %s (%s)", self.get_unique_id(), self.diffsync.name, exc.error)
@@ -696,6 +772,22 @@ class NautobotCable(Cable):
             )
             return item
 
+        if diffsync.bulk_writer:
+            diffsync.bulk_writer.create(
+                item,
+                diffsync.nautobot.dcim.cables,
+                lambda: dict(
+                    termination_a_type="dcim.interface",
+                    termination_b_type="dcim.interface",
+                    termination_a_id=interface_a.remote_id,
+                    termination_b_id=interface_z.remote_id,
+                    status="connected",
+                ),
+            )
+            interface_a.connected_endpoint_type = "dcim.interface"
+            interface_z.connected_endpoint_type = "dcim.interface"
+            return item
+
         try:
             cable = diffsync.nautobot.dcim.cables.create(
                 termination_a_type="dcim.interface",
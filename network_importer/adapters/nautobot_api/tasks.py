@@ -5,6 +5,7 @@ import pynautobot
 from nornir.core.task import Result, Task
 
 import network_importer.config as config  # pylint: disable=import-error
+from network_importer.http_session import get_http_session
 from network_importer.adapters.nautobot_api.settings import InventorySettings
 
 LOGGER = logging.getLogger("network-importer")
@@ -26,13 +27,7 @@ def query_device_info_from_nautobot(task: Task) -> Result:
     """
     inventory_settings = InventorySettings(**config.SETTINGS.inventory.settings)
     nautobot = pynautobot.api(url=inventory_settings.address, token=inventory_settings.token)
-
-    # Check for SSL Verification, set it to false if not. Else set to true
-    if not inventory_settings.verify_ssl:
-        # No manual session is required for this, pynautobot will automatically create one
-        nautobot.http_session.verify = False
-    else:
-        nautobot.http_session.verify = True
+    nautobot.http_session = get_http_session(verify_ssl=inventory_settings.verify_ssl)
 
     # Set a Results dictionary
     results = {
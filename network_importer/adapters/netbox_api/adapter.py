@@ -1,14 +1,22 @@
 """NetBoxAPIAdapter class."""
+import os
+import hashlib
 import logging
 import warnings
+from collections import defaultdict
 
-import requests
 import pynetbox
+from pynetbox.core.query import Request
 from packaging.version import Version, InvalidVersion
 
 from diffsync.exceptions import ObjectAlreadyExists, ObjectNotFound
 import network_importer.config as config  # pylint: disable=import-error
+from network_importer.http_session import get_http_session
+from network_importer.utils import fetch_all_pages
 from network_importer.adapters.base import BaseAdapter  # pylint: disable=import-error
+from network_importer.adapters.bulk_writer import BulkWriter  # pylint: disable=import-error
+from network_importer.adapters.state_cache import SOTStateCache  # pylint: disable=import-error
+from network_importer.performance import add_info  # pylint: disable=import-error
 from network_importer.adapters.netbox_api.models import (  # pylint: disable=import-error
     NetboxSite,
     NetboxDevice,
@@ -45,6 +53,10 @@ class NetBoxAPIAdapter(BaseAdapter):
     top_level = ["site", "device", "cable"]
 
     netbox = None
+    state_cache = None
+    bulk_writer = None
+    device_tags_pending = set()
+    missing_cable_endpoints = set()
     netbox_version = None
 
     settings_class = AdapterSettings
@@ -109,25 +121,22 @@ class NetBoxAPIAdapter(BaseAdapter):
         """Initialize pynetbox and load all data from netbox in the local cache."""
         inventory_settings = InventorySettings(**config.SETTINGS.inventory.settings)
         self.netbox = pynetbox.api(url=inventory_settings.address, token=inventory_settings.token)
-
-        if not inventory_settings.verify_ssl:
-            session = requests.Session()
-            session.verify = False
-            self.netbox.http_session = session
+        self.netbox.http_session = get_http_session(verify_ssl=inventory_settings.verify_ssl)
 
         self._check_netbox_version()
 
-        sites = {}
-        device_names = []
+        if self.settings.bulk_write:
+            self.bulk_writer = BulkWriter(
+                Request, pynetbox.core.query.RequestError, batch_size=self.settings.bulk_write_batch_size
+            )
 
-        results = self.nornir.run(task=query_device_info_from_netbox)
+        if self.settings.incremental_load:
+            self.init_state_cache()
 
-        for device_name, items in results.items():
-            if items[0].failed:
-                continue
+        sites = {}
+        device_names = []
 
-            result = items[0].result
-            nb_device = result["device"]
+        for device_name, nb_device in self.get_inventory_devices().items():
             site_name = nb_device["site"].get("slug")
 
             if site_name not in sites:
@@ -145,22 +154,199 @@ class NetBoxAPIAdapter(BaseAdapter):
             device = self.apply_model_flag(device, nb_device)
             self.add(device)
 
-        # Load Prefix and Vlan per site
-        for site in self.get_all(self.site):
-            self.load_netbox_prefix(site)
-            self.load_netbox_vlan(site)
+        self.load_netbox_device_tags()
+
+        # Load Prefix and Vlan for multiple sites at once
+        self.load_netbox_prefixes(self.get_all(self.site))
+        self.load_netbox_vlans(self.get_all(self.site))
 
         # Load interfaces and IP addresses for each devices
         devices = self.get_all(self.device)
-        for device in devices:
-            site = sites[device.site_name]
-            device_names.append(device.name)
-            self.load_netbox_device(site=site, device=device)
+        device_names.extend([device.name for device in devices])
+        if self.settings.bulk_load:
+            self.load_netbox_devices_bulk(sites=sites, devices=devices)
+        else:
+            for device in devices:
+                self.load_netbox_device(site=sites[device.site_name], device=device)
 
         # Load Cabling
         for site in self.get_all(self.site):
             self.load_netbox_cable(site=site, device_names=device_names)
 
+        if self.state_cache:
+            self.state_cache.save()
+            add_info(
+                "sot_state_cache", f"{self.state_cache.nbr_updated} updated, {self.state_cache.nbr_deleted} deleted"
+            )
+
+    def init_state_cache(self):
+        """Initialize the local cache of the objects loaded from NetBox, stored in the cache_directory."""
+        inventory_settings = InventorySettings(**config.SETTINGS.inventory.settings)
+        filename = hashlib.sha256(inventory_settings.address.encode("utf-8")).hexdigest()[:16]
+        self.state_cache = SOTStateCache(
+            path=os.path.join(config.SETTINGS.main.cache_directory, f"netbox_state_{filename}.json.gz"),
+            max_age=self.settings.incremental_load_max_age,
+        )
+        self.state_cache.load()
+
+    def sync_complete(self, source, *args, **kwargs):
+        """Send the changes queued by the bulk writer to NetBox once the sync is complete."""
+        if self.bulk_writer:
+            self.bulk_writer.flush()
+
+        super().sync_complete(source, *args, **kwargs)
+
+    def get_inventory_devices(self):
+        """Return the NetBox record of each device in the inventory.
+
+        The records captured by the inventory are reused, only the devices without a record
+        (loaded with another inventory) are queried from NetBox.
+
+        Returns:
+            dict: NetBox record of each device, indexed by device name
+        """
+        nb_devices = {}
+        missing_devices = []
+        for device_name, host in self.nornir.inventory.hosts.items():
+            if host.data.get("device_record"):
+                nb_devices[device_name] = host.data["device_record"]
+            else:
+                missing_devices.append(device_name)
+
+        if not missing_devices:
+            return nb_devices
+
+        results = self.nornir.filter(filter_func=lambda host: host.name in missing_devices).run(
+            task=query_device_info_from_netbox
+        )
+        for device_name, items in results.items():
+            if not items[0].failed:
+                nb_devices[device_name] = items[0].result["device"]
+
+        return {
+            device_name: nb_devices[device_name]
+            for device_name in self.nornir.inventory.hosts
+            if device_name in nb_devices
+        }
+
+    def filter_netbox(self, endpoint, **filters):
+        """Return all objects of a NetBox endpoint matching some filters.
+
+        When settings.incremental_load is enabled, only the objects updated since the previous execution are fetched.
+
+        Args:
+            endpoint (pynetbox Endpoint): Endpoint to query
+            **filters: filters to apply to the query
+
+        Returns:
+            list: pynetbox records
+        """
+        if self.state_cache:
+            return self.state_cache.filter(endpoint, filters, self.fetch_netbox)
+
+        return self.fetch_netbox(endpoint, **filters)
+
+    def fetch_netbox(self, endpoint, **filters):
+        """Query a NetBox endpoint, the pages are fetched concurrently when settings.concurrent_pages is defined.
+
+        Args:
+            endpoint (pynetbox Endpoint): Endpoint to query
+            **filters: filters to apply to the query
+
+        Returns:
+            list: pynetbox records
+        """
+        if not self.settings.concurrent_pages:
+            return endpoint.filter(**filters)
+
+        return fetch_all_pages(
+            endpoint,
+            Request,
+            filters,
+            page_size=self.settings.page_size,
+            max_workers=self.settings.concurrent_pages,
+        )
+
+    def get_netbox_request(self, endpoint, remote_id):
+        """Return the request to send to a NetBox object directly by id, without retrieving it first.
+
+        Args:
+            endpoint (pynetbox Endpoint): Endpoint of the object
+            remote_id: id of the object in NetBox
+
+        Returns:
+            Request: pynetbox request
+        """
+        return Request(
+            key=remote_id,
+            base=endpoint.url,
+            token=endpoint.token,
+            http_session=endpoint.api.http_session,
+        )
+
+    def update_netbox(self, endpoint, remote_id, data):
+        """Update an object in NetBox with a PATCH request sent directly by id.
+
+        Args:
+            endpoint (pynetbox Endpoint): Endpoint of the object
+            remote_id: id of the object in NetBox
+            data (dict): attributes to update in the NetBox format
+
+        Returns:
+            dict: object returned by NetBox
+        """
+        return self.get_netbox_request(endpoint, remote_id).patch(data)
+
+    def delete_netbox(self, endpoint, remote_id):
+        """Delete an object in NetBox with a DELETE request sent directly by id.
+
+        Args:
+            endpoint (pynetbox Endpoint): Endpoint of the object
+            remote_id: id of the object in NetBox
+
+        Returns:
+            bool: True if the object has been deleted
+        """
+        return self.get_netbox_request(endpoint, remote_id).delete()
+
+    def load_netbox_device_tags(self):
+        """Import all tags used to associate the vlans with the devices at once and store their id on the devices.
+
+        The missing tags of the devices associated with the vlans to create or update are identified by prepare_sync
+        and created at once by create_netbox_device_tags when the first tag is needed.
+        """
+        if config.SETTINGS.main.import_vlans in [False, "no"]:
+            return
+
+        tag_prefix = "device="
+        tags = {tag.name: tag.id for tag in self.filter_netbox(self.netbox.extras.tags, q=tag_prefix)}
+        for device in self.get_all(self.device):
+            if f"{tag_prefix}{device.name}" in tags:
+                device.device_tag_id = tags[f"{tag_prefix}{device.name}"]
+
+    def create_netbox_device_tags(self):
+        """Create at once the tags identified by prepare_sync, if the creation fails they are created one by one."""
+        devices = [
+            device
+            for device in self.get_all(self.device)
+            if device.name in self.device_tags_pending and not device.device_tag_id
+        ]
+        self.device_tags_pending = set()
+
+        if not devices:
+            return
+
+        try:
+            tags = self.netbox.extras.tags.create([device.get_device_tag_params() for device in devices])
+        except pynetbox.core.query.RequestError as exc:
+            LOGGER.warning("Unable to create the tags of %s devices in %s (%s)", len(devices), self.name, exc.error)
+            return
+
+        for device, tag in zip(devices, tags):
+            device.device_tag_id = tag.id
+
+        LOGGER.info("Created %s device tags in NetBox", len(tags))
+
     def load_netbox_device(self, site, device):
         """Import all interfaces and IP address from Netbox for a given device.
 
@@ -171,6 +357,58 @@ class NetBoxAPIAdapter(BaseAdapter):
         self.load_netbox_interface(site=site, device=device)
         self.load_netbox_ip_address(site=site, device=device)
 
+    def load_netbox_devices_bulk(self, sites, devices):
+        """Import all interfaces and IP addresses from NetBox for multiple devices at once.
+
+        The interfaces and the IP addresses are queried for settings.bulk_load_nbr_devices devices at a time,
+        with a page size of settings.page_size, and grouped by device before being imported.
+
+        Args:
+            sites (dict): NetboxSite objects indexed by name
+            devices (list[NetboxDevice]): Devices to import
+        """
+        batch_size = max(self.settings.bulk_load_nbr_devices, 1)
+        devices = [device for device in devices if device.remote_id]
+
+        for idx in range(0, len(devices), batch_size):
+            batch = {device.remote_id: device for device in devices[idx : idx + batch_size]}
+
+            intfs = defaultdict(list)
+            for intf in self.filter_netbox(
+                self.netbox.dcim.interfaces, device_id=list(batch.keys()), limit=self.settings.page_size
+            ):
+                intfs[intf.device.id].append(intf)
+
+            ips = defaultdict(list)
+            if config.SETTINGS.main.import_ips:
+                for ipaddr in self.filter_netbox(
+                    self.netbox.ipam.ip_addresses, device_id=list(batch.keys()), limit=self.settings.page_size
+                ):
+                    device_id = self._get_ip_address_device_id(ipaddr)
+                    if device_id:
+                        ips[device_id].append(ipaddr)
+
+            for device_id, device in batch.items():
+                site = sites[device.site_name]
+                for intf in intfs[device_id]:
+                    self.convert_interface_from_netbox(site=site, device=device, intf=intf)
+                LOGGER.debug("%s | Found %s interfaces for %s", self.name, len(intfs[device_id]), device.name)
+
+                if config.SETTINGS.main.import_ips:
+                    self.add_netbox_ip_addresses(device=device, ips=ips[device_id])
+
+    def _get_ip_address_device_id(self, ipaddr):
+        """Return the id of the device an IP address is assigned to, None if not assigned to a device."""
+        if self.netbox_version and self.netbox_version < Version("2.9"):
+            intf = ipaddr.interface
+        else:
+            intf = ipaddr.assigned_object if ipaddr.assigned_object_type == "dcim.interface" else None
+
+        if not intf or not getattr(intf, "device", None):
+            return None
+
+        return intf.device.id
+
     def load_netbox_prefix(self, site):
         """Import all prefixes from NetBox for a given site.
 
@@ -180,21 +418,49 @@ class NetBoxAPIAdapter(BaseAdapter):
         if not config.SETTINGS.main.import_prefixes:
             return
 
-        prefixes = self.netbox.ipam.prefixes.filter(site=site.name, status="active")
+        prefixes = self.filter_netbox(self.netbox.ipam.prefixes, site=site.name, status="active")
 
         for nb_prefix in prefixes:
-            prefix = self.prefix(
-                prefix=nb_prefix.prefix,
-                site_name=site.name,
-                remote_id=nb_prefix.id,
-            )
-            prefix = self.apply_model_flag(prefix, nb_prefix)
+            self.add_netbox_prefix(site=site, nb_prefix=nb_prefix)
+
+    def load_netbox_prefixes(self, sites):
+        """Import all prefixes from Netbox for multiple sites, settings.sites_per_query sites at a time.
+
+        Args:
+            sites (list[NetboxSite]): Sites to import prefix for
+        """
+        if not config.SETTINGS.main.import_prefixes:
+            return
+
+        for batch in self._get_sites_batches(sites):
+            prefixes = defaultdict(list)
+            for nb_prefix in self.filter_netbox(self.netbox.ipam.prefixes, site=list(batch.keys()), status="active"):
+                if nb_prefix.site:
+                    prefixes[nb_prefix.site.slug].append(nb_prefix)
+
+            for site_name, site in batch.items():
+                for nb_prefix in prefixes[site_name]:
+                    self.add_netbox_prefix(site=site, nb_prefix=nb_prefix)
+
+    def add_netbox_prefix(self, site, nb_prefix):
+        """Add a prefix returned by Netbox to the local store.
+
+        Args:
+            site (NetboxSite): Site the prefix is part of
+            nb_prefix (pynetbox prefix object): Prefix returned by Netbox
+        """
+        prefix = self.prefix(
+            prefix=nb_prefix.prefix,
+            site_name=site.name,
+            remote_id=nb_prefix.id,
+        )
+        prefix = self.apply_model_flag(prefix, nb_prefix)
 
-            if nb_prefix.vlan:
-                prefix.vlan = self.vlan.create_unique_id(vid=nb_prefix.vlan.vid, site_name=site.name)
+        if nb_prefix.vlan:
+            prefix.vlan = self.vlan.create_unique_id(vid=nb_prefix.vlan.vid, site_name=site.name)
 
-            self.add(prefix)
-            site.add_child(prefix)
+        self.add(prefix)
+        site.add_child(prefix)
 
     def load_netbox_vlan(self, site):
         """Import all vlans from NetBox for a given site.
@@ -205,13 +471,39 @@ class NetBoxAPIAdapter(BaseAdapter):
         if config.SETTINGS.main.import_vlans in [False, "no"]:
             return
 
-        vlans = self.netbox.ipam.vlans.filter(site=site.name)
+        vlans = self.filter_netbox(self.netbox.ipam.vlans, site=site.name)
 
         for nb_vlan in vlans:
             vlan = self.vlan.create_from_pynetbox(diffsync=self, obj=nb_vlan, site_name=site.name)
             self.add(vlan)
             site.add_child(vlan)
 
+    def load_netbox_vlans(self, sites):
+        """Import all vlans from Netbox for multiple sites, settings.sites_per_query sites at a time.
+
+        Args:
+            sites (list[NetboxSite]): Sites to import vlan for
+        """
+        if config.SETTINGS.main.import_vlans in [False, "no"]:
+            return
+
+        for batch in self._get_sites_batches(sites):
+            vlans = defaultdict(list)
+            for nb_vlan in self.filter_netbox(self.netbox.ipam.vlans, site=list(batch.keys())):
+                if nb_vlan.site:
+                    vlans[nb_vlan.site.slug].append(nb_vlan)
+
+            for site_name, site in batch.items():
+                for nb_vlan in vlans[site_name]:
+                    vlan = self.vlan.create_from_pynetbox(diffsync=self, obj=nb_vlan, site_name=site.name)
+                    self.add(vlan)
+                    site.add_child(vlan)
+
+    def _get_sites_batches(self, sites):
+        """Split a list of sites in batches of settings.sites_per_query sites, indexed by name."""
+        batch_size = max(self.settings.sites_per_query, 1)
+        return [{site.name: site for site in sites[idx : idx + batch_size]} for idx in range(0, len(sites), batch_size)]
+
     def convert_interface_from_netbox(
         self, device, intf, site=None
     ):  # pylint: disable=too-many-branches,too-many-statements
@@ -315,7 +607,7 @@ class NetBoxAPIAdapter(BaseAdapter):
             site (NetboxSite): DiffSync object representing a site
             device (NetboxDevice): DiffSync object representing the device
         """
-        intfs = self.netbox.dcim.interfaces.filter(device=device.name)
+        intfs = self.filter_netbox(self.netbox.dcim.interfaces, device=device.name)
         for intf in intfs:
             self.convert_interface_from_netbox(site=site, device=device, intf=intf)
 
@@ -331,7 +623,16 @@ class NetBoxAPIAdapter(BaseAdapter):
         if not config.SETTINGS.main.import_ips:
             return
 
-        ips = self.netbox.ipam.ip_addresses.filter(device=device.name)
+        ips = self.filter_netbox(self.netbox.ipam.ip_addresses, device=device.name)
+        self.add_netbox_ip_addresses(device=device, ips=ips)
+
+    def add_netbox_ip_addresses(self, device, ips):
+        """Add the IP addresses of a device returned by NetBox to the local store.
+
+        Args:
+            device (NetboxDevice): DiffSync object representing the device
+            ips (list): pynetbox IP address objects assigned to this device
+        """
         for ipaddr in ips:
             ip_address = self.ip_address.create_from_pynetbox(diffsync=self, obj=ipaddr, device_name=device.name)
             ip_address, _ = self.get_or_add(ip_address)
@@ -357,7 +658,7 @@ class NetBoxAPIAdapter(BaseAdapter):
             site (Site): Site object to import cables for
             device_names (list): List of device names that are part of the inventory
         """
-        cables = self.netbox.dcim.cables.filter(site=site.name)
+        cables = self.filter_netbox(self.netbox.dcim.cables, site=site.name)
 
         nbr_cables = 0
         for nb_cable in cables:
@@ -424,6 +725,9 @@ class NetBoxAPIAdapter(BaseAdapter):
         Returns:
             NetBoxInterface, bool: Interface in DiffSync format
         """
+        if (device_name, intf_name) in self.missing_cable_endpoints:
+            return False
+
         intfs = self.netbox.dcim.interfaces.filter(name=intf_name, device=device_name)
 
         if len(intfs) == 0:
@@ -438,12 +742,100 @@ class NetBoxAPIAdapter(BaseAdapter):
             )
             return False
 
-        intf = self.interface(name=intf_name, device_name=device_name, remote_id=intfs[0].id)
-        intf = self.apply_model_flag(intf, intfs[0])
+        return self.add_netbox_cable_endpoint(device_name=device_name, intf_name=intf_name, nb_intf=intfs[0])
 
-        if intfs[0].connected_endpoint_type:
-            intf.connected_endpoint_type = intfs[0].connected_endpoint_type
+    def add_netbox_cable_endpoint(self, device_name, intf_name, nb_intf):
+        """Add an interface used by a cable but not loaded with the devices to the local store.
+
+        Args:
+            device_name (str): name of the device in NetBox
+            intf_name (str): name of the interface in NetBox
+            nb_intf (pynetbox Record): interface returned by NetBox
+
+        Returns:
+            NetBoxInterface: Interface in DiffSync format
+        """
+        intf = self.interface(name=intf_name, device_name=device_name, remote_id=nb_intf.id)
+        intf = self.apply_model_flag(intf, nb_intf)
+
+        if nb_intf.connected_endpoint_type:
+            intf.connected_endpoint_type = nb_intf.connected_endpoint_type
 
         self.add(intf)
 
         return intf
+
+    def prepare_sync(self, diff):
+        """Find at once all interfaces used by the cables to create that are not present in the local store.
+
+        The interfaces created by the same diff are skipped, they will be in the local store before the cables.
+        Also identify the devices associated with the vlans to create or update that don't have a tag yet.
+
+        Args:
+            diff (Diff): diff that will be applied to NetBox
+        """
+        self.device_tags_pending = {
+            device_name
+            for element in self.get_diff_elements(diff, self.vlan.get_type(), actions=("create", "update"))
+            for device_name in element.get_attrs_diffs().get("+", {}).get("associated_devices", [])
+            if not getattr(self.get_or_none(self.device, device_name), "device_tag_id", True)
+        }
+
+        created_intfs = {
+            (element.keys["device_name"], element.keys["name"])
+            for element in self.get_diff_elements(diff, self.interface.get_type())
+        }
+
+        endpoints = set()
+        for element in self.get_diff_elements(diff, self.cable.get_type()):
+            for side in ["a", "z"]:
+                endpoint = (element.keys[f"device_{side}_name"], element.keys[f"interface_{side}_name"])
+                if endpoint in created_intfs:
+                    continue
+                if not self.get_or_none(self.interface, dict(device_name=endpoint[0], name=endpoint[1])):
+                    endpoints.add(endpoint)
+
+        if endpoints:
+            self.load_netbox_cable_endpoints(endpoints)
+
+    def load_netbox_cable_endpoints(self, endpoints):
+        """Import the interfaces of multiple cable endpoints, settings.cable_endpoints_per_query devices at a time.
+
+        The endpoints not found in NetBox, or found more than once, are recorded in missing_cable_endpoints
+        to not query them again when the cables are created.
+
+        Args:
+            endpoints (set): tuples of device name and interface name
+        """
+        self.missing_cable_endpoints = set()
+        intf_names = defaultdict(set)
+        for device_name, intf_name in endpoints:
+            intf_names[device_name].add(intf_name)
+
+        device_names = sorted(intf_names.keys())
+        batch_size = max(self.settings.cable_endpoints_per_query, 1)
+
+        found = defaultdict(list)
+        for idx in range(0, len(device_names), batch_size):
+            batch = device_names[idx : idx + batch_size]
+            names = sorted(set().union(*[intf_names[device_name] for device_name in batch]))
+            for nb_intf in self.fetch_netbox(self.netbox.dcim.interfaces, device=batch, name=names):
+                endpoint = (nb_intf.device.name, nb_intf.name)
+                if endpoint in endpoints:
+                    found[endpoint].append(nb_intf)
+
+        for endpoint in endpoints:
+            if len(found[endpoint]) == 1:
+                self.add_netbox_cable_endpoint(
+                    device_name=endpoint[0], intf_name=endpoint[1], nb_intf=found[endpoint][0]
+                )
+            else:
+                self.missing_cable_endpoints.add(endpoint)
+
+        LOGGER.debug(
+            "%s | Found %s of %s cable endpoints missing locally in %s devices",
+            self.name,
+            len(endpoints) - len(self.missing_cable_endpoints),
+            len(endpoints),
+            len(device_names),
+        )
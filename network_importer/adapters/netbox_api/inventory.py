@@ -3,15 +3,16 @@
 # pylint: disable=no-member,too-many-arguments,unused-argument,too-many-branches,too-many-statements
 
 import sys
-from typing import Any, List
-import requests
+from typing import Any
 import pynetbox
+from pynetbox.core.query import Request
 from pydantic import ValidationError
 
 from nornir.core.inventory import Defaults, Groups, Hosts, Inventory, ParentGroups, ConnectionOptions
 from nornir.core.plugins.inventory import InventoryPluginRegister
 from network_importer.inventory import NetworkImporterInventory, NetworkImporterHost
-from network_importer.utils import build_filter_params
+from network_importer.utils import build_filter_params, fetch_all_pages
+from network_importer.http_session import get_http_session
 
 from network_importer.adapters.netbox_api.settings import InventorySettings
 
@@ -19,6 +20,8 @@ from network_importer.adapters.netbox_api.settings import InventorySettings
 class NetBoxAPIInventory(NetworkImporterInventory):
     """Netbox API Inventory Class."""
 
+    vc_per_query = 100  # Number of virtual chassis included in each query to fetch their devices
+
     def __init__(
         self,
         *args,
@@ -54,20 +57,65 @@ class NetBoxAPIInventory(NetworkImporterInventory):
 
         # Instantiate netbox session using pynetbox
         self.session = pynetbox.api(url=self.settings.address, token=self.settings.token)
-        if not self.settings.verify_ssl:
-            session = requests.Session()
-            session.verify = False
-            self.session.http_session = session
+        self.session.http_session = get_http_session(verify_ssl=self.settings.verify_ssl)
+
+    def get_devices(self, filters):
+        """Return the devices matching some filters, the pages are fetched concurrently if concurrent_pages is defined.
+
+        Args:
+            filters (dict): filters to apply to the query
+
+        Returns:
+            list: pynetbox devices
+        """
+        if self.settings.concurrent_pages:
+            return fetch_all_pages(
+                self.session.dcim.devices,
+                Request,
+                filters,
+                page_size=self.settings.page_size,
+                max_workers=self.settings.concurrent_pages,
+            )
+
+        return self.session.dcim.devices.filter(**filters)
+
+    def load_devices(self):
+        """Fetch the devices to include in the inventory, filtered by NetBox on the platforms and the virtual chassis.
+
+        The members of the virtual chassis are not part of the main query, only the master of each virtual chassis
+        is fetched, by id. All members of the virtual chassis without master are fetched, like the other devices.
+
+        Returns:
+            list: pynetbox devices
+        """
+        filters = dict(self.filter_parameters)
+        if self.supported_platforms and "platform" not in filters:
+            filters["platform"] = self.supported_platforms
+
+        devices = list(self.get_devices(dict(filters, virtual_chassis_member=False)))
+
+        master_ids, vc_ids = set(), set()
+        for virtual_chassis in self.session.dcim.virtual_chassis.all():
+            if virtual_chassis.master:
+                master_ids.add(virtual_chassis.master.id)
+            else:
+                vc_ids.add(virtual_chassis.id)
+
+        for filter_name, ids in [("id", sorted(master_ids)), ("virtual_chassis_id", sorted(vc_ids))]:
+            for idx in range(0, len(ids), self.vc_per_query):
+                devices.extend(self.get_devices(dict(filters, **{filter_name: ids[idx : idx + self.vc_per_query]})))
+
+        return devices
 
     def load(self):
-        """Load inventory by fetching devices from netbox."""
-        if self.filter_parameters:
-            devices: List[pynetbox.modules.dcim.Devices] = self.session.dcim.devices.filter(**self.filter_parameters)
-        else:
-            devices: List[pynetbox.modules.dcim.Devices] = self.session.dcim.devices.all()
+        """Load inventory by fetching devices from Netbox."""
+        devices = self.load_devices()
 
-        # fetch all platforms from Netbox and build mapping:   platform:  napalm_driver
-        platforms = self.session.dcim.platforms.all()
+        # fetch the supported platforms from NetBox and build mapping:   platform:  napalm_driver
+        if self.supported_platforms:
+            platforms = self.session.dcim.platforms.filter(slug=self.supported_platforms)
+        else:
+            platforms = self.session.dcim.platforms.all()
         platforms_mapping = {platform.slug: platform.napalm_driver for platform in platforms if platform.napalm_driver}
 
         hosts = Hosts()
@@ -90,8 +138,7 @@ class NetBoxAPIInventory(NetworkImporterInventory):
                 host.data["virtual_chassis"] = False
 
             # If supported_platforms is provided
-            # skip all devices that do not match the list of supported platforms
-            # TODO need to see if we can filter when doing the query directly
+            # skip all devices that do not match the list of supported platforms, already filtered in the query
             if self.supported_platforms:
                 if not dev.platform:
                     continue
@@ -120,6 +167,14 @@ class NetBoxAPIInventory(NetworkImporterInventory):
             host.data["custom_fields"] = dev.custom_fields
             host.data["site_id"] = dev.site.id
             host.data["device_id"] = dev.id
+
+            # Keep the fields of the device used by the SOT adapter, to avoid querying NetBox again for each device
+            host.data["device_record"] = {
+                "id": dev.id,
+                "site": {"id": dev.site.id, "slug": dev.site.slug},
+                "primary_ip": {"address": dev.primary_ip.address} if dev.primary_ip else None,
+                "tags": dict(dev).get("tags", []),
+            }
             host.data["role"] = dev.device_role.slug
             host.data["model"] = dev.device_type.slug
 
@@ -1,5 +1,5 @@
 """Extension of the base Models for the NetboxAPIAdapter."""
-from typing import Optional
+from typing import List, Optional
 import logging
 
 import pynetbox
@@ -35,11 +35,16 @@ class NetboxDevice(Device):
 
     device_tag_id: Optional[int]
 
+    def get_device_tag_params(self):
+        """Return the parameters of the tag used to associate this device with its vlans in NetBox."""
+        return dict(name=f"device={self.name}", slug=f"device__{self.name}")
+
     def get_device_tag_id(self):
-        """Get the Netbox id of the tag for this device.
+        """Get the NetBox id of the tag for this device.
 
         If the ID is already present locally return it
-        If not try to retrieve it from netbox or create it in Netbox if needed
+        If the tags are pending in the adapter (see prepare_sync), create all of them at once
+        If not try to retrieve it from NetBox or create it in NetBox if needed
 
         Returns:
             device_tag_id (int)
@@ -47,10 +52,14 @@ class NetboxDevice(Device):
         if self.device_tag_id:
             return self.device_tag_id
 
-        tag = self.diffsync.netbox.extras.tags.get(name=f"device={self.name}")
+        if self.diffsync.device_tags_pending:
+            self.diffsync.create_netbox_device_tags()
+            if self.device_tag_id:
+                return self.device_tag_id
 
+        tag = self.diffsync.netbox.extras.tags.get(name=f"device={self.name}")
         if not tag:
-            tag = self.diffsync.netbox.extras.tags.create(name=f"device={self.name}", slug=f"device__{self.name}")
+            tag = self.diffsync.netbox.extras.tags.create(**self.get_device_tag_params())
 
         self.device_tag_id = tag.id
         return self.device_tag_id
@@ -173,6 +182,12 @@ class NetboxInterface(Interface):
         """
         item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
 
+        if diffsync.bulk_writer:
+            diffsync.bulk_writer.create(
+                item, diffsync.netbox.dcim.interfaces, lambda: item.translate_attrs_for_netbox(attrs)
+            )
+            return item
+
         try:
             nb_params = item.translate_attrs_for_netbox(attrs)
             intf = diffsync.netbox.dcim.interfaces.create(**nb_params)
@@ -218,11 +233,17 @@ class NetboxInterface(Interface):
             return self
 
         current_attrs.update(attrs)
+
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.update(
+                self, self.diffsync.netbox.dcim.interfaces, lambda: self.translate_attrs_for_netbox(current_attrs)
+            )
+            return super().update(attrs)
+
         nb_params = self.translate_attrs_for_netbox(current_attrs)
         LOGGER.debug("Update interface : %s", nb_params)
         try:
-            intf = self.diffsync.netbox.dcim.interfaces.get(self.remote_id)
-            intf.update(data=nb_params)
+            self.diffsync.update_netbox(self.diffsync.netbox.dcim.interfaces, self.remote_id, nb_params)
             LOGGER.info("Updated Interface %s %s (%s) in NetBox", self.device_name, self.name, self.remote_id)
         except pynetbox.core.query.RequestError as exc:
             LOGGER.warning(
@@ -260,9 +281,14 @@ class NetboxInterface(Interface):
                     self.device_name,
                 )
                 return None
+
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.delete(self, self.diffsync.netbox.dcim.interfaces)
+            super().delete()
+            return self
+
         try:
-            intf = self.diffsync.netbox.dcim.interfaces.get(self.remote_id)
-            intf.delete()
+            self.diffsync.delete_netbox(self.diffsync.netbox.dcim.interfaces, self.remote_id)
         except pynetbox.core.query.RequestError as exc:
             LOGGER.warning(
                 "Unable to delete Interface %s on %s in %s (%s)",
@@ -329,6 +355,13 @@ class NetboxIPAddress(IPAddress):
         Returns:
             NetboxIPAddress: DiffSync object
         """
+        if diffsync.bulk_writer:
+            item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
+            diffsync.bulk_writer.create(
+                item, diffsync.netbox.ipam.ip_addresses, lambda: item.translate_attrs_for_netbox(attrs)
+            )
+            return item
+
         try:
             item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
             nb_params = item.translate_attrs_for_netbox(attrs)
@@ -365,9 +398,14 @@ class NetboxIPAddress(IPAddress):
                     self.device_name,
                 )
                 return None
+
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.delete(self, self.diffsync.netbox.ipam.ip_addresses)
+            super().delete()
+            return self
+
         try:
-            ipaddr = self.diffsync.netbox.ipam.ip_addresses.get(self.remote_id)
-            ipaddr.delete()
+            self.diffsync.delete_netbox(self.diffsync.netbox.ipam.ip_addresses, self.remote_id)
         except pynetbox.core.query.RequestError as exc:
             LOGGER.warning(
                 "Unable to delete IP Address %s on %s in %s (%s)",
@@ -464,6 +502,13 @@ class NetboxPrefix(Prefix):
             NetboxPrefix: DiffSync object
         """
         item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
+
+        if diffsync.bulk_writer:
+            diffsync.bulk_writer.create(
+                item, diffsync.netbox.ipam.prefixes, lambda: item.translate_attrs_for_netbox(attrs)
+            )
+            return item
+
         nb_params = item.translate_attrs_for_netbox(attrs)
 
         try:
@@ -495,11 +540,16 @@ class NetboxPrefix(Prefix):
         if attrs == current_attrs:
             return self
 
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.update(
+                self, self.diffsync.netbox.ipam.prefixes, lambda: self.translate_attrs_for_netbox(attrs)
+            )
+            return super().update(attrs)
+
         nb_params = self.translate_attrs_for_netbox(attrs)
 
         try:
-            prefix = self.diffsync.netbox.ipam.prefixes.get(self.remote_id)
-            prefix.update(data=nb_params)
+            self.diffsync.update_netbox(self.diffsync.netbox.ipam.prefixes, self.remote_id, nb_params)
             LOGGER.info("Updated Prefix %s (%s) in NetBox", self.prefix, self.remote_id)
         except pynetbox.core.query.RequestError as exc:
             LOGGER.warning(
@@ -517,6 +567,7 @@ class NetboxVlan(Vlan):
     """Extension of the Vlan model."""
 
     remote_id: Optional[int]
+    remote_tags: List[dict] = list()
     tag_prefix: str = "device="
 
     def translate_attrs_for_netbox(self, attrs):
@@ -568,7 +619,13 @@ class NetboxVlan(Vlan):
         Returns:
             NetboxVlan: DiffSync object
         """
-        item = cls(vid=obj.vid, site_name=site_name, name=obj.name, remote_id=obj.id)
+        item = cls(
+            vid=obj.vid,
+            site_name=site_name,
+            name=obj.name,
+            remote_id=obj.id,
+            remote_tags=[{"id": tag["id"], "name": tag["name"]} for tag in obj.tags],
+        )
 
         # Check the existing tags to learn which device is already associated with this vlan
         # Exclude all devices that are not part of the inventory
@@ -596,6 +653,13 @@ class NetboxVlan(Vlan):
         Returns:
             NetboxVlan: DiffSync object
         """
+        if diffsync.bulk_writer:
+            item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
+            diffsync.bulk_writer.create(
+                item, diffsync.netbox.ipam.vlans, lambda: item.translate_attrs_for_netbox(attrs)
+            )
+            return item
+
         try:
             item = super().create(ids=ids, diffsync=diffsync, attrs=attrs)
             nb_params = item.translate_attrs_for_netbox(attrs)
@@ -608,17 +672,19 @@ class NetboxVlan(Vlan):
 
         return item
 
-    def update_clean_tags(self, nb_params, obj):
+    def update_clean_tags(self, nb_params, obj=None):
         """Update list of vlan tags with additinal tags that already exists on the object in netbox.
 
         Args:
             nb_params (dict): dict of parameters in netbox format
-            obj (pynetbox): Vlan object from pynetbox
+            obj (pynetbox): Vlan object from pynetbox, the tags captured at load time are used if not provided
         """
+        tags = obj.tags if obj else self.remote_tags
+
         # Before updating the remote vlan we need to check the existing list of tags
         # to ensure that we won't delete an existing tags
-        if "tags" in nb_params and nb_params["tags"] and obj.tags:
-            for tag in obj.tags:
+        if "tags" in nb_params and nb_params["tags"] and tags:
+            for tag in tags:
                 if self.tag_prefix not in tag["name"]:
                     nb_params["tags"].append(tag["id"])
                 else:
@@ -638,12 +704,19 @@ class NetboxVlan(Vlan):
         Returns:
             NetboxVlan: DiffSync object
         """
+        if self.diffsync.bulk_writer:
+            self.diffsync.bulk_writer.update(
+                self,
+                self.diffsync.netbox.ipam.vlans,
+                lambda: self.update_clean_tags(nb_params=self.translate_attrs_for_netbox(attrs)),
+            )
+            return super().update(attrs)
+
         nb_params = self.translate_attrs_for_netbox(attrs)
 
         try:
-            vlan = self.diffsync.netbox.ipam.vlans.get(self.remote_id)
-            clean_params = self.update_clean_tags(nb_params=nb_params, obj=vlan)
-            vlan.update(data=clean_params)
+            clean_params = self.update_clean_tags(nb_params=nb_params)
+            self.diffsync.update_netbox(self.diffsync.netbox.ipam.vlans, self.remote_id, clean_params)
             LOGGER.info("Updated Vlan %s (%s) in NetBox", self.get_unique_id(), self.remote_id)
         except pynetbox.core.query.RequestError as exc:
             LOGGER.warning("Unable to update Vlan %s in %s (%s)", self.get_unique_id(), self.diffsync.name, exc.error)
@@ -656,6 +729,7 @@ class NetboxVlanPre29(NetboxVlan):
     """Extension of the Vlan model."""
 
     remote_id: Optional[int]
+    remote_tags: List[str] = list()
     tag_prefix: str = "device="
 
     def translate_attrs_for_netbox(self, attrs):
@@ -694,7 +768,7 @@ class NetboxVlanPre29(NetboxVlan):
         Returns:
             NetboxVlan: DiffSync object
         """
-        item = cls(vid=obj.vid, site_name=site_name, name=obj.name, remote_id=obj.id)
+        item = cls(vid=obj.vid, site_name=site_name, name=obj.name, remote_id=obj.id, remote_tags=list(obj.tags or []))
 
         # Check the existing tags to learn which device is already associated with this vlan
         # Exclude all vlans that are not part of the inventory
@@ -711,17 +785,19 @@ class NetboxVlanPre29(NetboxVlan):
 
         return item
 
-    def update_clean_tags(self, nb_params, obj):
+    def update_clean_tags(self, nb_params, obj=None):
         """Update list of vlan tags with additional tags that already exists on the object in netbox.
 
         Args:
             nb_params (dict): dict of parameters in netbox format
-            obj (pynetbox): Vlan object from pynetbox
+            obj (pynetbox): Vlan object from pynetbox, the tags captured at load time are used if not provided
         """
+        tags = obj.tags if obj else self.remote_tags
+
         # Before updating the remote vlan we need to check the existing list of tags
         # to ensure that we won't delete an existing tags
-        if "tags" in nb_params and nb_params["tags"] and obj.tags:
-            for tag in obj.tags:
+        if "tags" in nb_params and nb_params["tags"] and tags:
+            for tag in tags:
                 if self.tag_prefix not in tag:
                     nb_params["tags"].append(tag)
                 else:
@@ -804,6 +880,21 @@ class NetboxCable(Cable):
             )
             return item
 
+        if diffsync.bulk_writer:
+            diffsync.bulk_writer.create(
+                item,
+                diffsync.netbox.dcim.cables,
+                lambda: dict(
+                    termination_a_type="dcim.interface",
+                    termination_b_type="dcim.interface",
+                    termination_a_id=interface_a.remote_id,
+                    termination_b_id=interface_z.remote_id,
+                ),
+            )
+            interface_a.connected_endpoint_type = "dcim.interface"
+            interface_z.connected_endpoint_type = "dcim.interface"
+            return item
+
         try:
             cable = diffsync.netbox.dcim.cables.create(
                 termination_a_type="dcim.interface",
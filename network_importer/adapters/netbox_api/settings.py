@@ -11,6 +11,21 @@ class AdapterSettings(BaseSettings):
     model_flag_tags: List[str] = list()  # List of tags that defines what objects to assign the model_flag to.
     model_flag: Optional[DiffSyncModelFlags]  # The model flag that will be applied to objects based on tag.
 
+    sites_per_query: int = 50  # Number of sites to include in each query when loading the prefixes and the vlans.
+
+    bulk_load: bool = False  # Load the interfaces and IP addresses of multiple devices at once instead of one by one.
+    bulk_load_nbr_devices: int = 100  # Number of devices to include in each request when bulk_load is enabled.
+    page_size: int = 1000  # Number of objects returned per page when bulk_load or concurrent_pages is enabled.
+    concurrent_pages: int = 0  # Number of pages fetched at the same time, 0 to fetch the pages one after the other.
+
+    incremental_load: bool = False  # Only fetch the objects updated since the previous execution, from a local cache.
+    incremental_load_max_age: int = 24  # Maximum age in hours of the local cache before all objects are fetched again.
+
+    bulk_write: bool = False  # Send the changes to the SOT in batches with the bulk API endpoints.
+    bulk_write_batch_size: int = 500  # Maximum number of objects included in each bulk request.
+
+    cable_endpoints_per_query: int = 50  # Number of devices included in each query to find the cable endpoints.
+
 
 class InventorySettings(BaseSettings):
     """Config settings for the NetboxAPI inventory."""
@@ -21,6 +36,9 @@ class InventorySettings(BaseSettings):
 
     use_primary_ip: Optional[bool] = True
     fqdn: Optional[str] = None
+    page_size: int = 1000  # Number of devices returned per page when concurrent_pages is enabled.
+    concurrent_pages: int = 0  # Number of pages fetched at the same time, 0 to fetch the pages one after the other.
+
     filter: Optional[str] = ""
 
     class Config:
@@ -2,10 +2,10 @@
 import logging
 
 import pynetbox
-import requests
 from nornir.core.task import Result, Task
 
 import network_importer.config as config  # pylint: disable=import-error
+from network_importer.http_session import get_http_session
 
 from network_importer.adapters.netbox_api.settings import InventorySettings
 
@@ -28,11 +28,7 @@ def query_device_info_from_netbox(task: Task) -> Result:
     """
     inventory_settings = InventorySettings(**config.SETTINGS.inventory.settings)
     netbox = pynetbox.api(url=inventory_settings.address, token=inventory_settings.token)
-
-    if not inventory_settings.verify_ssl:
-        session = requests.Session()
-        session.verify = False
-        netbox.http_session = session
+    netbox.http_session = get_http_session(verify_ssl=inventory_settings.verify_ssl)
 
     results = {
         "device": None,
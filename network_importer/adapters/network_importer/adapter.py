@@ -1,12 +1,18 @@
 """Custom Exceptions for the NetworkImporterAdapter."""
+import os
 import re
 import ipaddress
 import json
 import logging
-from collections import defaultdict
+import shutil
+import tempfile
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 from diffsync.exceptions import ObjectNotFound, ObjectAlreadyExists
 
+import pandas as pd
 from pybatfish.client.session import Session
 from pybatfish.exception import BatfishException
 
@@ -15,20 +21,40 @@ import network_importer.config as config
 from network_importer.adapters.base import BaseAdapter
 
 from network_importer.exceptions import AdapterLoadFatalError
+from network_importer.performance import timeit, add_info
 from network_importer.inventory import reachable_devs, valid_and_reachable_devs
-from network_importer.tasks import check_if_reachable, warning_not_reachable
+from network_importer.tasks import warning_not_reachable
+from network_importer.reachability import check_hosts_reachable
 from network_importer.drivers import dispatcher
 from network_importer.processors.get_neighbors import GetNeighbors, hosts_for_cabling
 from network_importer.processors.get_vlans import GetVlans
+from network_importer.processors.get_config import GetConfig
 from network_importer.utils import (
     is_interface_lag,
     is_interface_physical,
     expand_vlans_list,
+    slugify,
 )
 from network_importer.adapters.network_importer.exceptions import BatfishObjectNotValid
+from network_importer.adapters.network_importer.interfaces import prepare_batfish_interfaces
+from network_importer.adapters.network_importer.answers_cache import BatfishAnswersCache
+from network_importer.adapters.network_importer.shards import BatfishShard, get_cross_shard_edges
+from network_importer.adapters.network_importer.snapshot import (
+    get_configs_delta,
+    get_configs_md5,
+    get_directory_fingerprint,
+    get_node_name,
+    load_neighbors,
+    load_snapshot_state,
+    prepare_limited_snapshot,
+    save_neighbors,
+    save_snapshot_state,
+)
 
 LOGGER = logging.getLogger("network-importer")
 
+BATFISH_INIT_LOCK = threading.Lock()
+
 
 class NetworkImporterAdapter(BaseAdapter):
     """Adapter to import data from a network based on Batfish."""
@@ -38,16 +64,28 @@ class NetworkImporterAdapter(BaseAdapter):
     type = "Network"
 
     bfi = None
+    snapshot_fingerprint = None
+    answers_cache = None
+    limited_snapshot_path = None
+    bf_layer3_edges = None
+    batfish_shards = None
 
     def load(self):
         """Initialize batfish and load all data from the network in the local cache."""
         sites = {}
 
-        self.init_batfish()
+        if config.SETTINGS.batfish.shard_by_site:
+            self.init_batfish_shards()
+        elif config.SETTINGS.batfish.answers_cache:
+            self.init_batfish_answers_cache()
+        else:
+            self.init_batfish()
+
+        bf_nodes = self.load_batfish_nodes()
 
         # Create all devices and site object from Nornir Inventory
         for hostname, host in self.nornir.inventory.hosts.items():
-            if len(self.bfi.q.nodeProperties(nodes=f'"{hostname}"').answer()) == 0:
+            if hostname.lower() not in bf_nodes:
                 self.nornir.inventory.hosts[hostname].has_config = False
                 LOGGER.warning("Unable to find information for %s in Batfish, SKIPPING", hostname)
                 continue
@@ -66,7 +104,11 @@ class NetworkImporterAdapter(BaseAdapter):
             self.add(device)
 
         if config.SETTINGS.main.import_cabling in ["lldp", "cdp"] or config.SETTINGS.main.import_vlans in [True, "cli"]:
-            self.nornir.filter(filter_func=reachable_devs).run(task=check_if_reachable, on_failed=True)
+            check_hosts_reachable(
+                self.nornir.filter(filter_func=reachable_devs).inventory.hosts,
+                timeout=config.SETTINGS.main.reachability_timeout,
+                concurrency=config.SETTINGS.main.nbr_reachability_checks,
+            )
             self.nornir.filter(filter_func=reachable_devs).run(task=warning_not_reachable, on_failed=True)
 
         self.load_batfish()
@@ -75,12 +117,68 @@ class NetworkImporterAdapter(BaseAdapter):
 
         self.check_data_consistency()
 
+        if config.SETTINGS.batfish.limit_snapshot_neighbors:
+            self.save_batfish_neighbors()
+
+    @timeit
     def init_batfish(self):
-        """Initialize Batfish snapshot and session."""
-        network_name = config.SETTINGS.batfish.network_name
+        """Initialize Batfish snapshot and session.
+
+        If batfish.reuse_snapshot is enabled and the content of the configs directory has not changed
+        since the snapshot was created, the existing snapshot is used as is.
+        If batfish.incremental_snapshot is enabled, the existing snapshot is forked with only the configurations
+        that have been added, modified or removed since it was created.
+        """
         snapshot_name = config.SETTINGS.batfish.snapshot_name
-        snapshot_path = config.SETTINGS.main.configs_directory
+        snapshot_path = self.get_batfish_snapshot_path()
+
+        try:
+            self.bfi = self._get_batfish_session()
+
+            if self.limited_snapshot_path:
+                self.bfi.init_snapshot(snapshot_path, name=f"{snapshot_name}-limit", overwrite=True)
+                add_info("batfish_snapshot", f"initialized {snapshot_name}-limit")
+                return
+
+            snapshot_state = load_snapshot_state()
+
+            if config.SETTINGS.batfish.reuse_snapshot:
+                self.snapshot_fingerprint = get_directory_fingerprint(snapshot_path)
+
+                if self._is_batfish_snapshot_current(snapshot_state):
+                    self.bfi.set_snapshot(snapshot_state["name"])
+                    LOGGER.info("Configurations have not changed, reusing the Batfish snapshot %s", snapshot_name)
+                    add_info("batfish_snapshot", f"reused {snapshot_state['name']} ({self.snapshot_fingerprint})")
+                    return
 
+            configs = None
+            if config.SETTINGS.batfish.incremental_snapshot:
+                configs = get_configs_md5(snapshot_path, known_md5=self._get_inventory_configs_md5())
+
+                if self._fork_batfish_snapshot(snapshot_state, configs):
+                    return
+
+            self.bfi.init_snapshot(snapshot_path, name=snapshot_name, overwrite=True)
+            self._delete_previous_batfish_snapshot(snapshot_state, snapshot_name)
+
+            if self.snapshot_fingerprint or configs is not None:
+                save_snapshot_state(
+                    dict(
+                        name=snapshot_name, fingerprint=self.snapshot_fingerprint, configs=configs, deactivated_nodes=[]
+                    )
+                )
+            else:
+                save_snapshot_state(None)
+            add_info(
+                "batfish_snapshot", f"initialized {snapshot_name} ({self.snapshot_fingerprint or 'no fingerprint'})"
+            )
+
+        except BatfishException as exc:
+            raise AdapterLoadFatalError(self._get_batfish_error(exc)) from exc
+
+    @staticmethod
+    def _get_batfish_session():
+        """Return a new Batfish session connected to the network defined in the configuration."""
         bf_params = dict(
             host=config.SETTINGS.batfish.address,
             port_v1=config.SETTINGS.batfish.port_v1,
@@ -90,36 +188,403 @@ class NetworkImporterAdapter(BaseAdapter):
         if config.SETTINGS.batfish.api_key:
             bf_params["api_key"] = config.SETTINGS.batfish.api_key
 
+        bfi = Session.get("bf", **bf_params)
+        bfi.verify = False
+        bfi.set_network(config.SETTINGS.batfish.network_name)
+        return bfi
+
+    @staticmethod
+    def _get_batfish_error(exc):
+        """Extract the error message from a BatfishException."""
+        error = json.loads(str(exc).splitlines()[-1])
+        return re.sub(r"[^:]*:.", "", error["answerElements"][0]["answer"][0])
+
+    def init_batfish_shards(self):
+        """Prepare one snapshot per site, with only the configurations of the devices of this site.
+
+        The snapshots are created in Batfish by ask_batfish when the first question is sent to each shard,
+        which allows Batfish to parse multiple shards concurrently.
+        If the answers cache is enabled, each shard has its own fingerprint.
+        """
+        self.batfish_shards = {}
+        hostnames = defaultdict(list)
+        for hostname, host in self.nornir.inventory.hosts.items():
+            hostnames[host.site_name].append(hostname)
+
+        for site_name in sorted(hostnames):
+            # The name of the site can contain characters that are not valid in a path (/, .., spaces ...)
+            site_slug = slugify(site_name)
+            shard = BatfishShard(
+                site_name=site_name,
+                path=os.path.join(config.SETTINGS.main.cache_directory, "shards", site_slug),
+                snapshot_name=f"{config.SETTINGS.batfish.snapshot_name}-{site_slug}",
+                hostnames=sorted(hostnames[site_name]),
+            )
+            prepare_limited_snapshot(config.SETTINGS.main.configs_directory, shard.path, shard.hostnames)
+
+            if config.SETTINGS.batfish.answers_cache:
+                shard.answers_cache = BatfishAnswersCache(
+                    directory=os.path.join(config.SETTINGS.main.cache_directory, "batfish_answers"),
+                    fingerprint=get_directory_fingerprint(shard.path),
+                    max_size=config.SETTINGS.batfish.answers_cache_max_size * 1024 * 1024,
+                )
+
+            self.batfish_shards[site_name] = shard
+
+        add_info("batfish_snapshot", f"{len(self.batfish_shards)} shard(s)")
+
+    def _init_batfish_shard(self, shard):
+        """Create the snapshot of a shard in Batfish."""
         try:
-            self.bfi = Session.get("bf", **bf_params)
-            self.bfi.verify = False
-            self.bfi.set_network(network_name)
-            self.bfi.init_snapshot(snapshot_path, name=snapshot_name, overwrite=True)
+            session = self._get_batfish_session()
+            session.init_snapshot(shard.path, name=shard.snapshot_name, overwrite=True)
         except BatfishException as exc:
-            error = json.loads(str(exc).splitlines()[-1])
-            error = re.sub(r"[^:]*:.", "", error["answerElements"][0]["answer"][0])
-            raise AdapterLoadFatalError(error) from exc
+            raise AdapterLoadFatalError(f"{shard.site_name}: {self._get_batfish_error(exc)}") from exc
+
+        LOGGER.debug("Initialized the Batfish snapshot %s (%s)", shard.snapshot_name, shard)
+        shard.session = session
+
+    def get_batfish_snapshot_path(self):
+        """Return the path of the directory used to create the Batfish snapshot.
+
+        If the inventory has been limited and batfish.limit_snapshot is enabled, a directory with only
+        the configurations of the devices in the inventory is prepared in the cache_directory.
+        If batfish.limit_snapshot_neighbors is enabled, the neighbors of these devices found during
+        the previous executions are included as well.
+
+        Returns:
+            str: path to the snapshot directory
+        """
+        if self.limited_snapshot_path:
+            return self.limited_snapshot_path
+
+        if not self.limit or not self.nornir or not config.SETTINGS.batfish.limit_snapshot:
+            return config.SETTINGS.main.configs_directory
+
+        hostnames = set(self.nornir.inventory.hosts.keys())
+        if config.SETTINGS.batfish.limit_snapshot_neighbors:
+            neighbors = load_neighbors()
+            for hostname in list(hostnames):
+                hostnames.update(neighbors.get(hostname, []))
+
+        self.limited_snapshot_path = os.path.join(config.SETTINGS.main.cache_directory, "limited_snapshot")
+        configs = prepare_limited_snapshot(
+            config.SETTINGS.main.configs_directory, self.limited_snapshot_path, hostnames
+        )
+        LOGGER.info("Limited the Batfish snapshot to %s configuration(s)", len(configs))
+
+        return self.limited_snapshot_path
+
+    def init_batfish_answers_cache(self):
+        """Initialize the cache of the Batfish answers based on the fingerprint of the configs directory.
+
+        The Batfish session is not initialized here, it will be initialized by ask_batfish
+        only if an answer is not available in the cache.
+        """
+        self.snapshot_fingerprint = get_directory_fingerprint(self.get_batfish_snapshot_path())
+        self.answers_cache = BatfishAnswersCache(
+            directory=os.path.join(config.SETTINGS.main.cache_directory, "batfish_answers"),
+            fingerprint=self.snapshot_fingerprint,
+            max_size=config.SETTINGS.batfish.answers_cache_max_size * 1024 * 1024,
+        )
+
+    def ask_batfish(self, question, params, shard=None):
+        """Return the answer of a Batfish question as a DataFrame.
+
+        If the answers cache is enabled, the answer is returned from the cache if available
+        and saved in the cache otherwise.
+
+        Args:
+            question (str): Name of the Batfish question
+            params (dict): Parameters of the question, as returned by plan_batfish_question
+            shard (BatfishShard, optional): Shard to query, if the snapshots are sharded by site
+
+        Returns:
+            DataFrame: answer of the question
+        """
+        answers_cache = shard.answers_cache if shard else self.answers_cache
+        if answers_cache:
+            frame = answers_cache.get(question, params)
+            if frame is not None:
+                return frame
+
+        if shard:
+            if not shard.session:
+                with shard.lock:
+                    if not shard.session:
+                        self._init_batfish_shard(shard)
+            bfi = shard.session
+        else:
+            if not self.bfi:
+                with BATFISH_INIT_LOCK:
+                    if not self.bfi:
+                        self.init_batfish()
+            bfi = self.bfi
+
+        frame = getattr(bfi.q, question)(**params).answer().frame()
+
+        if answers_cache:
+            answers_cache.set(question, params, frame)
+            add_info("batfish_answers_cache", f"{answers_cache.hits} hit(s), {answers_cache.misses} miss(es)")
+
+        return frame
+
+    def save_batfish_neighbors(self):
+        """Save the neighbors of all devices, based on the cables, to build limited snapshots in the future."""
+        neighbors = defaultdict(list)
+        for cable in self.get_all(self.cable):
+            neighbors[cable.device_a_name].append(cable.device_z_name)
+            neighbors[cable.device_z_name].append(cable.device_a_name)
+
+        save_neighbors([device.name for device in self.get_all(self.device)], neighbors)
+
+    def _is_batfish_snapshot_current(self, snapshot_state):
+        """Check if the snapshot present in Batfish has been created from the current configurations.
+
+        Args:
+            snapshot_state (dict): state saved when the snapshot was created
+
+        Returns:
+            bool: True if the snapshot exists and its fingerprint matches the configs directory
+        """
+        if not self.snapshot_fingerprint or snapshot_state.get("fingerprint") != self.snapshot_fingerprint:
+            return False
+
+        return snapshot_state.get("name") in self.bfi.list_snapshots()
+
+    def _get_inventory_configs_md5(self):
+        """Return the md5 of the configurations already calculated by the GetConfig processor, indexed by filename."""
+        if not self.nornir:
+            return {}
+
+        return {
+            f"{hostname}.{GetConfig.config_extension}": host.config_md5
+            for hostname, host in self.nornir.inventory.hosts.items()
+            if getattr(host, "config_md5", None)
+        }
+
+    def _fork_batfish_snapshot(self, snapshot_state, configs):
+        """Fork the existing snapshot with only the configurations that changed since it was created.
+
+        The modified configurations are uploaded again and the nodes associated with the configurations
+        that have been removed are deactivated.
+        Batfish can't fork a snapshot into itself, the new snapshot alternates between
+        batfish.snapshot_name and batfish.snapshot_name-incremental and the previous one is deleted.
+
+        Args:
+            snapshot_state (dict): state saved when the existing snapshot was created
+            configs (dict): md5 of each configuration currently present, indexed by filename
+
+        Returns:
+            bool: True if the snapshot has been forked, False if a new snapshot must be created
+        """
+        snapshot_name = config.SETTINGS.batfish.snapshot_name
+        base_name = snapshot_state.get("name")
+
+        if "configs" not in snapshot_state or base_name not in self.bfi.list_snapshots():
+            return False
+
+        changed, removed = get_configs_delta(snapshot_state["configs"], configs)
+        nbr_configs = max(len(configs), len(snapshot_state["configs"]), 1)
+        if len(changed) + len(removed) > nbr_configs * config.SETTINGS.batfish.incremental_snapshot_max_ratio:
+            LOGGER.info(
+                "%s configuration(s) changed out of %s, unable to use an incremental snapshot",
+                len(changed) + len(removed),
+                nbr_configs,
+            )
+            return False
+
+        deactivated_nodes = set(snapshot_state.get("deactivated_nodes", []))
+        deactivate_nodes = sorted({get_node_name(filename) for filename in removed} - deactivated_nodes)
+        restore_nodes = sorted(deactivated_nodes & {get_node_name(filename) for filename in changed})
+        deactivated_nodes = (deactivated_nodes - set(restore_nodes)) | set(deactivate_nodes)
+
+        name = snapshot_name if base_name != snapshot_name else f"{snapshot_name}-incremental"
+
+        with tempfile.TemporaryDirectory() as add_files:
+            os.mkdir(os.path.join(add_files, "configs"))
+            for filename in changed:
+                shutil.copy(
+                    os.path.join(config.SETTINGS.main.configs_directory, "configs", filename),
+                    os.path.join(add_files, "configs", filename),
+                )
+
+            self.bfi.fork_snapshot(
+                base_name,
+                name=name,
+                overwrite=True,
+                add_files=add_files if changed else None,
+                deactivate_nodes=deactivate_nodes or None,
+                restore_nodes=restore_nodes or None,
+            )
+
+        self._delete_previous_batfish_snapshot(snapshot_state, name)
+        save_snapshot_state(
+            dict(
+                name=name,
+                fingerprint=self.snapshot_fingerprint,
+                configs=configs,
+                deactivated_nodes=sorted(deactivated_nodes),
+            )
+        )
+
+        LOGGER.info(
+            "Forked the Batfish snapshot %s into %s, %s configuration(s) updated and %s removed",
+            base_name,
+            name,
+            len(changed),
+            len(removed),
+        )
+        add_info("batfish_snapshot", f"forked {base_name} into {name} ({len(changed)} updated, {len(removed)} removed)")
+        return True
+
+    def _delete_previous_batfish_snapshot(self, snapshot_state, name):
+        """Delete the snapshot previously created by an incremental update if it's not the current one anymore."""
+        previous_name = snapshot_state.get("name")
+        if not previous_name or previous_name == name:
+            return
+
+        if previous_name in self.bfi.list_snapshots():
+            self.bfi.delete_snapshot(previous_name)
+
+    @timeit
+    def load_batfish_nodes(self):
+        """Query Batfish once to get the list of all nodes present in the snapshot.
+
+        Batfish normalizes all hostnames in lowercase, the names returned are lowercase as well.
+        If the snapshots are sharded by site, all shards are queried concurrently.
 
+        Returns:
+            set: name of all nodes with a configuration in Batfish
+        """
+        params = self.plan_batfish_question("nodeProperties")
+        if not self.batfish_shards:
+            nodes = self.ask_batfish("nodeProperties", params)
+            return {str(node).lower() for node in nodes["Node"]}
+
+        bf_nodes = set()
+        questions = [("nodeProperties", params, shard) for shard in self.batfish_shards.values()]
+        for nodes in self.ask_batfish_concurrently(questions):
+            bf_nodes.update(str(node).lower() for node in nodes["Node"])
+
+        return bf_nodes
+
+    @timeit
     def load_batfish(self):
-        """Load all devices, interfaces and IP Addresses from Batfish."""
-        # Import Devices
-        devices = self.get_all(self.device)
+        """Load all devices, interfaces and IP Addresses from Batfish.
+
+        Batfish is queried for multiple devices at once, based on batfish.nodes_per_query,
+        and the answers are split per device before being loaded.
+        The questions are sent to Batfish concurrently, up to batfish.max_concurrent_questions at a time,
+        but the answers are always loaded in the same order. If the cables must be imported from the configuration,
+        layer3Edges is asked at the same time and its answer is kept for load_batfish_cable.
+
+        If the snapshots are sharded by site, the devices of each site are queried in their own shard
+        and the layer3 edges of all shards are merged, including the edges across shards.
+        """
+        chunks = []
+        if self.batfish_shards:
+            for site_name, shard in self.batfish_shards.items():
+                devices = [device for device in self.get_all(self.device) if device.site_name == site_name]
+                chunks.extend([(chunk, shard) for chunk in self._get_batfish_nodes_chunks(devices) if chunk])
+        else:
+            chunks = [(chunk, None) for chunk in self._get_batfish_nodes_chunks(self.get_all(self.device))]
+
+        questions = []
+        import_batfish_cable = config.SETTINGS.main.import_cabling in ["config", True]
+        edges_shards = list(self.batfish_shards.values()) if self.batfish_shards else [None]
+        if import_batfish_cable:
+            for shard in edges_shards:
+                questions.append(("layer3Edges", self.plan_batfish_question("layer3Edges"), shard))
+
+        for chunk, shard in chunks:
+            nodes = None
+            if config.SETTINGS.batfish.nodes_per_query:
+                nodes = [device.name for device in chunk]
+
+            questions.append(
+                ("switchedVlanProperties", self.plan_batfish_question("switchedVlanProperties", nodes), shard)
+            )
+            questions.append(("interfaceProperties", self.plan_batfish_question("interfaceProperties", nodes), shard))
+
+        answers = self.ask_batfish_concurrently(questions)
+
+        if import_batfish_cable:
+            bf_layer3_edges = [next(answers) for _ in edges_shards]
+
+        shards_intfs = []
+        for chunk, shard in chunks:
+            bf_vlans = next(answers)
+            if bf_vlans is not None:
+                bf_vlans = self._split_batfish_frame(bf_vlans, bf_vlans["Node"])
+
+            bf_intfs = next(answers)
+            if shard and import_batfish_cable:
+                shards_intfs.append((shard.site_name, bf_intfs))
+            bf_intfs = self._split_batfish_frame(bf_intfs, bf_intfs["Interface"].map(lambda intf: intf.hostname))
+
+            for device in chunk:
+                self.load_batfish_device(
+                    device=device,
+                    bf_intfs=bf_intfs[device.name.lower()],
+                    bf_vlans=bf_vlans[device.name.lower()] if bf_vlans is not None else None,
+                )
+
+        if import_batfish_cable:
+            if self.batfish_shards:
+                bf_layer3_edges.append(get_cross_shard_edges(shards_intfs))
+            self.bf_layer3_edges = pd.concat(bf_layer3_edges, ignore_index=True)
+
+    def ask_batfish_concurrently(self, questions):
+        """Ask multiple Batfish questions concurrently and return the answers in the same order as the questions.
+
+        At most batfish.max_concurrent_questions questions are in progress at the same time,
+        the next question is sent only when the oldest answer has been consumed.
+
+        Args:
+            questions (list[tuple]): Name, parameters and optionally shard of each question,
+                skipped if the parameters are None
+
+        Returns:
+            Generator[DataFrame]: answer of each question, None if the question has been skipped
+        """
+        max_workers = max(config.SETTINGS.batfish.max_concurrent_questions, 1)
+
+        # Initialize the session before sending the questions to ensure it's only initialized once
+        if not self.bfi and not self.answers_cache and not self.batfish_shards:
+            self.init_batfish()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = deque()
+            for question in questions:
+                futures.append(executor.submit(self.ask_batfish, *question) if question[1] is not None else None)
+                if len(futures) > max_workers:
+                    future = futures.popleft()
+                    yield future.result() if future else None
+
+            while futures:
+                future = futures.popleft()
+                yield future.result() if future else None
 
-        for device in devices:
-            self.load_batfish_device(device=device)
+    def load_batfish_device(self, device, bf_intfs=None, bf_vlans=None):
+        """Load all interfaces and vlans for a given device from Batfish.
 
-    def load_batfish_device(self, device):
-        """Load all devices from Batfish.
+        If the answers from Batfish are not provided, they will be queried for this device only.
 
         Args:
             device (Device): Device object
+            bf_intfs (DataFrame, optional): Answer of interfaceProperties for this device
+            bf_vlans (DataFrame, optional): Answer of switchedVlanProperties for this device
         """
         site = self.get(self.site, identifier=device.site_name)
 
         interface_vlans_mapping = defaultdict(list)
-        if config.SETTINGS.main.import_vlans:
-            bf_vlans = self.bfi.q.switchedVlanProperties(nodes=f'"{device.name}"').answer()
-            for bf_vlan in bf_vlans.frame().itertuples():
+        vlans_params = self.plan_batfish_question("switchedVlanProperties", nodes=[device.name])
+        if vlans_params is not None:
+            if bf_vlans is None:
+                bf_vlans = self.ask_batfish("switchedVlanProperties", vlans_params)
+
+            for bf_vlan in bf_vlans.itertuples():
                 if config.SETTINGS.main.import_vlans in ["config", True]:
                     vlan, created = self.get_or_add(
                         self.vlan(name=f"vlan-{bf_vlan.VLAN_ID}", vid=bf_vlan.VLAN_ID, site_name=site.name)
@@ -137,15 +602,158 @@ class NetworkImporterAdapter(BaseAdapter):
                         self.vlan.create_unique_id(vid=bf_vlan.VLAN_ID, site_name=site.name)
                     )
 
-        intfs = self.bfi.q.interfaceProperties(nodes=f'"{device.name}"').answer().frame()
-        for _, intf in intfs.iterrows():
-            self.load_batfish_interface(
-                site=site,
-                device=device,
-                intf=dict(intf),
-                interface_vlans=interface_vlans_mapping[intf["Interface"].interface],
+        if bf_intfs is None:
+            intfs_params = self.plan_batfish_question("interfaceProperties", nodes=[device.name])
+            bf_intfs = self.ask_batfish("interfaceProperties", intfs_params)
+
+        self.load_batfish_interfaces(
+            site=site, device=device, bf_intfs=bf_intfs, interface_vlans_mapping=interface_vlans_mapping
+        )
+
+    def load_batfish_interfaces(self, site, device, bf_intfs, interface_vlans_mapping):
+        """Load all interfaces of a device from an interfaceProperties answer, including IP addresses and prefixes.
+
+        All attributes that do not depend on the content of the local store are computed once
+        for the entire answer with prepare_batfish_interfaces before the interfaces are created.
+
+        Args:
+            site (Site): Site object
+            device (Device): Device object
+            bf_intfs (DataFrame): Answer of interfaceProperties for this device
+            interface_vlans_mapping (dict): List of vlan uids associated with each interface, indexed by interface name
+
+        Returns:
+            list[Interface]
+        """
+        intfs = prepare_batfish_interfaces(bf_intfs, import_intf_status=config.SETTINGS.main.import_intf_status)
+
+        interfaces = []
+        for (
+            name,
+            mtu,
+            switchport_mode,
+            description,
+            active,
+            is_lag,
+            is_virtual,
+            is_lag_member,
+            channel_group,
+            encapsulation_vlan,
+            allowed_vlans,
+            native_vlan,
+            access_vlan,
+            prefixes,
+        ) in intfs.itertuples(index=False, name=None):
+            interface = self.interface(
+                name=name,
+                device_name=device.name,
+                mtu=mtu,
+                switchport_mode=switchport_mode,
+                description=description,
+                active=active,
+                is_lag=is_lag,
+                is_virtual=is_virtual,
+                is_lag_member=is_lag_member,
+            )
+
+            if channel_group:
+                interface.parent = self.interface.create_unique_id(device_name=device.name, name=channel_group)
+
+            interfaces.append(
+                self._add_batfish_interface(
+                    site=site,
+                    device=device,
+                    interface=interface,
+                    interface_vlans=interface_vlans_mapping.get(name, []),
+                    encapsulation_vlan=encapsulation_vlan,
+                    allowed_vlans=allowed_vlans,
+                    native_vlan=native_vlan,
+                    access_vlan=access_vlan,
+                    prefixes=prefixes,
+                )
             )
 
+        return interfaces
+
+    @staticmethod
+    def plan_batfish_question(question, nodes=None):
+        """Define the parameters of a Batfish question based on the import options enabled in the configuration.
+
+        Only the properties required to build the local store are requested from Batfish,
+        the other properties are not serialized, transferred nor stored in the DataFrame.
+
+        Args:
+            question (str): Name of the Batfish question
+            nodes (list[str], optional): Name of the nodes to query, all nodes will be queried if not provided
+
+        Returns:
+            dict: Parameters of the question, None if the question is not required
+        """
+        params = {}
+        if nodes:
+            params["nodes"] = ",".join([f'"{node}"' for node in nodes])
+
+        if question == "nodeProperties":
+            params["properties"] = "Configuration_Format"
+
+        elif question == "interfaceProperties":
+            properties = ["Channel_Group", "Description", "Encapsulation_VLAN", "MTU", "Switchport_Mode"]
+            if config.SETTINGS.main.import_intf_status:
+                properties.append("Active")
+            if (
+                config.SETTINGS.main.import_ips
+                or config.SETTINGS.main.import_prefixes
+                or (config.SETTINGS.batfish.shard_by_site and config.SETTINGS.main.import_cabling in ["config", True])
+            ):
+                # The prefixes are required to find the edges across shards
+                properties.append("All_Prefixes")
+            if config.SETTINGS.main.import_vlans not in [False, "no"]:
+                properties.extend(["Access_VLAN", "Allowed_VLANs", "Native_VLAN"])
+            params["properties"] = ",".join(sorted(properties))
+
+        elif question == "switchedVlanProperties" and not config.SETTINGS.main.import_vlans:
+            return None
+
+        return params
+
+    @staticmethod
+    def _get_batfish_nodes_chunks(devices):
+        """Split a list of devices in chunks of batfish.nodes_per_query devices.
+
+        Args:
+            devices (list[Device]): List of devices
+
+        Returns:
+            list[list[Device]]: List of chunks, a single chunk with all devices if nodes_per_query is 0
+        """
+        size = config.SETTINGS.batfish.nodes_per_query
+        if not size:
+            return [devices]
+
+        return [devices[idx : idx + size] for idx in range(0, len(devices), size)]
+
+    @staticmethod
+    def _split_batfish_frame(frame, hostnames):
+        """Split a Batfish answer per hostname.
+
+        Args:
+            frame (DataFrame): Answer returned by Batfish
+            hostnames (Series): Name of the node associated with each row of the frame
+
+        Returns:
+            defaultdict: DataFrame for each hostname (lowercase), an empty DataFrame for unknown hostnames
+        """
+        empty_frame = frame.iloc[0:0]
+        results = defaultdict(lambda: empty_frame)
+
+        if frame.empty:
+            return results
+
+        for hostname, node_frame in frame.groupby(hostnames.map(lambda name: str(name).lower()), sort=False):
+            results[hostname] = node_frame
+
+        return results
+
     def load_batfish_interface(
         self, site, device, intf, interface_vlans=[]
     ):  # pylint: disable=dangerous-default-value,unused-argument,too-many-statements,too-many-branches,too-many-locals
@@ -166,15 +774,6 @@ class NetworkImporterAdapter(BaseAdapter):
         #     LOGGER.warning("Unable to add an interface on %s, the data is not valid (%s)", device.name, str(exc))
         #     return False
 
-        # Since it's possible to import vlans from the config and or from the CLI, we need to track 2 differents flags
-        #  import_vlans = import the vlans information to the interface, populate allowed_vlans, access_vlan and mode
-        #  create_vlans = create the vlans object
-        import_vlans = create_vlans = False
-        if config.SETTINGS.main.import_vlans in ["config", True, "yes"]:
-            create_vlans = True
-        if config.SETTINGS.main.import_vlans not in [False, "no"]:
-            import_vlans = True
-
         interface = self.interface(
             name=intf["Interface"].interface,
             device_name=device.name,
@@ -211,10 +810,64 @@ class NetworkImporterAdapter(BaseAdapter):
         elif interface.is_lag is None:
             interface.is_lag = False
 
+        if interface.is_lag is False and interface.is_lag_member is None and intf.get("Channel_Group"):
+            interface.parent = self.interface(name=intf["Channel_Group"], device_name=device.name).get_unique_id()
+            interface.is_lag_member = True
+            interface.is_virtual = False
+
+        return self._add_batfish_interface(
+            site=site,
+            device=device,
+            interface=interface,
+            interface_vlans=interface_vlans,
+            encapsulation_vlan=intf.get("Encapsulation_VLAN"),
+            allowed_vlans=intf.get("Allowed_VLANs"),
+            native_vlan=intf.get("Native_VLAN"),
+            access_vlan=intf.get("Access_VLAN"),
+            prefixes=intf.get("All_Prefixes", []),
+        )
+
+    def _add_batfish_interface(
+        self,
+        site,
+        device,
+        interface,
+        interface_vlans,
+        encapsulation_vlan=None,
+        allowed_vlans=None,
+        native_vlan=None,
+        access_vlan=None,
+        prefixes=None,
+    ):  # pylint: disable=too-many-arguments,too-many-branches
+        """Define the mode and the vlans of an interface, add it to the local store and load its IP addresses.
+
+        Args:
+            site (Site): Site object
+            device (Device): Device object
+            interface (Interface): Interface object, not yet present in the local store
+            interface_vlans (list[str]): List of vlan uids associated with this interface
+            encapsulation_vlan (int, optional): Encapsulation vlan of the interface as reported by Batfish
+            allowed_vlans (str, optional): Allowed vlans of the interface as reported by Batfish
+            native_vlan (int, optional): Native vlan of the interface as reported by Batfish
+            access_vlan (int, optional): Access vlan of the interface as reported by Batfish
+            prefixes (list[str], optional): List of IP addresses configured on the interface
+
+        Returns:
+            Interface
+        """
+        # Since it's possible to import vlans from the config and or from the CLI, we need to track 2 differents flags
+        #  import_vlans = import the vlans information to the interface, populate allowed_vlans, access_vlan and mode
+        #  create_vlans = create the vlans object
+        import_vlans = create_vlans = False
+        if config.SETTINGS.main.import_vlans in ["config", True, "yes"]:
+            create_vlans = True
+        if config.SETTINGS.main.import_vlans not in [False, "no"]:
+            import_vlans = True
+
         if interface.mode is None and interface.switchport_mode:
-            if intf["Encapsulation_VLAN"]:
+            if encapsulation_vlan:
                 interface.mode = "L3_SUB_VLAN"
-                vlan = self.vlan(vid=intf["Encapsulation_VLAN"], site_name=site.name)
+                vlan = self.vlan(vid=encapsulation_vlan, site_name=site.name)
                 vlan, _ = self.get_or_create_vlan(vlan, site)
                 if import_vlans:
                     interface.allowed_vlans = [vlan.get_unique_id()]
@@ -223,7 +876,7 @@ class NetworkImporterAdapter(BaseAdapter):
                 interface.mode = interface.switchport_mode
 
         if interface.mode == "TRUNK":
-            vids = expand_vlans_list(intf["Allowed_VLANs"])
+            vids = expand_vlans_list(allowed_vlans)
             for vid in vids:
                 vlan = self.vlan(vid=vid, site_name=site.name)
                 if create_vlans:
@@ -233,34 +886,26 @@ class NetworkImporterAdapter(BaseAdapter):
 
             interface_vlans = interface.allowed_vlans
 
-            if intf["Native_VLAN"]:
-                native_vlan = self.vlan(vid=intf["Native_VLAN"], site_name=site.name)
+            if native_vlan:
+                native_vlan = self.vlan(vid=native_vlan, site_name=site.name)
                 if create_vlans:
                     native_vlan, _ = self.get_or_create_vlan(native_vlan)
                 if import_vlans:
                     interface.access_vlan = native_vlan.get_unique_id()
                     interface_vlans = [interface.access_vlan]
 
-        elif interface.mode == "ACCESS" and intf["Access_VLAN"]:
-            vlan = self.vlan(vid=intf["Access_VLAN"], site_name=site.name)
+        elif interface.mode == "ACCESS" and access_vlan:
+            vlan = self.vlan(vid=access_vlan, site_name=site.name)
             if create_vlans:
                 vlan, _ = self.get_or_create_vlan(vlan, site)
             if import_vlans:
                 interface.access_vlan = vlan.get_unique_id()
                 interface_vlans = [interface.access_vlan]
 
-        if interface.is_lag is False and interface.is_lag_member is None and intf["Channel_Group"]:
-            interface.parent = self.interface(name=intf["Channel_Group"], device_name=device.name).get_unique_id()
-            interface.is_lag_member = True
-            interface.is_virtual = False
-
         self.add(interface)
         device.add_child(interface)
 
-        if "All_Prefixes" not in intf:
-            return interface
-
-        for prefix in intf["All_Prefixes"]:
+        for prefix in prefixes or []:
             self.load_batfish_ip_address(
                 site=site, device=device, interface=interface, address=prefix, interface_vlans=interface_vlans
             )
@@ -397,9 +1042,11 @@ class NetworkImporterAdapter(BaseAdapter):
     def load_batfish_cable(self):
         """Import cables from Batfish using layer3Edges tables."""
         device_names = [device.name for device in self.get_all(self.device)]
-        p2p_links = self.bfi.q.layer3Edges().answer()
+        p2p_links = self.bf_layer3_edges
+        if p2p_links is None:
+            p2p_links = self.ask_batfish("layer3Edges", self.plan_batfish_question("layer3Edges"))
         existing_cables = []
-        for link in p2p_links.frame().itertuples():
+        for link in p2p_links.itertuples():
             if link.Interface.hostname not in device_names:
                 continue
 
@@ -0,0 +1,131 @@
+"""Persistent cache of the answers returned by Batfish for the NetworkImporterAdapter.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import json
+import pickle  # nosec
+import hashlib
+import logging
+
+import pandas as pd
+
+LOGGER = logging.getLogger("network-importer")
+
+ANSWERS_CACHE_EXTENSION = "pkl.gz"
+ANSWERS_CACHE_COMPRESSION = {"method": "gzip", "compresslevel": 1}
+
+
+class BatfishAnswersCache:
+    """Store the answers of the Batfish questions on disk, indexed by snapshot fingerprint and question parameters.
+
+    The answers are saved as compressed pickle files because the frames returned by Batfish contain
+    pybatfish objects (Interface, Edge ..) that most columnar formats can't serialize.
+    When the size of the cache exceeds max_size, the least recently used answers are deleted.
+    """
+
+    def __init__(self, directory, fingerprint, max_size):
+        """Initialize the cache.
+
+        Args:
+            directory (str): directory where the answers are stored
+            fingerprint (str): fingerprint of the configurations included in the snapshot
+            max_size (int): maximum size of the cache in bytes, 0 to disable the eviction
+        """
+        self.directory = directory
+        self.fingerprint = fingerprint
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def get_path(self, question, params):
+        """Return the path of the file associated with a question."""
+        key = json.dumps(
+            dict(fingerprint=self.fingerprint, question=question, params=params), sort_keys=True, default=str
+        )
+        filename = f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.{ANSWERS_CACHE_EXTENSION}"
+        return os.path.join(self.directory, filename)
+
+    def get(self, question, params):
+        """Return the answer of a question if present in the cache.
+
+        Args:
+            question (str): Name of the Batfish question
+            params (dict): Parameters of the question
+
+        Returns:
+            DataFrame: answer of the question, None if not present in the cache
+        """
+        path = self.get_path(question, params)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        try:
+            frame = pd.read_pickle(path, compression=ANSWERS_CACHE_COMPRESSION)  # nosec
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError) as exc:
+            LOGGER.warning("Unable to read the answer of %s from the cache (%s)", question, exc)
+            self.misses += 1
+            return None
+
+        # Update the modification time to track which answers have been used recently
+        os.utime(path)
+        self.hits += 1
+        return frame
+
+    def set(self, question, params, frame):
+        """Save the answer of a question in the cache.
+
+        Args:
+            question (str): Name of the Batfish question
+            params (dict): Parameters of the question
+            frame (DataFrame): answer of the question
+        """
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory, exist_ok=True)
+            LOGGER.debug("Directory %s was missing, created it", self.directory)
+
+        path = self.get_path(question, params)
+        frame.to_pickle(f"{path}.tmp", compression=ANSWERS_CACHE_COMPRESSION)
+        os.replace(f"{path}.tmp", path)
+
+        self.evict()
+
+    def evict(self):
+        """Delete the least recently used answers until the size of the cache is below max_size.
+
+        The answers can be saved from multiple threads, a file might be deleted while the cache is evaluated.
+        """
+        if not self.max_size or not os.path.isdir(self.directory):
+            return
+
+        files = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(ANSWERS_CACHE_EXTENSION):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, filename))
+
+        total_size = sum(size for _, size, _ in files)
+        for _, size, filename in sorted(files):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            LOGGER.debug("Removed %s from the Batfish answers cache", filename)
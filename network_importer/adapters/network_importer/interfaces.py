@@ -0,0 +1,151 @@
+"""Columnar processing of the interfaces returned by Batfish for the NetworkImporterAdapter.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import numpy as np
+import pandas as pd
+
+from network_importer.utils import INTF_PHYSICAL_REGEXES, INTF_LAG_REGEXES
+
+# Columns of the interfaceProperties answer used to build the interfaces
+BATFISH_INTERFACE_COLUMNS = [
+    "Interface",
+    "Access_VLAN",
+    "Active",
+    "All_Prefixes",
+    "Allowed_VLANs",
+    "Channel_Group",
+    "Description",
+    "Encapsulation_VLAN",
+    "MTU",
+    "Native_VLAN",
+    "Switchport_Mode",
+]
+
+# Columns returned by prepare_batfish_interfaces, in order
+INTERFACE_COLUMNS = [
+    "name",
+    "mtu",
+    "switchport_mode",
+    "description",
+    "active",
+    "is_lag",
+    "is_virtual",
+    "is_lag_member",
+    "channel_group",
+    "encapsulation_vlan",
+    "allowed_vlans",
+    "native_vlan",
+    "access_vlan",
+    "prefixes",
+]
+
+
+def is_interface_physical_vector(names):
+    """Vectorized version of is_interface_physical.
+
+    Args:
+        names (Series): name of the interfaces to evaluate
+
+    Returns:
+        Series: True, False or None for each interface
+    """
+    conditions = [names.str.match(regex).fillna(False).astype(bool) for regex, _ in INTF_PHYSICAL_REGEXES]
+    choices = [is_physical for _, is_physical in INTF_PHYSICAL_REGEXES]
+    return pd.Series(np.select(conditions, choices, default=None), index=names.index, dtype=object)
+
+
+def is_interface_lag_vector(names):
+    """Vectorized version of is_interface_lag, returns False instead of None when the interface is not a lag.
+
+    Args:
+        names (Series): name of the interfaces to evaluate
+
+    Returns:
+        Series: True or False for each interface
+    """
+    is_lag = pd.Series(False, index=names.index)
+    for regex, lower in INTF_LAG_REGEXES:
+        values = names.str.lower() if lower else names
+        is_lag |= values.str.match(regex).fillna(False).astype(bool)
+
+    return is_lag
+
+
+def _not_empty(series):
+    """Return a boolean Series indicating which values are neither None nor empty."""
+    return series.map(bool, na_action="ignore").fillna(False).astype(bool)
+
+
+def _to_object(series, mask=None):
+    """Convert a Series to dtype object, replacing all missing values (and the values not in mask) with None."""
+    series = series.astype(object)
+    keep = series.notna()
+    if mask is not None:
+        keep &= mask
+    return series.where(keep, None)
+
+
+def prepare_batfish_interfaces(frame, import_intf_status=False):
+    """Compute the attributes of all interfaces from an interfaceProperties answer, one column at a time.
+
+    The processing is equivalent to what NetworkImporterAdapter.load_batfish_interface does for a single
+    interface but all the derived columns are calculated once for the entire frame.
+    Columns missing from the answer are considered empty.
+
+    Args:
+        frame (DataFrame): answer of interfaceProperties
+        import_intf_status (bool): Import the status of the interfaces, if False active will be None
+
+    Returns:
+        DataFrame: one row per interface with the columns defined in INTERFACE_COLUMNS
+    """
+    frame = frame.reindex(columns=BATFISH_INTERFACE_COLUMNS)
+    names = frame["Interface"].map(lambda intf: intf.interface).astype(object)
+
+    is_lag = is_interface_lag_vector(names)
+    is_physical = is_interface_physical_vector(names)
+    is_virtual = ~is_lag & (is_physical == False)  # noqa: E712 pylint: disable=singleton-comparison
+
+    is_lag_member = ~is_lag & _not_empty(frame["Channel_Group"])
+    is_virtual &= ~is_lag_member
+
+    descriptions = _to_object(frame["Description"], mask=_not_empty(frame["Description"]))
+    descriptions = descriptions.map(lambda desc: desc.strip(), na_action="ignore")
+
+    switchport_modes = _to_object(frame["Switchport_Mode"]).replace({"FEX_FABRIC": "NONE"})
+
+    if import_intf_status:
+        active = _to_object(frame["Active"])
+    else:
+        active = _to_object(pd.Series(None, index=frame.index, dtype=object))
+
+    return pd.DataFrame(
+        {
+            "name": names,
+            "mtu": _to_object(frame["MTU"]),
+            "switchport_mode": switchport_modes,
+            "description": _to_object(descriptions),
+            "active": active,
+            "is_lag": _to_object(is_lag),
+            "is_virtual": _to_object(is_virtual),
+            "is_lag_member": _to_object(is_lag_member, mask=is_lag_member),
+            "channel_group": _to_object(frame["Channel_Group"], mask=is_lag_member),
+            "encapsulation_vlan": _to_object(frame["Encapsulation_VLAN"]),
+            "allowed_vlans": _to_object(frame["Allowed_VLANs"]),
+            "native_vlan": _to_object(frame["Native_VLAN"]),
+            "access_vlan": _to_object(frame["Access_VLAN"]),
+            "prefixes": frame["All_Prefixes"].map(lambda prefixes: prefixes if isinstance(prefixes, list) else []),
+        },
+        columns=INTERFACE_COLUMNS,
+    )
@@ -0,0 +1,87 @@
+"""Site-sharded Batfish snapshots for the NetworkImporterAdapter.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import ipaddress
+import threading
+from collections import defaultdict
+
+import pandas as pd
+
+# Maximum number of host bits of a subnet to be considered as point-to-point (/30 & /31, /126 & /127)
+P2P_MAX_HOST_BITS = 2
+
+
+class BatfishShard:
+    """Batfish snapshot including only the configurations of the devices of one site."""
+
+    def __init__(self, site_name, path, snapshot_name, hostnames):
+        """Initialize the shard, the snapshot is created later in Batfish when it's needed.
+
+        Args:
+            site_name (str): name of the site
+            path (str): path to the directory with the configurations of this shard
+            snapshot_name (str): name of the snapshot in Batfish
+            hostnames (list): name of the devices included in the shard
+        """
+        self.site_name = site_name
+        self.path = path
+        self.snapshot_name = snapshot_name
+        self.hostnames = hostnames
+        self.session = None
+        self.answers_cache = None
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        """Return a string representation of the shard."""
+        return f"BatfishShard({self.site_name}, {len(self.hostnames)} device(s))"
+
+
+def get_cross_shard_edges(bf_intfs):
+    """Find the layer3 edges between the interfaces of devices located in different shards.
+
+    Batfish can only find the edges between devices included in the same snapshot. The edges across shards are
+    resolved from the merged list of interfaces: 2 interfaces from different shards sharing a point-to-point subnet
+    are considered connected.
+
+    Args:
+        bf_intfs (list[tuple]): shard name and answer of interfaceProperties (with All_Prefixes), for each shard
+
+    Returns:
+        DataFrame: edges in both directions, in the same format as the answer of layer3Edges
+    """
+    subnets = defaultdict(list)
+    for shard_name, frame in bf_intfs:
+        if "All_Prefixes" not in frame:
+            continue
+
+        for intf, prefixes in zip(frame["Interface"], frame["All_Prefixes"]):
+            if not isinstance(prefixes, list):
+                continue
+
+            for prefix in prefixes:
+                network = ipaddress.ip_interface(prefix).network
+                if network.max_prefixlen - network.prefixlen > P2P_MAX_HOST_BITS:
+                    continue
+                subnets[network].append((shard_name, intf))
+
+    edges = []
+    for endpoints in subnets.values():
+        if len(endpoints) != 2 or endpoints[0][0] == endpoints[1][0]:
+            continue
+
+        (_, intf_a), (_, intf_z) = endpoints
+        edges.append({"Interface": intf_a, "Remote_Interface": intf_z})
+        edges.append({"Interface": intf_z, "Remote_Interface": intf_a})
+
+    return pd.DataFrame(edges, columns=["Interface", "Remote_Interface"], dtype=object)
@@ -0,0 +1,237 @@
+"""Functions to track the content of the Batfish snapshots created by the NetworkImporterAdapter.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import json
+import shutil
+import hashlib
+import logging
+
+import network_importer.config as config
+
+LOGGER = logging.getLogger("network-importer")
+
+SNAPSHOTS_STATE_FILENAME = "batfish_snapshots.json"
+NEIGHBORS_FILENAME = "batfish_neighbors.json"
+
+
+def get_directory_fingerprint(path):
+    """Calculate a fingerprint of a directory based on the name and the content of all its files.
+
+    Args:
+        path (str): path to the directory
+
+    Returns:
+        str: sha256 hexdigest, identical as long as no file has been added, removed, renamed or modified
+    """
+    fingerprint = hashlib.sha256()
+
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            with open(file_path, "rb") as file_:
+                file_hash = hashlib.sha256(file_.read()).hexdigest()
+            fingerprint.update(f"{os.path.relpath(file_path, path)}:{file_hash}\n".encode("utf-8"))
+
+    return fingerprint.hexdigest()
+
+
+def get_snapshot_key():
+    """Return the key identifying the current snapshot in the state file, based on the Batfish settings."""
+    settings = config.SETTINGS.batfish
+    return f"{settings.address}:{settings.port_v2}/{settings.network_name}/{settings.snapshot_name}"
+
+
+def _get_state_file_path():
+    return os.path.join(config.SETTINGS.main.cache_directory, SNAPSHOTS_STATE_FILENAME)
+
+
+def _read_state_file():
+    state_file = _get_state_file_path()
+    if not os.path.exists(state_file):
+        return {}
+
+    try:
+        with open(state_file) as file_:
+            return json.load(file_)
+    except ValueError:
+        LOGGER.warning("Unable to read the state of the Batfish snapshots from %s", state_file)
+        return {}
+
+
+def load_snapshot_state():
+    """Return the information saved when the current snapshot was created.
+
+    The state can include:
+      name: name of the snapshot in Batfish
+      fingerprint: fingerprint of the directory used to create the snapshot
+      configs: md5 of each configuration included in the snapshot, indexed by filename
+      deactivated_nodes: list of nodes deactivated in the snapshot
+
+    Returns:
+        dict: state of the snapshot, empty if not available
+    """
+    state = _read_state_file().get(get_snapshot_key())
+    if not isinstance(state, dict):
+        return {}
+
+    return state
+
+
+def save_snapshot_state(state):
+    """Save the information related to the current snapshot.
+
+    Args:
+        state (dict): state of the snapshot, None to forget the current state
+    """
+    state_file = _get_state_file_path()
+
+    if not state and not os.path.exists(state_file):
+        return
+
+    if not os.path.exists(config.SETTINGS.main.cache_directory):
+        os.makedirs(config.SETTINGS.main.cache_directory)
+        LOGGER.debug("Directory %s was missing, created it", config.SETTINGS.main.cache_directory)
+
+    snapshots = _read_state_file()
+    if state:
+        snapshots[get_snapshot_key()] = state
+    else:
+        snapshots.pop(get_snapshot_key(), None)
+
+    with open(state_file, "w") as file_:
+        json.dump(snapshots, file_, indent=2, sort_keys=True)
+
+
+def get_configs_md5(path, known_md5=None):
+    """Calculate the md5 of each configuration file present in the configs directory of a snapshot.
+
+    The md5 is calculated the same way as in the GetConfig processor,
+    the values already known are not calculated again.
+
+    Args:
+        path (str): path to the snapshot directory
+        known_md5 (dict, optional): md5 already calculated, indexed by filename
+
+    Returns:
+        dict: md5 of each configuration, indexed by filename
+    """
+    known_md5 = known_md5 or {}
+    configs_dir = os.path.join(path, "configs")
+    if not os.path.isdir(configs_dir):
+        return {}
+
+    configs = {}
+    for filename in sorted(os.listdir(configs_dir)):
+        if not os.path.isfile(os.path.join(configs_dir, filename)):
+            continue
+
+        if filename in known_md5:
+            configs[filename] = known_md5[filename]
+            continue
+
+        with open(os.path.join(configs_dir, filename), "rb") as file_:
+            # Bandit skip as the MD5 is used for hash value only, not for security.
+            configs[filename] = hashlib.md5(file_.read()).hexdigest()  # nosec
+
+    return configs
+
+
+def get_configs_delta(previous, current):
+    """Compare 2 sets of configurations and return what needs to change to go from one to the other.
+
+    Args:
+        previous (dict): md5 of each configuration included in the existing snapshot, indexed by filename
+        current (dict): md5 of each configuration currently present, indexed by filename
+
+    Returns:
+        (list, list): filenames of the configurations added or modified, filenames of the configurations removed
+    """
+    changed = [filename for filename, md5 in current.items() if previous.get(filename) != md5]
+    removed = [filename for filename in previous if filename not in current]
+    return sorted(changed), sorted(removed)
+
+
+def get_node_name(filename):
+    """Return the name of the node in Batfish associated with a configuration file."""
+    return os.path.splitext(filename)[0].lower()
+
+
+def prepare_limited_snapshot(source, destination, hostnames):
+    """Prepare a snapshot directory with only the configurations of some devices.
+
+    All files outside of the configs directory (Batfish settings, hosts files ..) are copied as is.
+
+    Args:
+        source (str): path to the complete snapshot directory
+        destination (str): path to the directory to prepare, its current content will be deleted
+        hostnames (set): name of the devices to include in the snapshot, case insensitive
+
+    Returns:
+        list: filenames of the configurations included in the snapshot
+    """
+    if os.path.exists(destination):
+        shutil.rmtree(destination)
+
+    hostnames = {hostname.lower() for hostname in hostnames}
+    shutil.copytree(source, destination, ignore=lambda path, _: ["configs"] if path == source else [])
+
+    configs_dir = os.path.join(source, "configs")
+    configs = []
+    if os.path.isdir(configs_dir):
+        configs = [filename for filename in sorted(os.listdir(configs_dir)) if get_node_name(filename) in hostnames]
+
+    os.makedirs(os.path.join(destination, "configs"))
+    for filename in configs:
+        shutil.copy(os.path.join(source, "configs", filename), os.path.join(destination, "configs", filename))
+
+    return configs
+
+
+def load_neighbors():
+    """Return the neighbors of each device, as found during the previous executions.
+
+    Returns:
+        dict: name of the neighbors of each device, indexed by device name
+    """
+    neighbors_file = os.path.join(config.SETTINGS.main.cache_directory, NEIGHBORS_FILENAME)
+    if not os.path.exists(neighbors_file):
+        return {}
+
+    try:
+        with open(neighbors_file) as file_:
+            return json.load(file_)
+    except ValueError:
+        LOGGER.warning("Unable to read the neighbors from %s", neighbors_file)
+        return {}
+
+
+def save_neighbors(devices, neighbors):
+    """Update the neighbors of some devices, the neighbors of the other devices are kept as is.
+
+    Args:
+        devices (list): name of the devices to update
+        neighbors (dict): name of the neighbors of each device, indexed by device name
+    """
+    all_neighbors = load_neighbors()
+    for device in devices:
+        all_neighbors[device] = sorted(set(neighbors.get(device, [])))
+
+    if not os.path.exists(config.SETTINGS.main.cache_directory):
+        os.makedirs(config.SETTINGS.main.cache_directory)
+        LOGGER.debug("Directory %s was missing, created it", config.SETTINGS.main.cache_directory)
+
+    with open(os.path.join(config.SETTINGS.main.cache_directory, NEIGHBORS_FILENAME), "w") as file_:
+        json.dump(all_neighbors, file_, indent=2, sort_keys=True)
@@ -0,0 +1,243 @@
+"""Local cache of the objects loaded from the SOT, to only fetch the objects updated since the previous execution.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import gzip
+import json
+import time
+import logging
+from urllib.parse import urlparse
+
+LOGGER = logging.getLogger("network-importer")
+
+# Models whose nested representation is included in the records of another model, indexed by the path of the model.
+# When an object is updated or deleted, the cached records referencing it are fetched again.
+DEPENDENCIES = {
+    "dcim/interfaces": ["dcim/devices", "dcim/interfaces", "ipam/vlans"],
+    "ipam/ip-addresses": ["dcim/devices", "dcim/interfaces"],
+    "dcim/cables": ["dcim/devices", "dcim/interfaces"],
+    "ipam/prefixes": ["dcim/sites", "ipam/vlans"],
+    "ipam/vlans": ["dcim/sites"],
+}
+
+# Maximum number of ids included in each query to fetch again the records referencing an object that changed
+IDS_PER_QUERY = 100
+
+
+def get_model_path(url):
+    """Return the path identifying the model of an endpoint or of an object, from its url.
+
+    Args:
+        url (str): url of an endpoint (.../api/dcim/interfaces) or of an object (.../api/dcim/interfaces/3/)
+
+    Returns:
+        str: path of the model, like dcim/interfaces
+    """
+    parts = urlparse(url).path.rstrip("/").split("/")
+    idx = parts.index("api") if "api" in parts else len(parts) - 3
+    return "/".join(parts[idx + 1 : idx + 3])
+
+
+def get_references(data):
+    """Return the objects referenced in a record, identified by the path of their model and their id.
+
+    Args:
+        data (dict): record returned by the SOT, with its nested objects
+
+    Returns:
+        set: tuples of model path and id as a string
+    """
+    references = set()
+    if isinstance(data, list):
+        for item in data:
+            references |= get_references(item)
+    elif isinstance(data, dict):
+        if "url" in data and "id" in data and isinstance(data["url"], str):
+            references.add((get_model_path(data["url"]), str(data["id"])))
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                references |= get_references(value)
+
+    return references
+
+
+class SOTStateCache:
+    """Store the records returned by the SOT for each query, indexed by remote_id.
+
+    The cache keeps the most recent last_updated value returned by the SOT. During the next execution,
+    the ids of all objects and the ids of the objects updated since this timestamp are listed once per model.
+    Then for each query, only the records updated or deleted are fetched again, along with the records
+    referencing an object that has been updated or deleted (the name of a device or an interface).
+    If nothing changed for a model or for its dependencies, its queries are served from the cache directly.
+
+    The changes applied to the SOT while the cache is being refreshed can be missed until the cache expires.
+    """
+
+    def __init__(self, path, max_age):
+        """Initialize the cache, the content of the file is loaded with load().
+
+        Args:
+            path (str): path to the file where the cache is saved
+            max_age (int): maximum age of an entry in hours before all records are fetched again, 0 to disable
+        """
+        self.path = path
+        self.max_age = max_age
+        self.since = None
+        self.last_updated = None
+        self.queries = {}
+        self.changes = {}
+        self.nbr_updated = 0
+        self.nbr_deleted = 0
+
+    def load(self):
+        """Load the content of the cache from the disk, the cache is empty if the file is not readable."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with gzip.open(self.path, "rt") as file_:
+                data = json.load(file_)
+        except (OSError, EOFError, ValueError) as exc:
+            LOGGER.warning("Unable to read the SOT state cache from %s (%s)", self.path, exc)
+            return
+
+        if not isinstance(data, dict) or not data.get("since") or "queries" not in data:
+            LOGGER.debug("The SOT state cache %s is not valid, all objects will be fetched again", self.path)
+            return
+
+        self.since = data["since"]
+        self.last_updated = self.since
+        self.queries = data["queries"]
+
+    def save(self):
+        """Save the content of the cache on disk, the expired entries are removed."""
+        self.queries = {key: entry for key, entry in self.queries.items() if not self._is_expired(entry)}
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+            LOGGER.debug("Directory %s was missing, created it", directory)
+
+        with gzip.open(f"{self.path}.tmp", "wt") as file_:
+            json.dump(dict(since=self.last_updated, queries=self.queries), file_)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    @staticmethod
+    def get_key(endpoint, filters):
+        """Return the key identifying a query in the cache, the page size is not included."""
+        filters = {key: value for key, value in filters.items() if key not in ["limit", "offset"]}
+        return json.dumps(dict(url=endpoint.url, filters=filters), sort_keys=True, default=str)
+
+    def _is_expired(self, entry):
+        return bool(self.max_age) and time.time() - entry["created"] > self.max_age * 3600
+
+    def _add_records(self, entry, records):
+        """Add or replace some records in an entry and keep track of the most recent last_updated value."""
+        for record in records:
+            data = dict(record)
+            entry["records"][str(record.id)] = data
+            if data.get("last_updated") and (not self.last_updated or data["last_updated"] > self.last_updated):
+                self.last_updated = data["last_updated"]
+
+    def get_changes(self, endpoint, fetch):
+        """Return the ids of all objects of a model and the ids of the objects updated since the previous execution.
+
+        The SOT is only queried once per model and per execution.
+
+        Args:
+            endpoint (Endpoint): pynetbox or pynautobot endpoint
+            fetch (callable): function used to query the SOT, called with the endpoint and the filters
+
+        Returns:
+            tuple: set of the ids of all objects, set of the ids of the objects updated
+        """
+        model = get_model_path(endpoint.url)
+        if model not in self.changes:
+            current_ids = {str(record.id) for record in fetch(endpoint, brief=1)}
+            updated_ids = {str(record.id) for record in fetch(endpoint, brief=1, last_updated__gte=self.since)}
+            self.changes[model] = (current_ids, updated_ids)
+
+        return self.changes[model]
+
+    def _get_endpoint(self, endpoint, model):
+        """Return the endpoint of a model, from the same API as another endpoint."""
+        app_name, endpoint_name = model.split("/")
+        return getattr(getattr(endpoint.api, app_name), endpoint_name.replace("-", "_"))
+
+    def filter(self, endpoint, filters, fetch):
+        """Return all objects of an endpoint matching some filters, using the cache when possible.
+
+        Args:
+            endpoint (Endpoint): pynetbox or pynautobot endpoint
+            filters (dict): filters to apply to the query
+            fetch (callable): function used to query the SOT, called with the endpoint and the filters
+
+        Returns:
+            list: pynetbox or pynautobot records
+        """
+        key = self.get_key(endpoint, filters)
+        entry = self.queries.get(key)
+
+        if not entry or not self.since or self._is_expired(entry):
+            entry = dict(created=time.time(), records={})
+            self._add_records(entry, fetch(endpoint, **filters))
+        else:
+            self._refresh(endpoint, filters, fetch, entry)
+
+        self.queries[key] = entry
+
+        return [endpoint.return_obj(record, endpoint.api, endpoint) for record in entry["records"].values()]
+
+    def _refresh(self, endpoint, filters, fetch, entry):
+        """Update the records of an entry that changed since the previous execution."""
+        current_ids, updated_ids = self.get_changes(endpoint, fetch)
+
+        for remote_id in list(entry["records"].keys()):
+            if remote_id not in current_ids:
+                del entry["records"][remote_id]
+                self.nbr_deleted += 1
+
+        # Records referencing an object updated or deleted since the previous execution
+        dependencies = {
+            model: self.get_changes(self._get_endpoint(endpoint, model), fetch)
+            for model in DEPENDENCIES.get(get_model_path(endpoint.url), [])
+        }
+
+        stale_ids = []
+        for remote_id, record in entry["records"].items():
+            if remote_id in updated_ids:
+                continue
+            for model, ref_id in get_references(record):
+                if model not in dependencies:
+                    continue
+                dep_current_ids, dep_updated_ids = dependencies[model]
+                if ref_id in dep_updated_ids or ref_id not in dep_current_ids:
+                    stale_ids.append(remote_id)
+                    break
+
+        # The records updated can also be new or not matching the filters anymore
+        if updated_ids:
+            updated = list(fetch(endpoint, last_updated__gte=self.since, **filters))
+            for remote_id in updated_ids & set(entry["records"].keys()):
+                del entry["records"][remote_id]
+            self._add_records(entry, updated)
+            self.nbr_updated += len(updated)
+
+        for idx in range(0, len(stale_ids), IDS_PER_QUERY):
+            batch = stale_ids[idx : idx + IDS_PER_QUERY]
+            for remote_id in batch:
+                del entry["records"][remote_id]
+            refreshed = list(fetch(endpoint, id=batch, **filters))
+            self._add_records(entry, refreshed)
+            self.nbr_updated += len(refreshed)
@@ -28,9 +28,10 @@ from rich.table import Table
 import network_importer.config as config
 from network_importer.main import NetworkImporter
 from network_importer.inventory import reachable_devs
-from network_importer.tasks import check_if_reachable
+from network_importer.reachability import check_hosts_reachable
 
 import network_importer.performance as perf
+from network_importer.http_session import get_http_stats
 
 urllib3.disable_warnings()
 
@@ -46,7 +47,7 @@ def main():
     """Main CLI command for the network_importer."""
 
 
-def init(config_file):
+def init(config_file, refresh_inventory=False):
     """Init Network-Importer."""
     config.load_and_exit(config_file_name=config_file)
     perf.init()
@@ -73,7 +74,7 @@ def init(config_file):
     # Disable logging in console for DiffSync
     enable_console_logging(verbosity=0)
 
-    ni = NetworkImporter()
+    ni = NetworkImporter(refresh_inventory=refresh_inventory)
     return ni
 
 
@@ -95,10 +96,13 @@ def init(config_file):
 @click.option(
     "--debug", is_flag=True, help="Keep the script in interactive mode once finished for troubleshooting", hidden=True
 )
+@click.option(
+    "--refresh-inventory", is_flag=True, help="Build the inventory again, even if a cached version is available"
+)
 @main.command()
-def apply(config_file, limit, debug, update_configs):
+def apply(config_file, limit, debug, update_configs, refresh_inventory):
     """Save changes in Backend."""
-    ni = init(config_file)
+    ni = init(config_file, refresh_inventory=refresh_inventory)
 
     if update_configs:
         ni.build_inventory(limit=limit)
@@ -109,6 +113,7 @@ def apply(config_file, limit, debug, update_configs):
 
     perf.TIME_TRACKER.set_nbr_devices(len(ni.nornir.inventory.hosts.keys()))
     if config.SETTINGS.logs.performance_log:
+        perf.add_info("http_pool", "{requests} requests, {hits} hits, {misses} misses".format(**get_http_stats()))
         perf.TIME_TRACKER.print_all()
 
     LOGGER.info("Execution finished, processed %s device(s)", perf.TIME_TRACKER.nbr_devices)
@@ -136,10 +141,13 @@ def apply(config_file, limit, debug, update_configs):
 @click.option(
     "--debug", is_flag=True, help="Keep the script in interactive mode once finished for troubleshooting", hidden=True
 )
+@click.option(
+    "--refresh-inventory", is_flag=True, help="Build the inventory again, even if a cached version is available"
+)
 @main.command()
-def check(config_file, limit, debug, update_configs):
+def check(config_file, limit, debug, update_configs, refresh_inventory):
     """Display what are the differences but do not save them."""
-    ni = init(config_file)
+    ni = init(config_file, refresh_inventory=refresh_inventory)
 
     if update_configs:
         ni.build_inventory(limit=limit)
@@ -151,6 +159,7 @@ def check(config_file, limit, debug, update_configs):
 
     perf.TIME_TRACKER.set_nbr_devices(len(ni.nornir.inventory.hosts.keys()))
     if config.SETTINGS.logs.performance_log:
+        perf.add_info("http_pool", "{requests} requests, {hits} hits, {misses} misses".format(**get_http_stats()))
         perf.TIME_TRACKER.print_all()
 
     LOGGER.info("Execution finished, processed %s device(s)", perf.TIME_TRACKER.nbr_devices)
@@ -177,14 +186,21 @@ def check(config_file, limit, debug, update_configs):
 @click.option(
     "--debug", is_flag=True, help="Keep the script in interactive mode once finished for troubleshooting", hidden=True
 )
+@click.option(
+    "--refresh-inventory", is_flag=True, help="Build the inventory again, even if a cached version is available"
+)
 @main.command()
-def inventory(config_file, limit, debug, check_connectivity, update_configs):
+def inventory(config_file, limit, debug, check_connectivity, update_configs, refresh_inventory):
     """Display inventory."""
-    ni = init(config_file)
+    ni = init(config_file, refresh_inventory=refresh_inventory)
     ni.build_inventory(limit=limit)
 
     if check_connectivity:
-        ni.nornir.filter(filter_func=reachable_devs).run(task=check_if_reachable, on_failed=True)
+        check_hosts_reachable(
+            ni.nornir.filter(filter_func=reachable_devs).inventory.hosts,
+            timeout=config.SETTINGS.main.reachability_timeout,
+            concurrency=config.SETTINGS.main.nbr_reachability_checks,
+        )
 
     if update_configs:
         ni.update_configurations()
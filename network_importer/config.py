@@ -48,6 +48,38 @@ class BatfishSettings(BaseSettings):
     use_ssl: bool = False
     api_key: Optional[str]
 
+    nodes_per_query: int = 0
+    """Number of devices to include in each interfaceProperties/switchedVlanProperties question,
+    0 will query all devices at once."""
+
+    max_concurrent_questions: int = 4
+    """Maximum number of questions sent to Batfish at the same time."""
+
+    limit_snapshot: bool = True
+    """When the inventory is limited, create a snapshot with only the configurations of the devices in the inventory."""
+
+    limit_snapshot_neighbors: bool = False
+    """Include the neighbors of the devices, found during the previous executions, in the limited snapshot."""
+
+    shard_by_site: bool = False
+    """Create one snapshot per site and query them concurrently instead of one snapshot for all devices."""
+
+    reuse_snapshot: bool = False
+    """Reuse the existing snapshot if the content of the configs directory has not changed since it was created."""
+
+    incremental_snapshot: bool = False
+    """Fork the existing snapshot with only the configurations that changed instead of creating a new one."""
+
+    incremental_snapshot_max_ratio: float = 0.2
+    """Maximum ratio of configurations added, modified or removed to use an incremental snapshot,
+    above this ratio a new snapshot will be created from scratch."""
+
+    answers_cache: bool = False
+    """Save the answers of Batfish in the cache_directory and reuse them until the configurations change."""
+
+    answers_cache_max_size: int = 100
+    """Maximum size of the Batfish answers cache in MB, the least recently used answers are removed first."""
+
     class Config:
         """Additional parameters to automatically map environment variable to some settings."""
 
@@ -111,8 +143,20 @@ class MainSettings(BaseSettings):
 
     nbr_workers: int = 25
 
+    nbr_reachability_checks: int = 100
+    """Maximum number of devices checked at the same time during the reachability check."""
+
+    reachability_timeout: float = 2
+    """Number of seconds to wait for a device to accept a connection during the reachability check."""
+
+    nbr_sync_workers: int = 1
+    """Number of devices synchronized at the same time with the SOT, 1 to synchronize them one after the other."""
+
     configs_directory: str = "configs"
 
+    cache_directory: str = ".network_importer"
+    """Directory used to store the state of the network importer between executions."""
+
     backend: Optional[Literal["nautobot", "netbox"]]
     """Only Netbox and Nautobot backend are included by default, if you want to use another backend
     you must leave backend empty and define inventory.inventory_class and adapters.sot_class manually."""
@@ -122,6 +166,28 @@ class MainSettings(BaseSettings):
     hostvars_directory: str = "host_vars"
 
 
+class HttpSettings(BaseSettings):
+    """Settings definition for the HTTP section of the configuration, used for the connections to the SOT."""
+
+    pool_connections: int = 10
+    """Number of hosts for which a connection pool is kept."""
+
+    pool_maxsize: int = 100
+    """Maximum number of connections kept open per host, should be higher than main.nbr_workers."""
+
+    pool_block: bool = False
+    """Wait for a connection to be available instead of opening a new one when the pool is full."""
+
+    max_retries: int = 3
+    """Number of retries for the idempotent requests that fail because of a connection error or a retry status code."""
+
+    retry_backoff_factor: float = 0.5
+    """Factor applied to the delay between retries, the delay doubles after each retry."""
+
+    retry_status_codes: List[int] = [429, 502, 503, 504]
+    """HTTP status codes returned by the server that should be retried."""
+
+
 class AdaptersSettings(BaseSettings):
     """Settings definition for the Adapters section of the configuration."""
 
@@ -150,6 +216,9 @@ class InventorySettings(BaseSettings):
 
     supported_platforms: List[str] = list()
 
+    cache_ttl: int = 0
+    """Number of minutes the inventory built from the SOT is kept in main.cache_directory, 0 to disable the cache."""
+
 
 class Settings(BaseSettings):
     """Main Settings Class for the project.
@@ -162,6 +231,7 @@ class Settings(BaseSettings):
     batfish: BatfishSettings = BatfishSettings()
     logs: LogsSettings = LogsSettings()
     network: NetworkSettings = NetworkSettings()
+    http: HttpSettings = HttpSettings()
     adapters: AdaptersSettings = AdaptersSettings()
     drivers: DriversSettings = DriversSettings()
     inventory: InventorySettings = InventorySettings()
@@ -0,0 +1,105 @@
+"""Shared HTTP session used to communicate with the SOT.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import network_importer.config as config
+
+LOGGER = logging.getLogger("network-importer")
+
+SESSIONS = {}
+SESSIONS_LOCK = threading.Lock()
+
+
+def get_http_session(verify_ssl=True):
+    """Return the HTTP session shared by the inventory, the tasks and the adapters.
+
+    One session is created for each value of verify_ssl, with a connection pool
+    large enough for all Nornir workers, for both http and https.
+
+    Args:
+        verify_ssl (bool, str): verify the certificate of the server, or path to a CA bundle
+
+    Returns:
+        requests.Session: shared session
+    """
+    with SESSIONS_LOCK:
+        if verify_ssl not in SESSIONS:
+            SESSIONS[verify_ssl] = create_http_session(verify_ssl)
+        return SESSIONS[verify_ssl]
+
+
+def create_http_session(verify_ssl=True):
+    """Create a new HTTP session based on the http section of the configuration.
+
+    Args:
+        verify_ssl (bool, str): verify the certificate of the server, or path to a CA bundle
+
+    Returns:
+        requests.Session: new session
+    """
+    settings = config.SETTINGS.http if config.SETTINGS else config.HttpSettings()
+
+    session = requests.Session()
+    session.verify = verify_ssl
+    session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+
+    retries = Retry(
+        total=settings.max_retries,
+        backoff_factor=settings.retry_backoff_factor,
+        status_forcelist=settings.retry_status_codes,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.pool_connections,
+        pool_maxsize=settings.pool_maxsize,
+        pool_block=settings.pool_block,
+        max_retries=retries,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+
+def get_http_stats():
+    """Return the number of requests sent with the shared sessions and how many reused an existing connection.
+
+    Returns:
+        dict: number of requests, of new connections (pool misses) and of reused connections (pool hits)
+    """
+    nbr_requests = 0
+    nbr_connections = 0
+
+    with SESSIONS_LOCK:
+        adapters = {id(adapter): adapter for session in SESSIONS.values() for adapter in session.adapters.values()}
+
+    for adapter in adapters.values():
+        if not isinstance(adapter, HTTPAdapter):
+            continue
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            nbr_requests += pool.num_requests
+            nbr_connections += pool.num_connections
+
+    return {"requests": nbr_requests, "misses": nbr_connections, "hits": max(nbr_requests - nbr_connections, 0)}
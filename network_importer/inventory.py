@@ -29,6 +29,9 @@ class NetworkImporterHost(Host):
     has_config: Optional[bool] = False
     """ Indicate if the configuration is present and has been properly imported in Batfish."""
 
+    config_md5: Optional[str] = None
+    """MD5 of the configuration saved by the GetConfig processor."""
+
     not_reachable_reason: Optional[str]
 
 
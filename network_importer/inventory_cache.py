@@ -0,0 +1,167 @@
+"""Local cache of the Nornir inventory built from the SOT.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+
+from nornir.core.inventory import ConnectionOptions, Defaults, Groups, Hosts, Inventory, ParentGroups
+from nornir.core.plugins.inventory import InventoryPluginRegister
+
+from network_importer.inventory import NetworkImporterHost
+
+LOGGER = logging.getLogger("network-importer")
+
+# Attributes specific to NetworkImporterHost saved in the cache, in addition to the standard Nornir attributes
+HOST_ATTRIBUTES = ["site_name", "is_reachable", "not_reachable_reason", "status", "has_config"]
+
+
+class CachedInventory:
+    """Nornir inventory plugin keeping the hosts built by another inventory plugin in a local cache.
+
+    The cache is identified by the inventory plugin, its settings (address, filter ...), the limit and the
+    supported platforms. The credentials are not saved in the cache, they are part of the global group
+    created by the inventory plugin each time.
+    """
+
+    def __init__(self, inventory_class, options, cache_directory, ttl, refresh=False):
+        """Initialize the inventory plugin that is wrapped, the inventory is only loaded by load().
+
+        Args:
+            inventory_class (str): name of the Nornir inventory plugin used to build the inventory
+            options (dict): options of the inventory plugin
+            cache_directory (str): directory where the cache is saved
+            ttl (int): number of minutes the cache is valid
+            refresh (bool): ignore the content of the cache and build the inventory again
+        """
+        self.inventory = InventoryPluginRegister.get_plugin(inventory_class)(**options)
+        self.ttl = ttl
+        self.refresh = refresh
+
+        key = json.dumps(
+            dict(
+                inventory_class=inventory_class,
+                settings=options.get("settings"),
+                limit=options.get("limit"),
+                supported_platforms=options.get("supported_platforms"),
+            ),
+            sort_keys=True,
+            default=str,
+        )
+        filename = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(cache_directory, f"inventory_{filename}.json.gz")
+
+    def load(self):
+        """Return the inventory from the cache if it's still valid, otherwise build it and save it in the cache."""
+        if not self.refresh:
+            inventory = self.load_cache()
+            if inventory:
+                LOGGER.debug("Loaded %s devices from the inventory cache %s", len(inventory.hosts), self.path)
+                return inventory
+
+        inventory = self.inventory.load()
+        self.save_cache(inventory)
+
+        return inventory
+
+    def load_cache(self):
+        """Load the inventory from the cache.
+
+        Returns:
+            Inventory: Nornir inventory, None if the cache is missing, not readable or expired
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        try:
+            with gzip.open(self.path, "rt") as file_:
+                data = json.load(file_)
+        except (OSError, EOFError, ValueError) as exc:
+            LOGGER.warning("Unable to read the inventory cache from %s (%s)", self.path, exc)
+            return None
+
+        if time.time() - data.get("created", 0) > self.ttl * 60:
+            LOGGER.debug("The inventory cache %s has expired", self.path)
+            return None
+
+        global_group = getattr(self.inventory, "global_group", None)
+
+        hosts = Hosts()
+        for name, params in data["hosts"].items():
+            host = NetworkImporterHost(
+                name=name,
+                hostname=params["hostname"],
+                port=params["port"],
+                platform=params["platform"],
+                data=params["data"],
+                connection_options={
+                    conn_name: ConnectionOptions(**conn_params)
+                    for conn_name, conn_params in params["connection_options"].items()
+                },
+            )
+            for attr in HOST_ATTRIBUTES:
+                if attr in params:
+                    setattr(host, attr, params[attr])
+
+            if global_group and global_group.name in params["groups"]:
+                host.groups = ParentGroups([global_group])
+
+            hosts[name] = host
+
+        groups = Groups({name: {} for name in data["groups"]})
+
+        return Inventory(hosts=hosts, groups=groups, defaults=Defaults())
+
+    def save_cache(self, inventory):
+        """Save the hosts and the names of the groups of an inventory in the cache, without the credentials.
+
+        Args:
+            inventory (Inventory): Nornir inventory
+        """
+        hosts = {}
+        for name, host in inventory.hosts.items():
+            # Inventory plugins can define the connection options of a host as an empty ConnectionOptions
+            connection_options = host.connection_options if isinstance(host.connection_options, dict) else {}
+            params = dict(
+                hostname=host.hostname,
+                port=host.port,
+                platform=host.platform,
+                data=host.data,
+                groups=[group.name for group in host.groups],
+                connection_options={
+                    conn_name: {key: value for key, value in options.dict().items() if key != "password"}
+                    for conn_name, options in connection_options.items()
+                },
+            )
+            for attr in HOST_ATTRIBUTES:
+                if hasattr(host, attr):
+                    params[attr] = getattr(host, attr)
+            hosts[name] = params
+
+        directory = os.path.dirname(self.path)
+        try:
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+                LOGGER.debug("Directory %s was missing, created it", directory)
+
+            with gzip.open(f"{self.path}.tmp", "wt") as file_:
+                json.dump(
+                    dict(created=time.time(), hosts=hosts, groups=list(inventory.groups.keys())), file_, default=str
+                )
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as exc:
+            LOGGER.warning("Unable to save the inventory cache in %s (%s)", self.path, exc)
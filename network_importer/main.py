@@ -9,13 +9,15 @@ from pydantic import ValidationError
 
 import network_importer.config as config
 from network_importer.exceptions import AdapterLoadFatalError
-from network_importer.utils import patch_http_connection_pool
 from network_importer.processors.get_config import GetConfig
 from network_importer.drivers import dispatcher
 from network_importer.diff import NetworkImporterDiff
-from network_importer.tasks import check_if_reachable, warning_not_reachable
+from network_importer.sync import ParallelSyncer
+from network_importer.tasks import warning_not_reachable
 from network_importer.performance import timeit
 from network_importer.inventory import reachable_devs
+from network_importer.inventory_cache import CachedInventory
+from network_importer.reachability import check_hosts_reachable
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
@@ -33,16 +35,21 @@ LOGGER = logging.getLogger("network-importer")
 class NetworkImporter:
     """Main NetworkImporter object to track all state related to the network importer."""
 
-    def __init__(self, check_mode=False, nornir=None):
+    def __init__(self, check_mode=False, nornir=None, refresh_inventory=False):
         """Initialize the NetworkImporter class."""
         self.nornir = nornir
         self.check_mode = check_mode
+        self.refresh_inventory = refresh_inventory
         self.network = None
         self.sot = None
 
     @timeit
     def build_inventory(self, limit=None):
-        """Build the inventory for the Network Importer in Nornir format."""
+        """Build the inventory for the Network Importer in Nornir format.
+
+        When inventory.cache_ttl is defined, the inventory is loaded from the local cache if it's still valid,
+        unless refresh_inventory is set.
+        """
         # pylint: disable=import-outside-toplevel
         # Load build-in Inventories as needed
         if config.SETTINGS.inventory.inventory_class == "NetBoxAPIInventory":
@@ -54,22 +61,37 @@ class NetworkImporter:
 
             InventoryPluginRegister.register("NautobotAPIInventory", NautobotAPIInventory)
 
+        inventory = {
+            "plugin": config.SETTINGS.inventory.inventory_class,
+            "options": {
+                "username": config.SETTINGS.network.login,
+                "password": config.SETTINGS.network.password,
+                "enable": config.SETTINGS.network.enable,
+                "supported_platforms": config.SETTINGS.inventory.supported_platforms,
+                "netmiko_extras": config.SETTINGS.network.netmiko_extras,
+                "napalm_extras": config.SETTINGS.network.napalm_extras,
+                "limit": limit,
+                "settings": config.SETTINGS.inventory.settings,
+            },
+        }
+
+        if config.SETTINGS.inventory.cache_ttl:
+            InventoryPluginRegister.register("CachedInventory", CachedInventory)
+            inventory = {
+                "plugin": "CachedInventory",
+                "options": {
+                    "inventory_class": inventory["plugin"],
+                    "options": inventory["options"],
+                    "cache_directory": config.SETTINGS.main.cache_directory,
+                    "ttl": config.SETTINGS.inventory.cache_ttl,
+                    "refresh": self.refresh_inventory,
+                },
+            }
+
         self.nornir = InitNornir(
             runner={"plugin": "threaded", "options": {"num_workers": config.SETTINGS.main.nbr_workers}},
             logging={"enabled": False},
-            inventory={
-                "plugin": config.SETTINGS.inventory.inventory_class,
-                "options": {
-                    "username": config.SETTINGS.network.login,
-                    "password": config.SETTINGS.network.password,
-                    "enable": config.SETTINGS.network.enable,
-                    "supported_platforms": config.SETTINGS.inventory.supported_platforms,
-                    "netmiko_extras": config.SETTINGS.network.netmiko_extras,
-                    "napalm_extras": config.SETTINGS.network.napalm_extras,
-                    "limit": limit,
-                    "settings": config.SETTINGS.inventory.settings,
-                },
-            },
+            inventory=inventory,
         )
 
         return True
@@ -81,8 +103,6 @@ class NetworkImporter:
         Args:
           limit (str): (Default value = None)
         """
-        patch_http_connection_pool(maxsize=100)
-
         if not self.nornir:
             self.build_inventory(limit=limit)
 
@@ -106,7 +126,7 @@ class NetworkImporter:
         sot_adapter = getattr(importlib.import_module(".".join(sot_path[0:-1])), sot_path[-1])
 
         try:
-            self.sot = sot_adapter(nornir=self.nornir, settings=sot_settings)
+            self.sot = sot_adapter(nornir=self.nornir, settings=sot_settings, limit=limit)
             self.sot.load()
         except ValidationError as exc:
             print(f"Configuration not valid, found {len(exc.errors())} error(s)")
@@ -124,7 +144,7 @@ class NetworkImporter:
             importlib.import_module(".".join(network_adapter_path[0:-1])), network_adapter_path[-1]
         )
         try:
-            self.network = network_adapter(nornir=self.nornir, settings=network_adapter_settings)
+            self.network = network_adapter(nornir=self.nornir, settings=network_adapter_settings, limit=limit)
             self.network.load()
         except ValidationError as exc:
             print(f"Configuration not valid, found {len(exc.errors())} error(s)")
@@ -138,8 +158,23 @@ class NetworkImporter:
         return True
 
     def sync(self):
-        """Synchronize the SOT adapter and the network adapter."""
-        self.sot.sync_from(self.network, diff_class=NetworkImporterDiff)
+        """Synchronize the SOT adapter and the network adapter.
+
+        When main.nbr_sync_workers is greater than 1, the changes of multiple devices are applied at the same time.
+        """
+        diff = self.diff()
+        self.sot.prepare_sync(diff)
+
+        if config.SETTINGS.main.nbr_sync_workers <= 1:
+            self.sot.sync_from(self.network, diff_class=NetworkImporterDiff, diff=diff)
+            return
+
+        ParallelSyncer(
+            diff=diff,
+            src_diffsync=self.network,
+            dst_diffsync=self.sot,
+            max_workers=config.SETTINGS.main.nbr_sync_workers,
+        ).sync()
 
     def diff(self):
         """Generate a diff of the SOT adapter and the network adapter."""
@@ -156,7 +191,11 @@ class NetworkImporter:
         # ----------------------------------------------------
         # Do a pre-check to ensure that all devices are reachable
         # ----------------------------------------------------
-        self.nornir.filter(filter_func=reachable_devs).run(task=check_if_reachable, on_failed=True)
+        check_hosts_reachable(
+            self.nornir.filter(filter_func=reachable_devs).inventory.hosts,
+            timeout=config.SETTINGS.main.reachability_timeout,
+            concurrency=config.SETTINGS.main.nbr_reachability_checks,
+        )
         self.nornir.filter(filter_func=reachable_devs).run(task=warning_not_reachable, on_failed=True)
 
         self.nornir.filter(filter_func=reachable_devs).with_processors([GetConfig()]).run(
@@ -78,6 +78,17 @@ def timeit(method):
     return timed
 
 
+def add_info(name, value):
+    """Record an information about the execution in the global time tracker, if it has been initialized.
+
+    Args:
+      name (str): name of the information
+      value (str): value to report in the performance log
+    """
+    if TIME_TRACKER:
+        TIME_TRACKER.infos[name.upper()] = value
+
+
 class TimeTracker:
     """TimeTracker object used to keep track of different information around the execution of network importer."""
 
@@ -85,6 +96,7 @@ class TimeTracker:
         """Initialize the TimeTracker object."""
         self.start_time = time()
         self.times = {}
+        self.infos = {}
         self.nbr_devices = None
 
     def set_nbr_devices(self, nbr: int):
@@ -116,3 +128,6 @@ class TimeTracker:
                     log = f"{funct} finished in {print_from_ms(exec_time)}"
 
                 file_.write(log + "\n")
+
+            for name, value in self.infos.items():
+                file_.write(f"{name}: {value}\n")
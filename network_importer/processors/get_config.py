@@ -140,6 +140,7 @@ class GetConfig(BaseProcessor):
 
         # Skipping the Bandit test as MD5 is used for hash test, not for secure encryption.
         self.current_md5[host.name] = hashlib.md5(conf.encode("utf-8")).hexdigest()  # nosec
+        host.config_md5 = self.current_md5[host.name]
         # changed = False
 
         if host.name in self.previous_md5 and self.previous_md5[host.name] == self.current_md5[host.name]:
@@ -0,0 +1,106 @@
+"""Reachability check of all the devices of the inventory at once with asyncio.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import asyncio
+import logging
+
+LOGGER = logging.getLogger("network-importer")
+
+DEFAULT_PORT = 22
+
+
+async def tcp_ping_async(host: str, port: int, timeout: float, semaphore: asyncio.Semaphore) -> bool:
+    """Try to establish a TCP connection to a port of a host.
+
+    Args:
+        host (str): hostname or ip address
+        port (int): tcp port to connect to
+        timeout (float): maximum number of seconds to wait for the connection
+        semaphore (asyncio.Semaphore): semaphore limiting the number of connections opened at the same time
+
+    Returns:
+        bool: True if the connection was established
+    """
+    async with semaphore:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    return True
+
+
+async def scan_hosts(hosts: dict, port: int, timeout: float, concurrency: int) -> dict:
+    """Check the reachability of all hosts concurrently.
+
+    Args:
+        hosts (dict): Nornir hosts to check, indexed by name
+        port (int): tcp port to connect to
+        timeout (float): maximum number of seconds to wait for each connection
+        concurrency (int): maximum number of connections opened at the same time
+
+    Returns:
+        dict: True/False for each host, indexed by name
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    names = list(hosts.keys())
+    results = await asyncio.gather(*[tcp_ping_async(hosts[name].hostname, port, timeout, semaphore) for name in names])
+    return dict(zip(names, results))
+
+
+def check_hosts_reachable(hosts: dict, port: int = DEFAULT_PORT, timeout: float = 2, concurrency: int = 100) -> dict:
+    """Check if the devices are reachable by doing a TCP ping on port 22, all at once.
+
+    Will change the status of `host.is_reachable`, `host.status` and `host.not_reachable_reason`
+    for each host that is not reachable, like the Nornir task check_if_reachable.
+    The hosts without hostname are not checked.
+
+    Args:
+        hosts (dict): Nornir hosts to check, indexed by name
+        port (int, optional): tcp port to connect to. Defaults to 22.
+        timeout (float, optional): maximum number of seconds to wait for each connection. Defaults to 2.
+        concurrency (int, optional): maximum number of connections opened at the same time. Defaults to 100.
+
+    Returns:
+        dict: True/False for each host checked, indexed by name
+    """
+    hosts_to_check = {}
+    for name, host in hosts.items():
+        if not host.hostname:
+            LOGGER.debug("%s | Unable to check if the device is reachable, hostname is not defined", name)
+            continue
+        hosts_to_check[name] = host
+
+    if not hosts_to_check:
+        return {}
+
+    results = asyncio.run(scan_hosts(hosts_to_check, port=port, timeout=timeout, concurrency=concurrency))
+
+    for name, is_reachable in results.items():
+        if is_reachable:
+            continue
+
+        LOGGER.debug("%s | device is not reachable on port %s", name, port)
+        host = hosts_to_check[name]
+        host.is_reachable = False
+        host.not_reachable_reason = f"device not reachable on port {port}"
+        host.status = "fail-ip"
+
+    return results
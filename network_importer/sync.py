@@ -0,0 +1,119 @@
+"""Synchronize multiple devices at the same time with the SOT.
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from diffsync.enum import DiffSyncFlags
+from diffsync.helpers import DiffSyncSyncer
+
+LOGGER = logging.getLogger("network-importer")
+
+
+class ParallelSyncer:
+    """Apply a diff to the destination adapter with the changes of the devices applied concurrently.
+
+    The diff is applied in 3 stages:
+      - the sites, with their vlans and prefixes, one after the other
+      - the devices, with their interfaces and IP addresses, on a pool of threads
+      - all other top level elements, like the cables, one after the other
+
+    Each device is synchronized with its own DiffSyncSyncer because the syncer keeps the state of the
+    element in progress, the order of the interfaces within a device is defined by the diff class.
+    """
+
+    parallel_type = "device"
+    first_types = ["site"]
+
+    def __init__(
+        self, diff, src_diffsync, dst_diffsync, flags=DiffSyncFlags.NONE, max_workers=1
+    ):  # pylint: disable=too-many-arguments
+        """Initialize the syncer.
+
+        Args:
+            diff (Diff): diff to apply
+            src_diffsync (DiffSync): source adapter
+            dst_diffsync (DiffSync): destination adapter, the SOT
+            flags (DiffSyncFlags): flags influencing the behavior of the sync
+            max_workers (int): number of devices synchronized at the same time
+        """
+        self.diff = diff
+        self.src_diffsync = src_diffsync
+        self.dst_diffsync = dst_diffsync
+        self.flags = flags
+        self.max_workers = max(max_workers, 1)
+        self.base_logger = None
+
+    def get_syncer(self):
+        """Return a new DiffSyncSyncer, with an empty diff since the elements are provided one by one."""
+        syncer = DiffSyncSyncer(
+            diff=self.diff.__class__(), src_diffsync=self.src_diffsync, dst_diffsync=self.dst_diffsync, flags=self.flags
+        )
+        if not self.base_logger:
+            self.base_logger = syncer.base_logger
+        return syncer
+
+    def sync_elements(self, elements):
+        """Synchronize some elements one after the other.
+
+        Returns:
+            bool: True if any changes were performed
+        """
+        syncer = self.get_syncer()
+        changed = False
+        for element in elements:
+            changed |= syncer.sync_diff_element(element)
+        return changed
+
+    def perform_sync(self):
+        """Apply the diff to the destination adapter.
+
+        Returns:
+            bool: True if any changes were performed
+        """
+        first_elements = []
+        parallel_elements = []
+        last_elements = []
+        for element in self.diff.get_children():
+            if element.type in self.first_types:
+                first_elements.append(element)
+            elif element.type == self.parallel_type:
+                parallel_elements.append(element)
+            else:
+                last_elements.append(element)
+
+        changed = self.sync_elements(first_elements)
+
+        LOGGER.debug(
+            "Synchronizing %s %ss with %s workers", len(parallel_elements), self.parallel_type, self.max_workers
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.sync_elements, [element]) for element in parallel_elements]
+            for future in futures:
+                changed |= future.result()
+
+        changed |= self.sync_elements(last_elements)
+
+        return changed
+
+    def sync(self):
+        """Apply the diff and notify the destination adapter once the sync is complete, like DiffSync.sync_from.
+
+        Returns:
+            Diff: diff applied
+        """
+        if self.perform_sync():
+            self.dst_diffsync.sync_complete(self.src_diffsync, self.diff, self.flags, self.base_logger)
+
+        return self.diff
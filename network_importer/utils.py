@@ -14,7 +14,9 @@ limitations under the License.
 """
 
 import re
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from urllib3 import connectionpool, poolmanager
 import yaml
 
@@ -57,7 +59,46 @@ def sort_by_digits(if_name: str) -> tuple:
     return tuple(map(int, find_digit.findall(if_name)))
 
 
-def is_interface_physical(name):  # pylint: disable=R0911
+# Match most physical interface Cisco that contains Ethernet
+#  GigabitEthernet0/0/2
+#  GigabitEthernet0/0/2:3
+#  TenGigabitEthernet0/0/4
+INTF_CISCO_PHYSICAL_REGEX = r"^[a-zA-Z]+[Ethernet][0-9\/\:]+$"
+
+# Match Sub interfaces finishing with ".<number>"
+INTF_SUB_INTF_REGEX = r".*\.[0-9]+$"
+
+# Regex for loopback and vlan interface
+INTF_LOOPBACK_REGEX = r"^(L|l)(oopback|o)[0-9]+$"
+INTF_VLAN_REGEX = r"^(V|v)(lan)[0-9]+$"
+
+# Generic physical interface match
+#  mainly looking for <int>/<int> or <int>/<int>/<int> at the end
+INTF_GENERIC_PHYSICAL_REGEX = r"^[a-zA-Z\-]+[0-9]+\/[0-9\/\:]+$"
+
+# Match Juniper Interfaces
+INTF_JNPR_PHYSICAL_REGEX = r"^[a-z]+\-[0-9\/\:]+$"
+
+# Ordered list of regex used to identify if an interface is physical, the first match wins
+INTF_PHYSICAL_REGEXES = [
+    (INTF_LOOPBACK_REGEX, False),
+    (INTF_VLAN_REGEX, False),
+    (INTF_CISCO_PHYSICAL_REGEX, True),
+    (INTF_SUB_INTF_REGEX, False),
+    (INTF_JNPR_PHYSICAL_REGEX, True),
+    (INTF_GENERIC_PHYSICAL_REGEX, True),
+]
+
+# Regex used to identify if an interface is a lag, the first value indicates if the name must be lowercased first
+INTF_LAG_REGEXES = [
+    (r"^port\-channel[0-9]+$", True),
+    (r"^ae[0-9]+$", False),
+    (r"^po[0-9]+$", False),
+    (r"^Bundle\-Ether[0-9]+$", False),
+]
+
+
+def is_interface_physical(name):
     """Function evaluate if an interface is likely to be a physical interface.
 
     Args:
@@ -66,38 +107,9 @@ def is_interface_physical(name):  # pylint: disable=R0911
     Return:
       True, False or None
     """
-    # Match most physical interface Cisco that contains Ethernet
-    #  GigabitEthernet0/0/2
-    #  GigabitEthernet0/0/2:3
-    #  TenGigabitEthernet0/0/4
-    cisco_physical_intf = r"^[a-zA-Z]+[Ethernet][0-9\/\:]+$"
-
-    # Match Sub interfaces finishing with ".<number>"
-    sub_intf = r".*\.[0-9]+$"
-
-    # Regex for loopback and vlan interface
-    loopback = r"^(L|l)(oopback|o)[0-9]+$"
-    vlan = r"^(V|v)(lan)[0-9]+$"
-
-    # Generic physical interface match
-    #  mainly looking for <int>/<int> or <int>/<int>/<int> at the end
-    generic_physical_intf = r"^[a-zA-Z\-]+[0-9]+\/[0-9\/\:]+$"
-
-    # Match Juniper Interfaces
-    jnpr_physical_intf = r"^[a-z]+\-[0-9\/\:]+$"
-
-    if re.match(loopback, name):
-        return False
-    if re.match(vlan, name):
-        return False
-    if re.match(cisco_physical_intf, name):
-        return True
-    if re.match(sub_intf, name):
-        return False
-    if re.match(jnpr_physical_intf, name):
-        return True
-    if re.match(generic_physical_intf, name):
-        return True
+    for regex, is_physical in INTF_PHYSICAL_REGEXES:
+        if re.match(regex, name):
+            return is_physical
 
     return None
 
@@ -111,23 +123,33 @@ def is_interface_lag(name):
     Return:
       True, False or None
     """
-    port_channel_intf = r"^port\-channel[0-9]+$"
-    po_intf = r"^po[0-9]+$"
-    ae_intf = r"^ae[0-9]+$"
-    bundle_intf = r"^Bundle\-Ether[0-9]+$"
-
-    if re.match(port_channel_intf, name.lower()):
-        return True
-    if re.match(ae_intf, name):
-        return True
-    if re.match(po_intf, name):
-        return True
-    if re.match(bundle_intf, name):
-        return True
+    for regex, lower in INTF_LAG_REGEXES:
+        if re.match(regex, name.lower() if lower else name):
+            return True
 
     return None
 
 
+def slugify(value):
+    """Convert a string into a name that can be safely used as a file or directory name.
+
+    All characters other than letters, digits, "_", "." and "-" are replaced with "-". If the name had to be
+    changed, a short hash of the original value is added to keep the names of different values distinct.
+
+    Args:
+        value (str): string to convert
+
+    Returns:
+        str: slug of the string
+    """
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "-", str(value)).strip("-.")
+    if slug == value:
+        return slug
+
+    digest = hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}" if slug else digest
+
+
 def is_mac_address(data):
     """Evaluate if a given string is a mac address.
 
@@ -225,3 +247,50 @@ def build_filter_params(filter_params, params):
             params[key] = [existing_value, value]
         else:
             params[key] = value
+
+
+def fetch_all_pages(
+    endpoint, request_class, filters, page_size, max_workers, **request_kwargs
+):  # pylint: disable=too-many-arguments
+    """Fetch all objects of a pynetbox/pynautobot endpoint matching some filters, with the pages fetched concurrently.
+
+    The first page is fetched to find the total number of objects,
+    then the remaining pages are fetched by offset with max_workers requests at the same time.
+
+    Args:
+      endpoint (Endpoint): pynetbox or pynautobot endpoint
+      request_class (Request): Request class of the same library as the endpoint
+      filters (dict): filters to apply to the query
+      page_size (int): number of objects requested per page, the server might return less objects per page
+      max_workers (int): maximum number of pages fetched at the same time
+      **request_kwargs: additional arguments for the request_class
+
+    Returns:
+      list: Records returned by the endpoint, in the same order as with the sequential pagination
+    """
+    req = request_class(
+        base=endpoint.url,
+        http_session=endpoint.api.http_session,
+        filters=filters,
+        token=endpoint.token,
+        **request_kwargs,
+    )
+
+    first_page = req._make_call(add_params={"limit": page_size, "offset": 0})  # pylint: disable=protected-access
+    results = list(first_page["results"])
+
+    # Use the size of the first page in case the server enforced a lower page size
+    page_size = len(results)
+    if first_page.get("next") and page_size:
+        offsets = range(page_size, first_page["count"], page_size)
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+            pages = pool.map(
+                lambda offset: req._make_call(  # pylint: disable=protected-access
+                    add_params={"limit": page_size, "offset": offset}
+                ),
+                offsets,
+            )
+            for page in pages:
+                results.extend(page["results"])
+
+    return [endpoint.return_obj(item, endpoint.api, endpoint) for item in results]
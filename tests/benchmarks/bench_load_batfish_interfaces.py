@@ -0,0 +1,116 @@
+"""Benchmark the ingestion of the Batfish interfaceProperties answer by the NetworkImporterAdapter.
+
+Compare the original path (iterrows + load_batfish_interface for each row)
+with the columnar path (load_batfish_interfaces) on a synthetic answer.
+
+Usage:
+    python tests/benchmarks/bench_load_batfish_interfaces.py [nbr_devices] [nbr_interfaces_per_device]
+
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import sys
+from time import perf_counter
+
+import pandas as pd
+from pybatfish.datamodel.primitives import Interface as BFInterface
+
+import network_importer.config as config
+from network_importer.adapters.network_importer.adapter import NetworkImporterAdapter
+from network_importer.models import Site, Device
+
+
+def build_answer(hostname, nbr_interfaces):
+    """Build a synthetic interfaceProperties answer for one device with a mix of interface types."""
+    rows = []
+    for idx in range(nbr_interfaces):
+        kind = idx % 5
+        row = {
+            "Interface": BFInterface(hostname=hostname, interface=f"GigabitEthernet0/{idx}"),
+            "Access_VLAN": None,
+            "Active": True,
+            "All_Prefixes": [],
+            "Allowed_VLANs": "",
+            "Channel_Group": None,
+            "Channel_Group_Members": [],
+            "Description": f" interface {idx} ",
+            "Encapsulation_VLAN": None,
+            "MTU": 1500,
+            "Native_VLAN": None,
+            "Switchport_Mode": "NONE",
+        }
+        if kind == 1:
+            row["Interface"] = BFInterface(hostname=hostname, interface=f"Loopback{idx}")
+            row["All_Prefixes"] = [f"10.{idx // 65536 % 256}.{idx // 256 % 256}.{idx % 256}/32"]
+        elif kind == 2:
+            row["Switchport_Mode"] = "ACCESS"
+            row["Access_VLAN"] = 10
+        elif kind == 3:
+            row["Interface"] = BFInterface(hostname=hostname, interface=f"GigabitEthernet0/{idx}.100")
+            row["Encapsulation_VLAN"] = 100
+        elif kind == 4:
+            row["Channel_Group"] = "Port-Channel1"
+        rows.append(row)
+
+    return pd.DataFrame(rows, dtype=object)
+
+
+def new_adapter(answers):
+    """Return an adapter with a site and all devices already loaded."""
+    adapter = NetworkImporterAdapter(nornir=None, settings={})
+    site = Site(name="sfo")
+    adapter.add(site)
+    for hostname in answers:
+        adapter.add(Device(name=hostname, site_name="sfo"))
+    return adapter, site
+
+
+def bench_row(answers):
+    """Load all interfaces one row at a time."""
+    adapter, site = new_adapter(answers)
+    start = perf_counter()
+    for hostname, bf_intfs in answers.items():
+        device = adapter.get(Device, identifier=hostname)
+        for _, intf in bf_intfs.iterrows():
+            adapter.load_batfish_interface(site=site, device=device, intf=dict(intf))
+    return perf_counter() - start, adapter
+
+
+def bench_columnar(answers):
+    """Load all interfaces with the columnar pipeline."""
+    adapter, site = new_adapter(answers)
+    start = perf_counter()
+    for hostname, bf_intfs in answers.items():
+        device = adapter.get(Device, identifier=hostname)
+        adapter.load_batfish_interfaces(site=site, device=device, bf_intfs=bf_intfs, interface_vlans_mapping={})
+    return perf_counter() - start, adapter
+
+
+def main(nbr_devices=100, nbr_interfaces=200):
+    """Run both benchmarks and print the results."""
+    config.load(config_data=dict(main=dict(backend="nautobot", import_intf_status=True)))
+    answers = {f"device{idx}": build_answer(f"device{idx}", nbr_interfaces) for idx in range(nbr_devices)}
+
+    row_time, row_adapter = bench_row(answers)
+    columnar_time, columnar_adapter = bench_columnar(answers)
+
+    if columnar_adapter.dict() != row_adapter.dict():
+        print("ERROR: both pipelines returned different results")
+        sys.exit(1)
+
+    print(f"{nbr_devices} devices, {nbr_interfaces} interfaces per device")
+    print(f"  iterrows + load_batfish_interface : {row_time:.3f}s")
+    print(f"  load_batfish_interfaces           : {columnar_time:.3f}s ({row_time / columnar_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -81,3 +81,34 @@ def test_create_ip_address_no_interface(requests_mock, nautobot_api_base):
 
     assert isinstance(ip_address, NautobotIPAddress) is True
     assert ip_address.remote_id == "2c6f4d82-e8e4-48ca-a62f-abf8586ff82a"
+
+
+def test_delete_ip_address(requests_mock, nautobot_api_base):
+    remote_id = "2c6f4d82-e8e4-48ca-a62f-abf8586ff82a"
+    ipaddr = NautobotIPAddress(
+        address="10.10.10.1/24",
+        device_name="HQ-CORE-SW02",
+        interface_name="TenGigabitEthernet1/0/1",
+        remote_id=remote_id,
+    )
+    nautobot_api_base.add(ipaddr)
+
+    requests_mock.delete(f"http://mock_nautobot/api/ipam/ip-addresses/{remote_id}/", status_code=204)
+    assert ipaddr.delete() == ipaddr
+    assert len(requests_mock.request_history) == 1
+
+
+def test_delete_ip_address_not_found(requests_mock, nautobot_api_base):
+    remote_id = "2c6f4d82-e8e4-48ca-a62f-abf8586ff82a"
+    ipaddr = NautobotIPAddress(
+        address="10.10.10.1/24",
+        device_name="HQ-CORE-SW02",
+        interface_name="TenGigabitEthernet1/0/1",
+        remote_id=remote_id,
+    )
+    nautobot_api_base.add(ipaddr)
+
+    requests_mock.delete(
+        f"http://mock_nautobot/api/ipam/ip-addresses/{remote_id}/", json={"detail": "Not found."}, status_code=404
+    )
+    assert ipaddr.delete() == ipaddr
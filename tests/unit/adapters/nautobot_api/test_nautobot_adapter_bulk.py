@@ -0,0 +1,134 @@
+"""test for the multi-sites loading of the NautobotAPIAdapter."""
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import network_importer.config as config
+from network_importer.adapters.nautobot_api.models import (
+    NautobotDevice,
+    NautobotInterface,
+    NautobotPrefix,
+    NautobotSite,
+    NautobotVlan,
+)
+from network_importer.exceptions import AdapterLoadFatalError
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+FIXTURES = "fixtures"
+
+
+def test_load_nautobot_prefixes_vlans(nautobot_api_empty, requests_mock):
+    config.load(config_data=dict(main=dict(backend="nautobot", import_prefixes=True, import_vlans=True)))
+    adapter = nautobot_api_empty
+    adapter.settings.sites_per_query = 2
+
+    for site_name in ["dc1", "nyc", "sfo"]:
+        adapter.add(NautobotSite(name=site_name))
+    adapter.add(NautobotDevice(name="devA", site_name="dc1"))
+
+    prefix = json.load(open(f"{ROOT}/{FIXTURES}/prefix_vlan.json"))
+    prefix["site"] = {"id": 111, "url": "http://localhost/api/dcim/sites/111/", "name": "nyc", "slug": "nyc"}
+    vlan = json.load(open(f"{ROOT}/{FIXTURES}/vlan_101_tags_01.json"))
+
+    requests_mock.get(
+        "http://mock/api/ipam/prefixes/?site=dc1&site=nyc&status=active",
+        json={"count": 1, "next": None, "results": [prefix]},
+    )
+    requests_mock.get(
+        "http://mock/api/ipam/prefixes/?site=sfo&status=active", json={"count": 0, "next": None, "results": []}
+    )
+    requests_mock.get(
+        "http://mock/api/ipam/vlans/?site=dc1&site=nyc", json={"count": 1, "next": None, "results": [vlan]}
+    )
+    requests_mock.get("http://mock/api/ipam/vlans/?site=sfo", json={"count": 0, "next": None, "results": []})
+
+    adapter.load_nautobot_prefixes(adapter.get_all("site"))
+    adapter.load_nautobot_vlans(adapter.get_all("site"))
+    assert len(requests_mock.request_history) == 4
+
+    nyc = adapter.get("site", identifier="nyc")
+    assert nyc.prefixes == ["nyc__10.0.0.0/24"]
+    assert adapter.get(NautobotPrefix, identifier="nyc__10.0.0.0/24").vlan == "nyc__1000"
+
+    dc1 = adapter.get("site", identifier="dc1")
+    assert dc1.vlans == ["dc1__101"]
+    assert adapter.get(NautobotVlan, identifier="dc1__101").associated_devices == ["devA"]
+
+
+def test_load_nautobot_graphql(nautobot_api_empty, requests_mock):
+    config.load(config_data=dict(main=dict(backend="nautobot", import_prefixes=True, import_vlans=True)))
+    adapter = nautobot_api_empty
+    adapter.settings.sites_per_query = 2
+    adapter.nornir = SimpleNamespace(
+        inventory=SimpleNamespace(
+            hosts={
+                "devA": SimpleNamespace(site_name="dc1"),
+                "devB": SimpleNamespace(site_name="nyc"),
+                "devC": SimpleNamespace(site_name="sfo"),
+            }
+        )
+    )
+
+    data = json.load(open(f"{ROOT}/{FIXTURES}/graphql_sites.json"))
+    requests_mock.post(
+        "http://mock/api/graphql/",
+        [{"json": data}, {"json": {"data": {"devices": [], "prefixes": [], "vlans": []}}}],
+    )
+
+    adapter.load_nautobot_graphql()
+    assert len(requests_mock.request_history) == 2
+    assert requests_mock.request_history[0].json()["variables"]["site"] == ["dc1", "nyc"]
+    assert requests_mock.request_history[0].json()["variables"]["device"] == ["devA", "devB"]
+
+    assert sorted(site.name for site in adapter.get_all("site")) == ["dc1", "nyc"]
+    assert adapter.get(NautobotDevice, identifier="devA").primary_ip == "10.10.10.1/32"
+
+    intf = adapter.get(NautobotInterface, identifier="devA__Ethernet1")
+    assert intf.switchport_mode == "ACCESS"
+    assert intf.access_vlan == "dc1__101"
+    assert intf.connected_endpoint_type == "dcim.interface"
+    assert intf.ips == ["devA__Ethernet1__10.0.0.1/31"]
+    assert adapter.get(NautobotInterface, identifier="devA__Port-Channel1").is_lag
+
+    assert adapter.get(NautobotPrefix, identifier="dc1__10.0.0.0/24").vlan == "dc1__101"
+    assert adapter.get(NautobotVlan, identifier="dc1__101").associated_devices == ["devA"]
+
+    cables = adapter.get_all("cable")
+    assert len(cables) == 1
+    assert cables[0].get_unique_id() == "devA__Ethernet1__devB__Ethernet1"
+
+
+def test_load_nautobot_graphql_site_without_device(nautobot_api_empty, requests_mock):
+    config.load(config_data=dict(main=dict(backend="nautobot", import_prefixes=True, import_vlans=True)))
+    adapter = nautobot_api_empty
+    adapter.nornir = SimpleNamespace(
+        inventory=SimpleNamespace(
+            hosts={"devA": SimpleNamespace(site_name="dc1"), "devC": SimpleNamespace(site_name="sfo")}
+        )
+    )
+
+    data = json.load(open(f"{ROOT}/{FIXTURES}/graphql_sites.json"))
+    sfo_prefix = dict(data["data"]["prefixes"][0], id="prefix-sfo", prefix="10.1.0.0/24", site={"slug": "sfo"})
+    sfo_vlan = dict(data["data"]["vlans"][0], id="vlan-sfo", site={"slug": "sfo"}, tags=[])
+    data["data"]["prefixes"].append(sfo_prefix)
+    data["data"]["vlans"].append(sfo_vlan)
+    requests_mock.post("http://mock/api/graphql/", json=data)
+
+    # devC is not returned by GraphQL, the prefixes and the vlans of its site are skipped
+    adapter.load_nautobot_graphql()
+    assert not adapter.get_or_none(NautobotPrefix, "sfo__10.1.0.0/24")
+    assert not adapter.get_or_none(NautobotVlan, "sfo__101")
+    assert adapter.get(NautobotVlan, identifier="dc1__101").associated_devices == ["devA"]
+
+
+def test_load_nautobot_graphql_errors(nautobot_api_empty, requests_mock):
+    config.load(config_data=dict(main=dict(backend="nautobot")))
+    adapter = nautobot_api_empty
+    adapter.nornir = SimpleNamespace(inventory=SimpleNamespace(hosts={"devA": SimpleNamespace(site_name="dc1")}))
+
+    requests_mock.post("http://mock/api/graphql/", json={"data": None, "errors": [{"message": "invalid"}]})
+
+    with pytest.raises(AdapterLoadFatalError):
+        adapter.load_nautobot_graphql()
@@ -24,6 +24,7 @@ def test_nautobot_inventory_all(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv = NautobotAPIInventory(
         settings=dict(address="http://mock", token="12349askdnfanasdf"),
@@ -55,6 +56,7 @@ def test_nb_inventory_filtered(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv_filtered = NautobotAPIInventory(
         limit="grb-rtr01",
@@ -84,6 +86,7 @@ def test_nb_inventory_exclude(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv = NautobotAPIInventory(
         settings=dict(
@@ -111,6 +114,7 @@ def test_nb_inventory_virtual_chassis(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv = NautobotAPIInventory(
         username="mock",
@@ -143,6 +147,7 @@ def test_nb_inventory_supported_platforms(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv = NautobotAPIInventory(
         supported_platforms=["ios", "nxos"],
@@ -168,3 +173,34 @@ def test_nb_inventory_supported_platforms(requests_mock):
     assert "grb-rtr01" in inv.hosts.keys()
     assert "msp-rtr01" not in inv.hosts.keys()
     assert "sw01" not in inv.hosts.keys()
+
+
+def test_nb_inventory_server_side_filters(requests_mock):
+    """
+    Test that the filter, the platforms and the virtual chassis are filtered by nautobot
+
+    Args:
+        requests_mock (:obj:`requests_mock.mocker.Mocker`): Automatically inserted
+        by pytest library, mocks requests get to external API so external API call is
+        not needed for unit test.
+    """
+    data1 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/devices.json"))
+    requests_mock.get("http://mock/api/dcim/devices/", json=data1)
+    requests_mock.get(
+        "http://mock/api/dcim/virtual-chassis/",
+        json={"count": 1, "next": None, "results": [{"id": "vc1", "master": {"id": "dev1"}}]},
+    )
+
+    data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
+    requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+
+    NautobotAPIInventory(
+        supported_platforms=["ios", "nxos"],
+        settings=dict(address="http://mock", token="12349askdnfanasdf", filter="site=msp"),  # nosec
+    ).load()  # nosec
+
+    filters = {"site": ["msp"], "platform": ["ios", "nxos"], "exclude": ["config_context"]}
+    devices_requests = [req.qs for req in requests_mock.request_history if req.path == "/api/dcim/devices/"]
+    assert devices_requests == [dict(filters, virtual_chassis_member=["false"]), dict(filters, id=["dev1"])]
+    platforms_requests = [req.qs for req in requests_mock.request_history if req.path == "/api/dcim/platforms/"]
+    assert platforms_requests == [{"slug": ["ios", "nxos"]}]
@@ -1,7 +1,10 @@
 """test for NetboxDevice model."""
 import os
 import yaml
+from diffsync.diff import DiffElement
 
+import network_importer.config as config
+from network_importer.diff import NetworkImporterDiff
 from network_importer.adapters.netbox_api.models import NetboxDevice
 
 ROOT = os.path.abspath(os.path.dirname(__file__))
@@ -32,3 +35,51 @@ def test_get_device_tag_id_create_tag(requests_mock, netbox_api_base, empty_netb
     netbox_api_base.add(device)
 
     assert device.get_device_tag_id() == 88
+
+
+def test_get_device_tag_id_prefetched(requests_mock, netbox_api_base):
+    config.load(config_data=dict(main=dict(backend="netbox", import_vlans=True)))
+    data = yaml.safe_load(open(f"{ROOT}/../fixtures/netbox_29/tag_01_list.json"))
+    requests_mock.get("http://mock/api/extras/tags/?q=device%3D", json=data, status_code=200)
+    requests_mock.post(
+        "http://mock/api/extras/tags/",
+        json=[{"id": 90, "name": "device=HQ-CORE-SW02"}, {"id": 91, "name": "device=dev2"}],
+        status_code=201,
+    )
+
+    for name in ["dev1", "dev2", "dev4"]:
+        netbox_api_base.add(NetboxDevice(name=name, site_name="HQ"))
+    # The tag of dev3 is known from the vlans loaded
+    netbox_api_base.add(NetboxDevice(name="dev3", site_name="HQ", device_tag_id=93))
+
+    netbox_api_base.load_netbox_device_tags()
+    assert netbox_api_base.get(NetboxDevice, identifier="dev1").device_tag_id == 8
+    assert len(requests_mock.request_history) == 1
+
+    # Only the devices without tag associated with the vlans created or updated need one, not dev4
+    diff = NetworkImporterDiff()
+    create = DiffElement(obj_type="vlan", name="HQ__10", keys=dict(site_name="HQ", vid=10))
+    create.add_attrs(source=dict(name="vlan10", associated_devices=["dev1", "dev2"]))
+    update = DiffElement(obj_type="vlan", name="HQ__111", keys=dict(site_name="HQ", vid=111))
+    update.add_attrs(
+        source=dict(name="vlan111", associated_devices=["HQ-CORE-SW02", "dev3"]),
+        dest=dict(name="vlan111", associated_devices=["dev3"]),
+    )
+    unchanged = DiffElement(obj_type="vlan", name="HQ__112", keys=dict(site_name="HQ", vid=112))
+    unchanged.add_attrs(
+        source=dict(name="new-name", associated_devices=["dev4"]),
+        dest=dict(name="vlan112", associated_devices=["dev4"]),
+    )
+    for element in [create, update, unchanged]:
+        diff.add(element)
+
+    netbox_api_base.prepare_sync(diff)
+    assert netbox_api_base.device_tags_pending == {"dev2", "HQ-CORE-SW02"}
+    assert len(requests_mock.request_history) == 1
+
+    dev2 = netbox_api_base.get(NetboxDevice, identifier="dev2")
+    assert dev2.get_device_tag_id() == 91
+    assert netbox_api_base.get(NetboxDevice, identifier="HQ-CORE-SW02").get_device_tag_id() == 90
+    assert len(requests_mock.request_history) == 2
+    assert [tag["name"] for tag in requests_mock.last_request.json()] == ["device=HQ-CORE-SW02", "device=dev2"]
+    assert not netbox_api_base.get(NetboxDevice, identifier="dev4").device_tag_id
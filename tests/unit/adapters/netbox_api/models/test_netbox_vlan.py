@@ -148,3 +148,21 @@ def test_update_clean_tags_with_incoming_tags(netbox_api_base):
 
     assert "tags" in clean_params
     assert sorted(clean_params["tags"]) == [1, 2, 3, 12, 13]
+
+
+def test_update_vlan_without_get(requests_mock, netbox_api_base):
+    netbox_api_base.add(NetboxDevice(name="dev1", site_name="HQ", remote_id=32, device_tag_id=12))
+
+    api = pynetbox.api(url="http://mock", token="1234567890")
+    data = yaml.safe_load(open(f"{ROOT}/{FIXTURE_29}/vlan_101_tags_01.json"))
+    pnb = pynetbox.core.response.Record(values=data, api=api, endpoint=1)
+
+    vlan = NetboxVlan.create_from_pynetbox(diffsync=netbox_api_base, obj=pnb, site_name="HQ")
+    netbox_api_base.add(vlan)
+
+    requests_mock.patch("http://mock/api/ipam/vlans/1/", json=data, status_code=200)
+    assert vlan.update(attrs={"name": "VOICE", "associated_devices": ["dev1"]})
+
+    assert len(requests_mock.request_history) == 1
+    assert requests_mock.last_request.method == "PATCH"
+    assert sorted(requests_mock.last_request.json()["tags"]) == [1, 2, 3, 12]
@@ -0,0 +1,212 @@
+"""test for the bulk and multi-sites loading of the NetBoxAPIAdapter."""
+import json
+import os
+from types import SimpleNamespace
+
+from diffsync.diff import DiffElement
+
+import network_importer.config as config
+from network_importer.diff import NetworkImporterDiff
+from network_importer.adapters.netbox_api.inventory import NetBoxAPIInventory
+from network_importer.adapters.netbox_api.models import (
+    NetboxDevice,
+    NetboxInterface,
+    NetboxIPAddress,
+    NetboxPrefix,
+    NetboxSite,
+    NetboxVlan,
+)
+
+ROOT = os.path.abspath(os.path.dirname(__file__))
+FIXTURE_28 = "fixtures/netbox_28"
+FIXTURE_29 = "fixtures/netbox_29"
+FIXTURE_INVENTORY = "fixtures/inventory"
+
+
+def nb_interface(intf_id, device_id, device_name, name):
+    """Return an interface in NetBox API format."""
+    return {
+        "id": intf_id,
+        "url": f"http://mock/api/dcim/interfaces/{intf_id}/",
+        "device": {"id": device_id, "url": f"http://mock/api/dcim/devices/{device_id}/", "name": device_name},
+        "name": name,
+        "type": {"value": "1000base-t", "label": "1000BASE-T (1GE)"},
+        "enabled": True,
+        "lag": None,
+        "mtu": None,
+        "mode": None,
+        "description": "",
+        "untagged_vlan": None,
+        "tagged_vlans": [],
+        "connected_endpoint_type": None,
+        "tags": [],
+    }
+
+
+def test_load_netbox_devices_bulk(netbox_api_base, requests_mock):
+    config.load(config_data=dict(main=dict(backend="netbox", import_ips=True, import_vlans=False)))
+    adapter = netbox_api_base
+    adapter.settings.bulk_load_nbr_devices = 2
+    adapter.settings.page_size = 500
+
+    sites = {"HQ": adapter.get("site", identifier="HQ")}
+    adapter.add(NetboxDevice(name="HQ-CORE-SW01", site_name="HQ", remote_id=28))
+    adapter.add(NetboxDevice(name="HQ-EDGE-01", site_name="HQ", remote_id=50))
+
+    requests_mock.get(
+        "http://mock/api/dcim/interfaces/?device_id=29&device_id=28",
+        json={
+            "count": 3,
+            "next": None,
+            "results": [
+                nb_interface(301, 29, "HQ-CORE-SW02", "TenGigabitEthernet1/0/2"),
+                nb_interface(201, 28, "HQ-CORE-SW01", "TenGigabitEthernet1/0/1"),
+                nb_interface(202, 28, "HQ-CORE-SW01", "TenGigabitEthernet1/0/2"),
+            ],
+        },
+    )
+    requests_mock.get(
+        "http://mock/api/dcim/interfaces/?device_id=50",
+        json={"count": 1, "next": None, "results": [nb_interface(771, 50, "HQ-EDGE-01", "TenGigabitEthernet1/0/1")]},
+    )
+
+    ip_address = json.load(open(f"{ROOT}/{FIXTURE_29}/ip_address.json"))
+    requests_mock.get(
+        "http://mock/api/ipam/ip-addresses/?device_id=29&device_id=28", json={"count": 0, "next": None, "results": []}
+    )
+    requests_mock.get(
+        "http://mock/api/ipam/ip-addresses/?device_id=50", json={"count": 1, "next": None, "results": [ip_address]}
+    )
+
+    adapter.load_netbox_devices_bulk(sites=sites, devices=adapter.get_all("device"))
+
+    # 2 batches of devices, each with one request for the interfaces and one for the IP addresses
+    assert len(requests_mock.request_history) == 4
+    assert all(request.qs["limit"] == ["500"] for request in requests_mock.request_history)
+
+    assert len(adapter.get("device", identifier="HQ-CORE-SW01").interfaces) == 2
+    assert len(adapter.get("device", identifier="HQ-CORE-SW02").interfaces) == 1
+    intf = adapter.get(NetboxInterface, identifier=dict(device_name="HQ-EDGE-01", name="TenGigabitEthernet1/0/1"))
+    assert intf.remote_id == 771
+    assert intf.ips == ["HQ-EDGE-01__TenGigabitEthernet1/0/1__10.255.0.69/30"]
+    assert adapter.get(NetboxIPAddress, identifier=intf.ips[0]).remote_id == 416
+
+
+def test_load_netbox_prefixes_vlans(netbox_api_empty, requests_mock):
+    config.load(config_data=dict(main=dict(backend="netbox", import_prefixes=True, import_vlans=True)))
+    adapter = netbox_api_empty
+    adapter.settings.sites_per_query = 2
+
+    for site_name in ["dc1", "nyc", "sfo"]:
+        adapter.add(NetboxSite(name=site_name))
+    adapter.add(NetboxDevice(name="devA", site_name="dc1"))
+
+    prefix = json.load(open(f"{ROOT}/{FIXTURE_28}/prefix_vlan.json"))
+    vlan = json.load(open(f"{ROOT}/{FIXTURE_29}/vlan_101_tags_01.json"))
+
+    requests_mock.get(
+        "http://mock/api/ipam/prefixes/?site=dc1&site=nyc&status=active",
+        json={"count": 1, "next": None, "results": [prefix]},
+    )
+    requests_mock.get(
+        "http://mock/api/ipam/prefixes/?site=sfo&status=active", json={"count": 0, "next": None, "results": []}
+    )
+    requests_mock.get(
+        "http://mock/api/ipam/vlans/?site=dc1&site=nyc", json={"count": 1, "next": None, "results": [vlan]}
+    )
+    requests_mock.get("http://mock/api/ipam/vlans/?site=sfo", json={"count": 0, "next": None, "results": []})
+
+    adapter.load_netbox_prefixes(adapter.get_all("site"))
+    adapter.load_netbox_vlans(adapter.get_all("site"))
+    assert len(requests_mock.request_history) == 4
+
+    nyc = adapter.get("site", identifier="nyc")
+    assert nyc.prefixes == ["nyc__10.1.111.0/24"]
+    assert adapter.get(NetboxPrefix, identifier="nyc__10.1.111.0/24").vlan == "nyc__111"
+
+    dc1 = adapter.get("site", identifier="dc1")
+    assert dc1.vlans == ["dc1__101"]
+    assert adapter.get(NetboxVlan, identifier="dc1__101").associated_devices == ["devA"]
+    assert adapter.get("site", identifier="sfo").vlans == []
+
+
+def test_get_inventory_devices(netbox_api_empty, requests_mock):
+    adapter = netbox_api_empty
+    requests_mock.get("http://mock/api/dcim/devices/", json=json.load(open(f"{ROOT}/{FIXTURE_INVENTORY}/devices.json")))
+    requests_mock.get(
+        "http://mock/api/dcim/platforms/", json=json.load(open(f"{ROOT}/{FIXTURE_INVENTORY}/platforms.json"))
+    )
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
+    inventory = NetBoxAPIInventory(settings=dict(address="http://mock", token="12349askdnfanasdf")).load()  # nosec
+    adapter.nornir = SimpleNamespace(inventory=inventory)
+    requests_mock.reset_mock()
+
+    nb_devices = adapter.get_inventory_devices()
+    assert not requests_mock.called
+    assert list(nb_devices.keys()) == list(inventory.hosts.keys())
+    assert nb_devices["austin"] == {
+        "id": 13,
+        "site": {"id": 1, "slug": "ni_example_01"},
+        "primary_ip": None,
+        "tags": [],
+    }
+
+
+def test_prepare_sync_cable_endpoints(netbox_api_empty, requests_mock):
+    adapter = netbox_api_empty
+    adapter.settings.cable_endpoints_per_query = 2
+    adapter.add(NetboxInterface(name="Ethernet1", device_name="devA", remote_id=1))
+
+    diff = NetworkImporterDiff()
+    for keys in [
+        dict(device_a_name="devA", interface_a_name="Ethernet1", device_z_name="devB", interface_z_name="Ethernet2"),
+        dict(device_a_name="devC", interface_a_name="eth3", device_z_name="devD", interface_z_name="eth4"),
+    ]:
+        element = DiffElement(obj_type="cable", name="__".join(keys.values()), keys=keys)
+        element.add_attrs(source={})
+        diff.add(element)
+
+    requests_mock.get(
+        "http://mock/api/dcim/interfaces/?device=devB&device=devC&name=Ethernet2&name=eth3",
+        json={
+            "count": 2,
+            "next": None,
+            "results": [nb_interface(2, 20, "devB", "Ethernet2"), nb_interface(3, 30, "devC", "Ethernet2")],
+        },
+    )
+    requests_mock.get(
+        "http://mock/api/dcim/interfaces/?device=devD&name=eth4", json={"count": 0, "next": None, "results": []}
+    )
+
+    adapter.prepare_sync(diff)
+    assert len(requests_mock.request_history) == 2
+    assert adapter.get(NetboxInterface, identifier="devB__Ethernet2").remote_id == 2
+    assert not adapter.get_or_none(NetboxInterface, dict(device_name="devC", name="Ethernet2"))
+    assert adapter.missing_cable_endpoints == {("devC", "eth3"), ("devD", "eth4")}
+
+    # The endpoints not found are not queried again when the cables are created
+    assert adapter.get_intf_from_netbox(device_name="devC", intf_name="eth3") is False
+    assert len(requests_mock.request_history) == 2
+
+
+def test_prepare_sync_cable_endpoints_created(netbox_api_empty, requests_mock):
+    adapter = netbox_api_empty
+    adapter.add(NetboxInterface(name="Ethernet1", device_name="devA", remote_id=1))
+
+    diff = NetworkImporterDiff()
+    device = DiffElement(obj_type="device", name="devB", keys=dict(name="devB"))
+    device.add_attrs(source={})
+    intf = DiffElement(obj_type="interface", name="devB__Ethernet2", keys=dict(device_name="devB", name="Ethernet2"))
+    intf.add_attrs(source={})
+    device.add_child(intf)
+    diff.add(device)
+
+    keys = dict(device_a_name="devA", interface_a_name="Ethernet1", device_z_name="devB", interface_z_name="Ethernet2")
+    cable = DiffElement(obj_type="cable", name="__".join(keys.values()), keys=keys)
+    cable.add_attrs(source={})
+    diff.add(cable)
+
+    # The interfaces created by the diff are not queried
+    adapter.prepare_sync(diff)
+    assert not requests_mock.called
+    assert not adapter.missing_cable_endpoints
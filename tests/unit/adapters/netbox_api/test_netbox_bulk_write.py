@@ -0,0 +1,88 @@
+"""test for the bulk write path of the NetBoxAPIAdapter."""
+import pynetbox
+from pynetbox.core.query import Request
+
+import network_importer.config as config
+from network_importer.adapters.bulk_writer import BulkWriter
+from network_importer.adapters.netbox_api.models import NetboxCable, NetboxInterface, NetboxIPAddress
+
+
+def test_bulk_write_create(netbox_api_base, requests_mock):
+    config.load(config_data=dict(main=dict(import_vlans=False, backend="netbox")))
+    adapter = netbox_api_base
+    adapter.bulk_writer = BulkWriter(Request, pynetbox.core.query.RequestError, batch_size=2)
+
+    requests_mock.post(
+        "http://mock/api/dcim/interfaces/",
+        [
+            {"json": [{"id": 101}, {"id": 102}]},
+            {"json": [{"id": 103}]},
+        ],
+    )
+    requests_mock.post("http://mock/api/ipam/ip-addresses/", json=[{"id": 201}])
+
+    ids = dict(device_name="HQ-CORE-SW02")
+    member = NetboxInterface.create(
+        diffsync=adapter, ids=dict(ids, name="ge-0/0/1"), attrs=dict(is_lag_member=True, parent="HQ-CORE-SW02__ae0")
+    )
+    lag = NetboxInterface.create(diffsync=adapter, ids=dict(ids, name="ae0"), attrs=dict(is_lag=True))
+    intf = NetboxInterface.create(diffsync=adapter, ids=dict(ids, name="ge-0/0/2"), attrs={})
+    for item in [member, lag, intf]:
+        adapter.add(item)
+    ip_address = NetboxIPAddress.create(
+        diffsync=adapter,
+        ids=dict(address="10.10.10.1/24", device_name="HQ-CORE-SW02", interface_name="ge-0/0/2"),
+        attrs={},
+    )
+
+    assert not requests_mock.called
+    adapter.sync_complete(source=None, diff=None)
+
+    assert [item.remote_id for item in [lag, intf, member, ip_address]] == [101, 102, 103, 201]
+    assert [req.json() for req in requests_mock.request_history][0][0]["name"] == "ae0"
+    assert requests_mock.request_history[1].json()[0]["lag"] == 101
+    assert requests_mock.request_history[2].json()[0]["assigned_object_id"] == 102
+
+
+def test_bulk_write_fallback(netbox_api_base, requests_mock):
+    config.load(config_data=dict(main=dict(import_vlans=False, backend="netbox")))
+    adapter = netbox_api_base
+    adapter.bulk_writer = BulkWriter(Request, pynetbox.core.query.RequestError, batch_size=10)
+
+    requests_mock.post(
+        "http://mock/api/dcim/interfaces/",
+        [
+            {"status_code": 400, "json": [{"name": ["invalid"]}, {}]},
+            {"status_code": 400, "json": [{"name": ["invalid"]}]},
+            {"json": [{"id": 102}]},
+        ],
+    )
+
+    intf1 = NetboxInterface.create(diffsync=adapter, ids=dict(device_name="HQ-CORE-SW02", name="ge-0/0/1"), attrs={})
+    intf2 = NetboxInterface.create(diffsync=adapter, ids=dict(device_name="HQ-CORE-SW02", name="ge-0/0/2"), attrs={})
+    adapter.bulk_writer.flush()
+
+    assert len(requests_mock.request_history) == 3
+    assert intf1.remote_id is None
+    assert intf2.remote_id == 102
+
+
+def test_bulk_write_delete_before_create(netbox_api_base, requests_mock):
+    config.load(config_data=dict(main=dict(import_vlans=False, backend="netbox")))
+    adapter = netbox_api_base
+    adapter.bulk_writer = BulkWriter(Request, pynetbox.core.query.RequestError, batch_size=10)
+
+    requests_mock.delete("http://mock/api/dcim/cables/", status_code=204)
+    requests_mock.post("http://mock/api/dcim/cables/", json=[{"id": 502}])
+
+    ids = dict(device_a_name="HQ-CORE-SW02", interface_a_name="TenGigabitEthernet1/0/1", device_z_name="HQ-CORE-SW01")
+    old_cable = NetboxCable(**ids, interface_z_name="TenGigabitEthernet1/0/1", remote_id=501)
+    new_cable = NetboxCable(**ids, interface_z_name="TenGigabitEthernet1/0/2")
+
+    adapter.bulk_writer.create(new_cable, adapter.netbox.dcim.cables, lambda: dict(termination_a_id=302))
+    adapter.bulk_writer.delete(old_cable, adapter.netbox.dcim.cables)
+    adapter.bulk_writer.flush()
+
+    assert [req.method for req in requests_mock.request_history] == ["DELETE", "POST"]
+    assert requests_mock.request_history[0].json() == [{"id": 501}]
+    assert new_cable.remote_id == 502
@@ -25,6 +25,7 @@ def test_nb_inventory_all(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv = NetBoxAPIInventory(settings=dict(address="http://mock", token="12349askdnfanasdf")).load()  # nosec
 
@@ -32,6 +33,12 @@ def test_nb_inventory_all(requests_mock):
     assert "austin" in inv.hosts.keys()
     assert inv.hosts["austin"].platform == "ios"
     assert inv.hosts["austin"].connection_options["napalm"].platform == "ios_naplam"
+    assert inv.hosts["austin"].data["device_record"] == {
+        "id": 13,
+        "site": {"id": 1, "slug": "ni_example_01"},
+        "primary_ip": None,
+        "tags": [],
+    }
     assert "dallas" in inv.hosts.keys()
     assert inv.hosts["dallas"].platform == "nxos"
     assert inv.hosts["dallas"].connection_options["napalm"].platform == "nxos_naplam"
@@ -55,6 +62,7 @@ def test_nb_inventory_filtered(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv_filtered = NetBoxAPIInventory(
         limit="el-paso",
@@ -85,6 +93,7 @@ def test_nb_inventory_exclude(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv = NetBoxAPIInventory(
         settings=dict(
@@ -113,6 +122,7 @@ def test_nb_inventory_virtual_chassis(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv = NetBoxAPIInventory(settings=dict(address="http://mock", token="12349askdnfanasdf")).load()  # nosec
 
@@ -139,6 +149,7 @@ def test_nb_inventory_supported_platforms(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     inv = NetBoxAPIInventory(
         supported_platforms=["ios", "nxos"],  # nosec
@@ -157,3 +168,72 @@ def test_nb_inventory_supported_platforms(requests_mock):
     assert len(inv.hosts.keys()) == 1
     assert "austin" in inv.hosts.keys()
     assert "dallas" not in inv.hosts.keys()
+
+
+def test_nb_inventory_server_side_filters(requests_mock):
+    """
+    Test that the filter, the platforms and the virtual chassis are filtered by netbox
+
+    Args:
+        requests_mock (:obj:`requests_mock.mocker.Mocker`): Automatically inserted
+        by pytest library, mocks requests get to external API so external API call is
+        not needed for unit test.
+    """
+    stack = yaml.safe_load(open(f"{HERE}/{FIXTURES}/stack_devices.json"))["results"]
+    devices = {dev["name"]: dev for dev in stack}
+    devices["amarillo"]["virtual_chassis"] = {"id": 2, "master": None}
+    devices["amarillo"]["platform"] = devices["test_dev1"]["platform"]
+
+    requests_mock.get(
+        "http://mock/api/dcim/devices/?virtual_chassis_member=False",
+        json={"count": 0, "next": None, "results": []},
+    )
+    requests_mock.get(
+        "http://mock/api/dcim/devices/?id=4",
+        json={"count": 1, "next": None, "results": [devices["test_dev1"]]},
+    )
+    requests_mock.get(
+        "http://mock/api/dcim/devices/?virtual_chassis_id=2",
+        json={"count": 1, "next": None, "results": [devices["amarillo"]]},
+    )
+    requests_mock.get(
+        "http://mock/api/dcim/virtual-chassis/",
+        json={"count": 2, "next": None, "results": [{"id": 1, "master": {"id": 4}}, {"id": 2, "master": None}]},
+    )
+    data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
+    requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+
+    inv = NetBoxAPIInventory(
+        supported_platforms=["cisco_ios"],
+        settings=dict(address="http://mock", token="12349askdnfanasdf", filter="site=hq"),  # nosec
+    ).load()  # nosec
+
+    assert sorted(inv.hosts.keys()) == ["amarillo", "test_dev1"]
+    assert inv.hosts["test_dev1"].data["virtual_chassis"]
+    assert not inv.hosts["amarillo"].data["virtual_chassis"]
+
+    # The members of the virtual chassis are excluded from the main query, the masters are fetched by id
+    filters = {"site": ["hq"], "platform": ["cisco_ios"], "exclude": ["config_context"], "limit": ["0"]}
+    devices_requests = [req.qs for req in requests_mock.request_history if req.path == "/api/dcim/devices/"]
+    assert devices_requests == [
+        dict(filters, virtual_chassis_member=["false"]),
+        dict(filters, id=["4"]),
+        dict(filters, virtual_chassis_id=["2"]),
+    ]
+    platforms_requests = [req.qs for req in requests_mock.request_history if req.path == "/api/dcim/platforms/"]
+    assert platforms_requests == [{"slug": ["cisco_ios"], "limit": ["0"]}]
+
+    requests_mock.reset_mock()
+    NetBoxAPIInventory(
+        supported_platforms=["cisco_ios"],
+        settings=dict(address="http://mock", token="12349askdnfanasdf", filter="platform=cisco_nxos"),  # nosec
+    ).load()  # nosec
+
+    # The platform defined in the filter is not replaced by the supported platforms
+    devices_requests = [req.qs for req in requests_mock.request_history if req.path == "/api/dcim/devices/"]
+    assert devices_requests[0] == {
+        "platform": ["cisco_nxos"],
+        "virtual_chassis_member": ["false"],
+        "exclude": ["config_context"],
+        "limit": ["0"],
+    }
@@ -0,0 +1,104 @@
+"""
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+from unittest.mock import patch
+
+import pandas as pd
+from pybatfish.datamodel.primitives import Interface as BFInterface
+
+import network_importer.config as config
+from network_importer.adapters.network_importer.answers_cache import BatfishAnswersCache
+
+BF_NODES = pd.DataFrame(
+    [{"Node": "spine1", "Configuration_Format": "CISCO_IOS"}, {"Node": "spine2", "Configuration_Format": "CISCO_IOS"}],
+    dtype=object,
+)
+
+BF_INTERFACES = pd.DataFrame(
+    [{"Interface": BFInterface(hostname="spine1", interface="GigabitEthernet0/0/0"), "All_Prefixes": ["10.0.0.1/24"]}],
+    dtype=object,
+)
+
+
+def test_answers_cache_get_set(tmp_path):
+    cache = BatfishAnswersCache(directory=str(tmp_path / "answers"), fingerprint="1234", max_size=0)
+
+    assert cache.get("interfaceProperties", {"nodes": '"spine1"'}) is None
+    cache.set("interfaceProperties", {"nodes": '"spine1"'}, BF_INTERFACES)
+
+    frame = cache.get("interfaceProperties", {"nodes": '"spine1"'})
+    assert frame["Interface"][0] == BFInterface(hostname="spine1", interface="GigabitEthernet0/0/0")
+    assert frame["All_Prefixes"][0] == ["10.0.0.1/24"]
+    assert cache.get("interfaceProperties", {"nodes": '"spine2"'}) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    other_cache = BatfishAnswersCache(directory=str(tmp_path / "answers"), fingerprint="5678", max_size=0)
+    assert other_cache.get("interfaceProperties", {"nodes": '"spine1"'}) is None
+
+
+def test_answers_cache_evict(tmp_path):
+    cache = BatfishAnswersCache(directory=str(tmp_path / "answers"), fingerprint="1234", max_size=0)
+    for idx in range(3):
+        cache.set("nodeProperties", {"nodes": f'"spine{idx}"'}, BF_NODES)
+        os.utime(cache.get_path("nodeProperties", {"nodes": f'"spine{idx}"'}), (idx, idx))
+
+    # Use the oldest answer to make it the most recently used
+    assert cache.get("nodeProperties", {"nodes": '"spine0"'}) is not None
+
+    cache.max_size = os.path.getsize(cache.get_path("nodeProperties", {"nodes": '"spine0"'})) * 2
+    cache.evict()
+
+    assert os.path.exists(cache.get_path("nodeProperties", {"nodes": '"spine0"'}))
+    assert not os.path.exists(cache.get_path("nodeProperties", {"nodes": '"spine1"'}))
+    assert os.path.exists(cache.get_path("nodeProperties", {"nodes": '"spine2"'}))
+
+
+def test_ask_batfish_answers_cache(network_importer_base, tmp_path):
+    adapter = network_importer_base
+    (tmp_path / "snapshot" / "configs").mkdir(parents=True)
+    (tmp_path / "snapshot" / "configs" / "spine1.txt").write_text("hostname spine1")
+    config.load(
+        config_data=dict(
+            main=dict(
+                backend="nautobot",
+                configs_directory=str(tmp_path / "snapshot"),
+                cache_directory=str(tmp_path / "cache"),
+            ),
+            batfish=dict(answers_cache=True),
+        )
+    )
+
+    with patch("network_importer.adapters.network_importer.adapter.Session") as session:
+        bfi = session.get.return_value
+        bfi.q.nodeProperties.return_value.answer.return_value.frame.return_value = BF_NODES
+
+        adapter.init_batfish_answers_cache()
+        assert adapter.bfi is None
+        assert adapter.load_batfish_nodes() == {"spine1", "spine2"}
+        assert bfi.init_snapshot.call_count == 1
+        assert bfi.q.nodeProperties.call_count == 1
+
+        # With a warm cache, Batfish must not be initialized nor queried
+        adapter.bfi = None
+        adapter.init_batfish_answers_cache()
+        assert adapter.load_batfish_nodes() == {"spine1", "spine2"}
+        assert adapter.bfi is None
+        assert bfi.init_snapshot.call_count == 1
+        assert bfi.q.nodeProperties.call_count == 1
+
+        # The configurations changed, the answers in the cache are not valid anymore
+        (tmp_path / "snapshot" / "configs" / "spine1.txt").write_text("hostname spine1-new")
+        adapter.init_batfish_answers_cache()
+        adapter.load_batfish_nodes()
+        assert bfi.q.nodeProperties.call_count == 2
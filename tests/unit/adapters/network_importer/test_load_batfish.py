@@ -0,0 +1,231 @@
+"""
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from pybatfish.datamodel.primitives import Interface as BFInterface
+
+import network_importer.config as config
+from network_importer.adapters.network_importer.adapter import NetworkImporterAdapter
+from network_importer.models import Site, Device, Interface, Vlan
+
+
+def bf_interface(hostname, name, **kwargs):
+    """Return a row of the interfaceProperties answer."""
+    intf = {
+        "Interface": BFInterface(hostname=hostname, interface=name),
+        "Access_VLAN": None,
+        "Active": True,
+        "All_Prefixes": [],
+        "Allowed_VLANs": "",
+        "Channel_Group": None,
+        "Channel_Group_Members": [],
+        "Description": None,
+        "Encapsulation_VLAN": None,
+        "MTU": 1500,
+        "Native_VLAN": None,
+        "Switchport_Mode": "NONE",
+    }
+    intf.update(kwargs)
+    return intf
+
+
+BF_INTERFACES = pd.DataFrame(
+    [
+        bf_interface("spine1", "GigabitEthernet0/0/0", All_Prefixes=["10.10.10.1/24"]),
+        bf_interface("spine1", "GigabitEthernet0/0/1", Switchport_Mode="ACCESS", Access_VLAN=10),
+        bf_interface("spine2", "GigabitEthernet0/0/0", Description=" spine2 description "),
+    ],
+    dtype=object,
+)
+
+BF_VLANS = pd.DataFrame(
+    [
+        {
+            "Node": "spine1",
+            "VLAN_ID": 10,
+            "Interfaces": [BFInterface(hostname="spine1", interface="GigabitEthernet0/0/1")],
+        },
+    ],
+    dtype=object,
+)
+
+
+def make_bfi():
+    """Return a mocked Batfish session answering interfaceProperties and switchedVlanProperties."""
+    bfi = MagicMock()
+    bfi.q.interfaceProperties.return_value.answer.return_value.frame.return_value = BF_INTERFACES
+    bfi.q.switchedVlanProperties.return_value.answer.return_value.frame.return_value = BF_VLANS
+    return bfi
+
+
+def test_load_batfish_all_nodes(network_importer_base, site_sfo):
+    adapter = network_importer_base
+    adapter.bfi = make_bfi()
+    adapter.add(site_sfo)
+    adapter.add(Device(name="spine1", site_name="sfo"))
+    adapter.add(Device(name="spine2", site_name="sfo"))
+    adapter.remove(adapter.get(Device, identifier="HQ-CORE-SW02"))
+
+    config.load(config_data=dict(main=dict(backend="nautobot", import_vlans="config")))
+
+    adapter.load_batfish()
+
+    adapter.bfi.q.interfaceProperties.assert_called_once()
+    assert "nodes" not in adapter.bfi.q.interfaceProperties.call_args.kwargs
+    adapter.bfi.q.switchedVlanProperties.assert_called_once_with()
+
+    assert len(adapter.get(Device, identifier="spine1").interfaces) == 2
+    assert len(adapter.get(Device, identifier="spine2").interfaces) == 1
+    intf = adapter.get(Interface, identifier=dict(device_name="spine2", name="GigabitEthernet0/0/0"))
+    assert intf.description == "spine2 description"
+    vlan = adapter.get(Vlan, identifier=dict(site_name="sfo", vid=10))
+    assert vlan.associated_devices == ["spine1"]
+
+
+def test_load_batfish_chunks(network_importer_base, site_sfo):
+    adapter = network_importer_base
+    adapter.bfi = make_bfi()
+    adapter.add(site_sfo)
+    adapter.add(Device(name="spine1", site_name="sfo"))
+    adapter.add(Device(name="spine2", site_name="sfo"))
+    adapter.remove(adapter.get(Device, identifier="HQ-CORE-SW02"))
+
+    config.load(config_data=dict(main=dict(backend="nautobot", import_vlans=False), batfish=dict(nodes_per_query=1)))
+
+    adapter.load_batfish()
+
+    assert adapter.bfi.q.interfaceProperties.call_count == 2
+    nodes = [call.kwargs["nodes"] for call in adapter.bfi.q.interfaceProperties.call_args_list]
+    assert nodes == ['"spine1"', '"spine2"']
+    adapter.bfi.q.switchedVlanProperties.assert_not_called()
+
+
+def test_plan_batfish_question(network_importer_base):
+    adapter = network_importer_base
+
+    config.load(
+        config_data=dict(
+            main=dict(backend="nautobot", import_ips=False, import_prefixes=False, import_vlans="no"),
+        )
+    )
+    params = adapter.plan_batfish_question("interfaceProperties")
+    assert params == {"properties": "Channel_Group,Description,Encapsulation_VLAN,MTU,Switchport_Mode"}
+    assert adapter.plan_batfish_question("switchedVlanProperties", nodes=["spine1"]) is None
+
+    config.load(
+        config_data=dict(
+            main=dict(backend="nautobot", import_ips=True, import_intf_status=True, import_vlans="cli"),
+        )
+    )
+    params = adapter.plan_batfish_question("interfaceProperties", nodes=["spine1", "spine2"])
+    assert params["nodes"] == '"spine1","spine2"'
+    assert params["properties"].split(",") == [
+        "Access_VLAN",
+        "Active",
+        "All_Prefixes",
+        "Allowed_VLANs",
+        "Channel_Group",
+        "Description",
+        "Encapsulation_VLAN",
+        "MTU",
+        "Native_VLAN",
+        "Switchport_Mode",
+    ]
+
+    assert adapter.plan_batfish_question("switchedVlanProperties", nodes=["spine1"]) == {"nodes": '"spine1"'}
+
+
+def test_load_batfish_interfaces_same_as_load_batfish_interface():
+    config.load(config_data=dict(main=dict(backend="nautobot", import_intf_status=True, import_prefixes=True)))
+
+    bf_intfs = pd.DataFrame(
+        [
+            bf_interface("spine1", "Loopback1", Description="  loopback  ", All_Prefixes=["10.0.0.1/32"]),
+            bf_interface("spine1", "GigabitEthernet0/0/0.201", Encapsulation_VLAN=201, Active=False),
+            bf_interface("spine1", "Port-Channel11", Switchport_Mode="TRUNK", Allowed_VLANs="10-12", Native_VLAN=1),
+            bf_interface("spine1", "TenGigabitEthernet2/1/3", Switchport_Mode="TRUNK", Channel_Group="Port-Channel11"),
+            bf_interface("spine1", "ae0", Switchport_Mode="FEX_FABRIC"),
+            bf_interface("spine1", "Serial0/1/0:15", All_Prefixes=["10.1.1.1/30"]),
+            bf_interface("spine1", "Vlan10", Description=""),
+        ],
+        dtype=object,
+    )
+
+    row_adapter = NetworkImporterAdapter(nornir=None, settings={})
+    site = Site(name="sfo")
+    device = Device(name="spine1", site_name="sfo")
+    row_adapter.add(site)
+    row_adapter.add(device)
+    for _, intf in bf_intfs.iterrows():
+        row_adapter.load_batfish_interface(site=site, device=device, intf=dict(intf))
+
+    adapter = NetworkImporterAdapter(nornir=None, settings={})
+    site = Site(name="sfo")
+    device = Device(name="spine1", site_name="sfo")
+    adapter.add(site)
+    adapter.add(device)
+    adapter.load_batfish_interfaces(site=site, device=device, bf_intfs=bf_intfs, interface_vlans_mapping={})
+
+    assert adapter.dict() == row_adapter.dict()
+    assert not adapter.diff_to(row_adapter).has_diffs()
+
+
+def test_ask_batfish_concurrently(network_importer_base):
+    adapter = network_importer_base
+    adapter.bfi = MagicMock()
+    config.load(config_data=dict(main=dict(backend="nautobot"), batfish=dict(max_concurrent_questions=2)))
+
+    def answer(question, params):
+        # The first questions take longer to answer than the last ones
+        time.sleep(0.01 * (5 - params["idx"]))
+        return params["idx"]
+
+    with patch.object(adapter, "ask_batfish", side_effect=answer) as ask_batfish:
+        questions = [("interfaceProperties", {"idx": idx}) for idx in range(5)]
+        questions.insert(2, ("switchedVlanProperties", None))
+        assert list(adapter.ask_batfish_concurrently(questions)) == [0, 1, None, 2, 3, 4]
+        assert ask_batfish.call_count == 5
+
+
+def test_load_batfish_layer3_edges(network_importer_base, site_sfo):
+    adapter = network_importer_base
+    adapter.bfi = make_bfi()
+    adapter.add(site_sfo)
+    adapter.add(Device(name="spine1", site_name="sfo"))
+    adapter.add(Device(name="spine2", site_name="sfo"))
+    adapter.remove(adapter.get(Device, identifier="HQ-CORE-SW02"))
+
+    adapter.bfi.q.layer3Edges.return_value.answer.return_value.frame.return_value = pd.DataFrame(
+        [
+            {
+                "Interface": BFInterface(hostname="spine1", interface="GigabitEthernet0/0/0"),
+                "Remote_Interface": BFInterface(hostname="spine2", interface="GigabitEthernet0/0/0"),
+            }
+        ],
+        dtype=object,
+    )
+
+    config.load(
+        config_data=dict(main=dict(backend="nautobot", import_cabling="config"), batfish=dict(nodes_per_query=1))
+    )
+
+    adapter.load_batfish()
+    assert adapter.bfi.q.interfaceProperties.call_count == 2
+    adapter.bfi.q.layer3Edges.assert_called_once_with()
+
+    adapter.load_batfish_cable()
+    adapter.bfi.q.layer3Edges.assert_called_once_with()
+    assert len(adapter.get_all("cable")) == 1
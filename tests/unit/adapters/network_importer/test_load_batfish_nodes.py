@@ -0,0 +1,29 @@
+"""
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+
+def test_load_batfish_nodes(network_importer_base):
+    adapter = network_importer_base
+    adapter.bfi = MagicMock()
+    adapter.bfi.q.nodeProperties.return_value.answer.return_value.frame.return_value = pd.DataFrame(
+        {"Node": ["spine1", "Leaf1"]}
+    )
+
+    nodes = adapter.load_batfish_nodes()
+
+    assert nodes == {"spine1", "leaf1"}
+    adapter.bfi.q.nodeProperties.assert_called_once_with(properties="Configuration_Format")
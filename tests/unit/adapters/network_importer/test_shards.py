@@ -0,0 +1,180 @@
+"""
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import os
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from pybatfish.datamodel.primitives import Interface as BFInterface
+
+import network_importer.config as config
+from network_importer.adapters.network_importer.adapter import NetworkImporterAdapter
+from network_importer.adapters.network_importer.shards import get_cross_shard_edges
+from network_importer.models import Site, Device, Cable
+
+
+def bf_interface(hostname, name, prefixes):
+    """Return a row of the interfaceProperties answer."""
+    return {
+        "Interface": BFInterface(hostname=hostname, interface=name),
+        "All_Prefixes": prefixes,
+        "MTU": 1500,
+        "Switchport_Mode": "NONE",
+    }
+
+
+SHARDS_INTERFACES = {
+    "sfo": pd.DataFrame(
+        [
+            bf_interface("spine1", "Ethernet1", ["10.0.0.0/31"]),
+            bf_interface("spine1", "Ethernet2", ["10.0.0.2/31"]),
+            bf_interface("spine1", "Vlan10", ["10.10.0.1/24"]),
+        ],
+        dtype=object,
+    ),
+    "hou": pd.DataFrame(
+        [
+            bf_interface("spine2", "Ethernet1", ["10.0.0.1/31"]),
+            bf_interface("spine2", "Vlan10", ["10.10.0.2/24"]),
+        ],
+        dtype=object,
+    ),
+}
+
+
+def test_get_cross_shard_edges():
+    edges = get_cross_shard_edges(list(SHARDS_INTERFACES.items()))
+
+    assert list(edges["Interface"]) == [
+        BFInterface(hostname="spine1", interface="Ethernet1"),
+        BFInterface(hostname="spine2", interface="Ethernet1"),
+    ]
+    assert list(edges["Remote_Interface"]) == [
+        BFInterface(hostname="spine2", interface="Ethernet1"),
+        BFInterface(hostname="spine1", interface="Ethernet1"),
+    ]
+
+    # Interfaces of the same shard are not considered
+    assert get_cross_shard_edges([("sfo", SHARDS_INTERFACES["hou"]), ("sfo", SHARDS_INTERFACES["sfo"])]).empty
+
+
+def make_shard_session(site_name):
+    """Return a mocked Batfish session answering for the devices of a given site."""
+    bfi = MagicMock()
+    hostnames = sorted({intf.hostname for intf in SHARDS_INTERFACES[site_name]["Interface"]})
+    bfi.q.nodeProperties.return_value.answer.return_value.frame.return_value = pd.DataFrame(
+        {"Node": hostnames}, dtype=object
+    )
+    bfi.q.interfaceProperties.return_value.answer.return_value.frame.return_value = SHARDS_INTERFACES[site_name]
+    bfi.q.layer3Edges.return_value.answer.return_value.frame.return_value = pd.DataFrame(
+        columns=["Interface", "Remote_Interface"], dtype=object
+    )
+    return bfi
+
+
+def test_load_batfish_shards(tmp_path):
+    (tmp_path / "snapshot" / "configs").mkdir(parents=True)
+    for hostname in ["spine1", "spine2"]:
+        (tmp_path / "snapshot" / "configs" / f"{hostname}.txt").write_text(f"hostname {hostname}")
+
+    config.load(
+        config_data=dict(
+            main=dict(
+                backend="nautobot",
+                import_cabling="config",
+                import_vlans=False,
+                configs_directory=str(tmp_path / "snapshot"),
+                cache_directory=str(tmp_path / "cache"),
+            ),
+            batfish=dict(shard_by_site=True),
+        )
+    )
+
+    adapter = NetworkImporterAdapter(nornir=MagicMock(), settings={})
+    adapter.nornir.inventory.hosts = {
+        "spine1": MagicMock(site_name="sfo"),
+        "spine2": MagicMock(site_name="hou"),
+    }
+    adapter.init_batfish_shards()
+
+    assert sorted(adapter.batfish_shards.keys()) == ["hou", "sfo"]
+    assert [path.name for path in (tmp_path / "cache" / "shards" / "hou" / "configs").iterdir()] == ["spine2.txt"]
+
+    sessions = {}
+
+    def get_session(*args, **kwargs):
+        session = MagicMock()
+
+        def init_snapshot(path, name, overwrite):
+            site_name = name.split("-")[-1]
+            sessions[site_name] = make_shard_session(site_name)
+            session.q = sessions[site_name].q
+
+        session.init_snapshot.side_effect = init_snapshot
+        return session
+
+    with patch("network_importer.adapters.network_importer.adapter.Session") as session:
+        session.get.side_effect = get_session
+
+        assert adapter.load_batfish_nodes() == {"spine1", "spine2"}
+        assert sorted(sessions.keys()) == ["hou", "sfo"]
+
+        for site_name in ["sfo", "hou"]:
+            adapter.add(Site(name=site_name))
+        adapter.add(Device(name="spine1", site_name="sfo"))
+        adapter.add(Device(name="spine2", site_name="hou"))
+
+        adapter.load_batfish()
+        adapter.load_batfish_cable()
+
+    assert sorted(intf.get_unique_id() for intf in adapter.get_all("interface")) == [
+        "spine1__Ethernet1",
+        "spine1__Ethernet2",
+        "spine1__Vlan10",
+        "spine2__Ethernet1",
+        "spine2__Vlan10",
+    ]
+    for site_name in ["sfo", "hou"]:
+        assert "All_Prefixes" in sessions[site_name].q.interfaceProperties.call_args.kwargs["properties"]
+        sessions[site_name].q.layer3Edges.assert_called_once()
+
+    cables = adapter.get_all(Cable)
+    assert len(cables) == 1
+    assert {cables[0].device_a_name, cables[0].device_z_name} == {"spine1", "spine2"}
+
+
+def test_init_batfish_shards_site_name(tmp_path):
+    (tmp_path / "snapshot" / "configs").mkdir(parents=True)
+    (tmp_path / "snapshot" / "configs" / "spine1.txt").write_text("hostname spine1")
+
+    config.load(
+        config_data=dict(
+            main=dict(
+                backend="nautobot",
+                import_vlans=False,
+                configs_directory=str(tmp_path / "snapshot"),
+                cache_directory=str(tmp_path / "cache"),
+            ),
+            batfish=dict(shard_by_site=True),
+        )
+    )
+
+    adapter = NetworkImporterAdapter(nornir=MagicMock(), settings={})
+    adapter.nornir.inventory.hosts = {"spine1": MagicMock(site_name="../sfo 1")}
+    adapter.init_batfish_shards()
+
+    # The name of the site is converted before being used in the path of the shard
+    shard = adapter.batfish_shards["../sfo 1"]
+    assert os.path.dirname(shard.path) == str(tmp_path / "cache" / "shards")
+    assert " " not in shard.snapshot_name
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == ["shards"]
@@ -0,0 +1,247 @@
+"""
+(c) 2020 Network To Code
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+  http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from unittest.mock import MagicMock, patch
+
+import network_importer.config as config
+from network_importer.adapters.network_importer.snapshot import (
+    get_configs_delta,
+    get_configs_md5,
+    get_directory_fingerprint,
+    load_neighbors,
+    load_snapshot_state,
+    prepare_limited_snapshot,
+    save_neighbors,
+    save_snapshot_state,
+)
+
+
+def make_configs(path, configs):
+    """Create a configs directory in Batfish format."""
+    (path / "configs").mkdir(parents=True, exist_ok=True)
+    for hostname, content in configs.items():
+        (path / "configs" / f"{hostname}.txt").write_text(content)
+
+
+def test_get_directory_fingerprint(tmp_path):
+    make_configs(tmp_path, {"spine1": "hostname spine1", "spine2": "hostname spine2"})
+    fingerprint = get_directory_fingerprint(tmp_path)
+
+    assert fingerprint == get_directory_fingerprint(tmp_path)
+
+    make_configs(tmp_path, {"spine2": "hostname spine2\n"})
+    assert fingerprint != get_directory_fingerprint(tmp_path)
+
+    make_configs(tmp_path, {"spine2": "hostname spine2"})
+    assert fingerprint == get_directory_fingerprint(tmp_path)
+
+    (tmp_path / "configs" / "spine2.txt").rename(tmp_path / "configs" / "spine3.txt")
+    assert fingerprint != get_directory_fingerprint(tmp_path)
+
+
+def test_save_load_snapshot_state(tmp_path):
+    config.load(config_data=dict(main=dict(backend="nautobot", cache_directory=str(tmp_path / "cache"))))
+
+    save_snapshot_state(None)
+    assert not (tmp_path / "cache").exists()
+    assert load_snapshot_state() == {}
+
+    save_snapshot_state(dict(name="latest", fingerprint="1234"))
+    assert load_snapshot_state() == dict(name="latest", fingerprint="1234")
+
+    config.load(
+        config_data=dict(
+            main=dict(backend="nautobot", cache_directory=str(tmp_path / "cache")), batfish=dict(snapshot_name="other")
+        )
+    )
+    assert load_snapshot_state() == {}
+    save_snapshot_state(dict(name="other", fingerprint="5678"))
+    assert load_snapshot_state()["fingerprint"] == "5678"
+
+    save_snapshot_state(None)
+    assert load_snapshot_state() == {}
+
+
+def test_get_configs_md5_delta(tmp_path):
+    make_configs(tmp_path, {"spine1": "hostname spine1", "spine2": "hostname spine2"})
+
+    configs = get_configs_md5(tmp_path)
+    assert sorted(configs.keys()) == ["spine1.txt", "spine2.txt"]
+    assert get_configs_md5(tmp_path, known_md5={"spine1.txt": "1234"})["spine1.txt"] == "1234"
+    assert get_configs_md5(tmp_path / "missing") == {}
+
+    make_configs(tmp_path, {"spine2": "hostname spine2-new", "spine3": "hostname spine3"})
+    (tmp_path / "configs" / "spine1.txt").unlink()
+
+    assert get_configs_delta(configs, get_configs_md5(tmp_path)) == (["spine2.txt", "spine3.txt"], ["spine1.txt"])
+    assert get_configs_delta(configs, configs) == ([], [])
+
+
+def test_init_batfish_reuse_snapshot(network_importer_base, tmp_path):
+    adapter = network_importer_base
+    make_configs(tmp_path / "snapshot", {"spine1": "hostname spine1"})
+    config.load(
+        config_data=dict(
+            main=dict(
+                backend="nautobot",
+                configs_directory=str(tmp_path / "snapshot"),
+                cache_directory=str(tmp_path / "cache"),
+            ),
+            batfish=dict(reuse_snapshot=True),
+        )
+    )
+
+    with patch("network_importer.adapters.network_importer.adapter.Session") as session:
+        bfi = session.get.return_value
+        bfi.list_snapshots.return_value = ["latest"]
+
+        adapter.init_batfish()
+        assert bfi.init_snapshot.call_count == 1
+        bfi.set_snapshot.assert_not_called()
+
+        adapter.init_batfish()
+        assert bfi.init_snapshot.call_count == 1
+        bfi.set_snapshot.assert_called_once_with("latest")
+
+        make_configs(tmp_path / "snapshot", {"spine1": "hostname spine1-new"})
+        adapter.init_batfish()
+        assert bfi.init_snapshot.call_count == 2
+
+        bfi.list_snapshots.return_value = []
+        adapter.init_batfish()
+        assert bfi.init_snapshot.call_count == 3
+
+
+def test_init_batfish_incremental_snapshot(network_importer_base, tmp_path):
+    adapter = network_importer_base
+    configs = {f"leaf{idx}": f"hostname leaf{idx}" for idx in range(10)}
+    make_configs(tmp_path / "snapshot", configs)
+    config.load(
+        config_data=dict(
+            main=dict(
+                backend="nautobot",
+                configs_directory=str(tmp_path / "snapshot"),
+                cache_directory=str(tmp_path / "cache"),
+            ),
+            batfish=dict(incremental_snapshot=True, incremental_snapshot_max_ratio=0.2),
+        )
+    )
+
+    with patch("network_importer.adapters.network_importer.adapter.Session") as session:
+        bfi = session.get.return_value
+        bfi.list_snapshots.return_value = []
+
+        # No existing snapshot, a new snapshot must be created
+        adapter.init_batfish()
+        assert bfi.init_snapshot.call_count == 1
+        assert load_snapshot_state()["name"] == "latest"
+
+        # 1 config modified and 1 config removed, the snapshot must be forked
+        bfi.list_snapshots.return_value = ["latest"]
+        make_configs(tmp_path / "snapshot", {"leaf0": "hostname leaf0-new"})
+        (tmp_path / "snapshot" / "configs" / "leaf1.txt").unlink()
+
+        def check_fork(base_name, name, overwrite, add_files, deactivate_nodes, restore_nodes):
+            assert base_name == "latest"
+            assert name == "latest-incremental"
+            assert overwrite
+            assert sorted(path.name for path in (tmp_path / add_files / "configs").iterdir()) == ["leaf0.txt"]
+            assert deactivate_nodes == ["leaf1"]
+            assert restore_nodes is None
+
+        bfi.fork_snapshot.side_effect = check_fork
+        adapter.init_batfish()
+        assert bfi.init_snapshot.call_count == 1
+        assert bfi.fork_snapshot.call_count == 1
+        bfi.delete_snapshot.assert_called_once_with("latest")
+        assert load_snapshot_state()["name"] == "latest-incremental"
+        assert load_snapshot_state()["deactivated_nodes"] == ["leaf1"]
+
+        # The config removed is back, the node must be restored
+        bfi.list_snapshots.return_value = ["latest-incremental"]
+        bfi.fork_snapshot.side_effect = None
+        make_configs(tmp_path / "snapshot", {"leaf1": "hostname leaf1"})
+        adapter.init_batfish()
+        assert bfi.fork_snapshot.call_count == 2
+        assert bfi.fork_snapshot.call_args[0] == ("latest-incremental",)
+        assert bfi.fork_snapshot.call_args[1]["name"] == "latest"
+        assert bfi.fork_snapshot.call_args[1]["restore_nodes"] == ["leaf1"]
+        assert bfi.fork_snapshot.call_args[1]["deactivate_nodes"] is None
+        assert load_snapshot_state()["deactivated_nodes"] == []
+
+        # Too many configs changed, a new snapshot must be created
+        bfi.list_snapshots.return_value = ["latest"]
+        make_configs(tmp_path / "snapshot", {f"leaf{idx}": f"hostname leaf{idx}-new" for idx in range(5)})
+        adapter.init_batfish()
+        assert bfi.fork_snapshot.call_count == 2
+        assert bfi.init_snapshot.call_count == 2
+
+
+def test_prepare_limited_snapshot(tmp_path):
+    make_configs(tmp_path / "snapshot", {"spine1": "hostname spine1", "spine2": "hostname spine2", "Leaf1": "leaf1"})
+    (tmp_path / "snapshot" / "batfish").mkdir()
+    (tmp_path / "snapshot" / "batfish" / "layer1_topology.json").write_text("{}")
+
+    configs = prepare_limited_snapshot(str(tmp_path / "snapshot"), str(tmp_path / "limited"), {"spine1", "leaf1"})
+    assert configs == ["Leaf1.txt", "spine1.txt"]
+    assert sorted(path.name for path in (tmp_path / "limited" / "configs").iterdir()) == ["Leaf1.txt", "spine1.txt"]
+    assert (tmp_path / "limited" / "batfish" / "layer1_topology.json").exists()
+
+    configs = prepare_limited_snapshot(str(tmp_path / "snapshot"), str(tmp_path / "limited"), {"spine2"})
+    assert sorted(path.name for path in (tmp_path / "limited" / "configs").iterdir()) == ["spine2.txt"]
+
+
+def test_save_load_neighbors(tmp_path):
+    config.load(config_data=dict(main=dict(backend="nautobot", cache_directory=str(tmp_path / "cache"))))
+    assert load_neighbors() == {}
+
+    save_neighbors(["spine1", "spine2"], {"spine1": ["leaf1", "leaf2", "leaf1"], "leaf1": ["spine1"]})
+    assert load_neighbors() == {"spine1": ["leaf1", "leaf2"], "spine2": []}
+
+    save_neighbors(["spine2"], {"spine2": ["leaf2"]})
+    assert load_neighbors() == {"spine1": ["leaf1", "leaf2"], "spine2": ["leaf2"]}
+
+
+def test_init_batfish_limit_snapshot(network_importer_base, tmp_path):
+    adapter = network_importer_base
+    make_configs(tmp_path / "snapshot", {"spine1": "hostname spine1", "leaf1": "hostname leaf1", "leaf2": "leaf2"})
+    config.load(
+        config_data=dict(
+            main=dict(
+                backend="nautobot",
+                configs_directory=str(tmp_path / "snapshot"),
+                cache_directory=str(tmp_path / "cache"),
+            ),
+            batfish=dict(limit_snapshot_neighbors=True),
+        )
+    )
+    save_neighbors(["spine1"], {"spine1": ["leaf1"]})
+
+    adapter.nornir = MagicMock()
+    adapter.nornir.inventory.hosts = {"spine1": MagicMock()}
+
+    with patch("network_importer.adapters.network_importer.adapter.Session") as session:
+        bfi = session.get.return_value
+
+        # Without limit, the complete snapshot must be used
+        adapter.init_batfish()
+        bfi.init_snapshot.assert_called_with(str(tmp_path / "snapshot"), name="latest", overwrite=True)
+
+        adapter.limit = "site=hou"
+        adapter.init_batfish()
+        limited_path = str(tmp_path / "cache" / "limited_snapshot")
+        bfi.init_snapshot.assert_called_with(limited_path, name="latest-limit", overwrite=True)
+        assert sorted(path.name for path in (tmp_path / "cache" / "limited_snapshot" / "configs").iterdir()) == [
+            "leaf1.txt",
+            "spine1.txt",
+        ]
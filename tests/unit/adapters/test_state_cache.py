@@ -0,0 +1,177 @@
+"""test for the local cache of the objects loaded from the SOT."""
+import time
+
+import pynetbox
+
+from network_importer.adapters.state_cache import SOTStateCache, get_references
+
+
+def fetch(endpoint, **filters):
+    return endpoint.filter(**filters)
+
+
+def vlan(vid, last_updated):
+    return {"id": vid, "vid": vid, "name": f"vlan{vid}", "last_updated": last_updated}
+
+
+def ip_address(remote_id, intf_id, intf_name, last_updated):
+    return {
+        "id": remote_id,
+        "address": f"10.0.0.{remote_id}/24",
+        "assigned_object_id": intf_id,
+        "assigned_object": {
+            "id": intf_id,
+            "url": f"http://localhost:8000/api/dcim/interfaces/{intf_id}/",
+            "name": intf_name,
+            "device": {"id": 1, "url": "http://localhost:8000/api/dcim/devices/1/", "name": "dev1"},
+        },
+        "last_updated": last_updated,
+    }
+
+
+def brief(url, ids, **filters):
+    """Return the arguments to mock a brief listing of the ids of a model."""
+    query = "&".join(f"{key}={value}" for key, value in dict(brief=1, **filters).items())
+    return f"{url}?{query}", {"json": {"count": len(ids), "next": None, "results": [{"id": idx} for idx in ids]}}
+
+
+def mock_brief(requests_mock, url, ids, updated_ids, since):
+    """Mock the listing of the ids of all objects of a model and of the objects updated."""
+    for ids_, filters in [(ids, {}), (updated_ids, dict(last_updated__gte=since))]:
+        mock_url, response = brief(url, ids_, **filters)
+        requests_mock.get(mock_url, **response)
+
+
+def test_state_cache_incremental(tmp_path, requests_mock):
+    netbox = pynetbox.api(url="http://mock", token="1234567890")
+    path = str(tmp_path / "netbox_state.json.gz")
+
+    requests_mock.get(
+        "http://mock/api/ipam/vlans/?site=nyc",
+        json={
+            "count": 2,
+            "next": None,
+            "results": [vlan(10, "2021-01-01T10:00:00Z"), vlan(20, "2021-01-02T10:00:00Z")],
+        },
+    )
+    cache = SOTStateCache(path=path, max_age=24)
+    assert [item.vid for item in cache.filter(netbox.ipam.vlans, dict(site="nyc"), fetch)] == [10, 20]
+    cache.save()
+
+    # vlan 10 has been deleted, vlan 20 renamed and vlan 30 created
+    requests_mock.reset_mock()
+    requests_mock.get(
+        "http://mock/api/ipam/vlans/?site=nyc&last_updated__gte=2021-01-02T10:00:00Z",
+        json={
+            "count": 2,
+            "next": None,
+            "results": [dict(vlan(20, "2021-01-03T10:00:00Z"), name="new"), vlan(30, "2021-01-03T11:00:00Z")],
+        },
+    )
+    mock_brief(requests_mock, "http://mock/api/ipam/vlans/", [20, 30], [20, 30], "2021-01-02T10:00:00Z")
+    mock_brief(requests_mock, "http://mock/api/dcim/sites/", [1], [], "2021-01-02T10:00:00Z")
+
+    cache = SOTStateCache(path=path, max_age=24)
+    cache.load()
+    vlans = cache.filter(netbox.ipam.vlans, dict(site="nyc"), fetch)
+    assert [(item.vid, item.name) for item in vlans] == [(20, "new"), (30, "vlan30")]
+    assert cache.nbr_updated == 2
+    assert cache.nbr_deleted == 1
+    assert len(requests_mock.request_history) == 5
+
+    cache.save()
+    cache = SOTStateCache(path=path, max_age=24)
+    cache.load()
+    assert cache.since == "2021-01-03T11:00:00Z"
+
+
+def test_state_cache_unchanged(tmp_path, requests_mock):
+    """Validate that the ids are listed once per model, and not once per query, when nothing changed."""
+    netbox = pynetbox.api(url="http://mock", token="1234567890")
+    path = str(tmp_path / "netbox_state.json.gz")
+
+    for site, vid in [("nyc", 10), ("sfo", 20)]:
+        requests_mock.get(
+            f"http://mock/api/ipam/vlans/?site={site}",
+            json={"count": 1, "next": None, "results": [vlan(vid, "2021-01-01T10:00:00Z")]},
+        )
+    cache = SOTStateCache(path=path, max_age=24)
+    for site in ["nyc", "sfo"]:
+        cache.filter(netbox.ipam.vlans, dict(site=site), fetch)
+    cache.save()
+
+    requests_mock.reset_mock()
+    mock_brief(requests_mock, "http://mock/api/ipam/vlans/", [10, 20], [], "2021-01-01T10:00:00Z")
+    mock_brief(requests_mock, "http://mock/api/dcim/sites/", [1, 2], [], "2021-01-01T10:00:00Z")
+
+    cache = SOTStateCache(path=path, max_age=24)
+    cache.load()
+    for site, vid in [("nyc", 10), ("sfo", 20)]:
+        assert [item.vid for item in cache.filter(netbox.ipam.vlans, dict(site=site), fetch)] == [vid]
+
+    assert len(requests_mock.request_history) == 4
+    assert all(req.qs["brief"] == ["1"] for req in requests_mock.request_history)
+    assert cache.nbr_updated == 0
+
+
+def test_state_cache_dependencies(tmp_path, requests_mock):
+    """Validate that the records referencing an object renamed are fetched again."""
+    netbox = pynetbox.api(url="http://mock", token="1234567890")
+    path = str(tmp_path / "netbox_state.json.gz")
+
+    requests_mock.get(
+        "http://mock/api/ipam/ip-addresses/?device_id=1",
+        json={
+            "count": 2,
+            "next": None,
+            "results": [
+                ip_address(1, 11, "Ethernet1", "2021-01-01T10:00:00Z"),
+                ip_address(2, 12, "Ethernet2", "2021-01-01T10:00:00Z"),
+            ],
+        },
+    )
+    cache = SOTStateCache(path=path, max_age=24)
+    cache.filter(netbox.ipam.ip_addresses, dict(device_id=1), fetch)
+    cache.save()
+
+    # Interface 11 has been renamed, the ip addresses themselves didn't change
+    requests_mock.reset_mock()
+    since = "2021-01-01T10:00:00Z"
+    mock_brief(requests_mock, "http://mock/api/ipam/ip-addresses/", [1, 2], [], since)
+    mock_brief(requests_mock, "http://mock/api/dcim/interfaces/", [11, 12], [11], since)
+    mock_brief(requests_mock, "http://mock/api/dcim/devices/", [1], [], since)
+    requests_mock.get(
+        "http://mock/api/ipam/ip-addresses/?device_id=1&id=1",
+        json={"count": 1, "next": None, "results": [ip_address(1, 11, "Ethernet1/1", "2021-01-01T10:00:00Z")]},
+    )
+
+    cache = SOTStateCache(path=path, max_age=24)
+    cache.load()
+    ips = cache.filter(netbox.ipam.ip_addresses, dict(device_id=1), fetch)
+    assert sorted((item.id, item.assigned_object["name"]) for item in ips) == [(1, "Ethernet1/1"), (2, "Ethernet2")]
+    assert requests_mock.last_request.qs == {"device_id": ["1"], "id": ["1"], "limit": ["0"]}
+    assert len(requests_mock.request_history) == 7
+    assert cache.nbr_updated == 1
+
+
+def test_get_references():
+    assert get_references(ip_address(1, 11, "Ethernet1", None)) == {("dcim/interfaces", "11"), ("dcim/devices", "1")}
+
+
+def test_state_cache_expired(requests_mock):
+    netbox = pynetbox.api(url="http://mock", token="1234567890")
+    requests_mock.get(
+        "http://mock/api/ipam/vlans/?site=nyc",
+        json={"count": 1, "next": None, "results": [vlan(10, "2021-01-01T10:00:00Z")]},
+    )
+
+    cache = SOTStateCache(path="unused", max_age=1)
+    cache.since = "2021-01-01T10:00:00Z"
+    cache.filter(netbox.ipam.vlans, dict(site="nyc"), fetch)
+    for entry in cache.queries.values():
+        entry["created"] = time.time() - 7200
+
+    requests_mock.reset_mock()
+    cache.filter(netbox.ipam.vlans, dict(site="nyc"), fetch)
+    assert len(requests_mock.request_history) == 1
+    assert "last_updated__gte" not in requests_mock.request_history[0].qs
@@ -38,6 +38,7 @@ def nornir(requests_mock):
 
     data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
     requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
 
     nornir = InitNornir(
         runner={"plugin": "threaded", "options": {"num_workers": 1}},
@@ -0,0 +1,38 @@
+"""test for the shared HTTP session."""
+import pytest
+
+import network_importer.config as config
+import network_importer.http_session as http_session
+from network_importer.http_session import get_http_session, get_http_stats
+
+
+@pytest.fixture(autouse=True)
+def clear_sessions():
+    """Remove the sessions created by the other tests."""
+    http_session.SESSIONS.clear()
+    yield
+    http_session.SESSIONS.clear()
+
+
+def test_get_http_session():
+    config.load(config_data=dict(main=dict(backend="netbox"), http=dict(pool_maxsize=50, max_retries=5)))
+
+    session = get_http_session(verify_ssl=True)
+    assert get_http_session(verify_ssl=True) is session
+    assert get_http_session(verify_ssl=False) is not session
+    assert get_http_session(verify_ssl=False).verify is False
+
+    adapter = session.get_adapter("https://netbox.local")
+    assert adapter is session.get_adapter("http://netbox.local")
+    assert adapter._pool_maxsize == 50  # pylint: disable=protected-access
+    assert adapter.max_retries.total == 5
+
+
+def test_get_http_stats():
+    config.load(config_data=dict(main=dict(backend="netbox")))
+    session = get_http_session()
+    pool = session.get_adapter("http://mock").poolmanager.connection_from_url("http://mock")
+    pool.num_requests = 3
+    pool.num_connections = 1
+
+    assert get_http_stats() == {"requests": 3, "misses": 1, "hits": 2}
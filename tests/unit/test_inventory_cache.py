@@ -0,0 +1,92 @@
+"""test for the local cache of the inventory."""
+# pylint: disable=E1101
+
+import gzip
+import json
+import time
+from os import path
+
+import yaml
+from nornir.core.plugins.inventory import InventoryPluginRegister
+
+from network_importer.adapters.netbox_api.inventory import NetBoxAPIInventory
+from network_importer.inventory_cache import CachedInventory
+
+HERE = path.abspath(path.dirname(__file__))
+FIXTURES = "adapters/netbox_api/fixtures/inventory"
+
+OPTIONS = dict(
+    username="user",
+    password="secretpassword",  # nosec
+    settings=dict(address="http://mock", token="12349askdnfanasdf"),  # nosec
+)
+
+
+def mock_netbox(requests_mock):
+    """Register the mock of the NetBox API used to build the inventory."""
+    data1 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/devices.json"))
+    requests_mock.get("http://mock/api/dcim/devices/?exclude=config_context", json=data1)
+
+    data2 = yaml.safe_load(open(f"{HERE}/{FIXTURES}/platforms.json"))
+    requests_mock.get("http://mock/api/dcim/platforms/", json=data2)
+    requests_mock.get("http://mock/api/dcim/virtual-chassis/", json={"count": 0, "next": None, "results": []})
+
+
+def test_cached_inventory(requests_mock, tmp_path):
+    """Validate that the inventory is loaded from the cache the second time, without the credentials."""
+    InventoryPluginRegister.register("NetBoxAPIInventory", NetBoxAPIInventory)
+    mock_netbox(requests_mock)
+
+    inv = CachedInventory("NetBoxAPIInventory", OPTIONS, str(tmp_path), ttl=10).load()
+    nbr_calls = requests_mock.call_count
+    assert len(inv.hosts.keys()) == 6
+
+    cached = CachedInventory("NetBoxAPIInventory", OPTIONS, str(tmp_path), ttl=10)
+    inv2 = cached.load()
+    assert requests_mock.call_count == nbr_calls
+
+    assert sorted(inv2.hosts.keys()) == sorted(inv.hosts.keys())
+    assert inv2.hosts["austin"].platform == "ios"
+    assert inv2.hosts["austin"].site_name == "ni_example_01"
+    assert inv2.hosts["austin"].connection_options["napalm"].platform == "ios_naplam"
+    assert inv2.hosts["austin"].data["device_record"] == inv.hosts["austin"].data["device_record"]
+    assert inv2.hosts["austin"].username == "user"
+    assert inv2.hosts["austin"].password == "secretpassword"  # nosec
+
+    with gzip.open(cached.path, "rt") as file_:
+        assert "secretpassword" not in file_.read()
+
+
+def test_cached_inventory_refresh(requests_mock, tmp_path):
+    """Validate that the inventory is built again when refresh is set or when the cache has expired."""
+    InventoryPluginRegister.register("NetBoxAPIInventory", NetBoxAPIInventory)
+    mock_netbox(requests_mock)
+
+    cached = CachedInventory("NetBoxAPIInventory", OPTIONS, str(tmp_path), ttl=10)
+    cached.load()
+    nbr_calls = requests_mock.call_count
+
+    CachedInventory("NetBoxAPIInventory", OPTIONS, str(tmp_path), ttl=10, refresh=True).load()
+    assert requests_mock.call_count == 2 * nbr_calls
+
+    with gzip.open(cached.path, "rt") as file_:
+        data = json.load(file_)
+    data["created"] = time.time() - 11 * 60
+    with gzip.open(cached.path, "wt") as file_:
+        json.dump(data, file_)
+
+    CachedInventory("NetBoxAPIInventory", OPTIONS, str(tmp_path), ttl=10).load()
+    assert requests_mock.call_count == 3 * nbr_calls
+
+
+def test_cached_inventory_key(tmp_path):
+    """Validate that a different limit or backend address uses a different cache."""
+    InventoryPluginRegister.register("NetBoxAPIInventory", NetBoxAPIInventory)
+
+    cached1 = CachedInventory("NetBoxAPIInventory", OPTIONS, str(tmp_path), ttl=10)
+    cached2 = CachedInventory("NetBoxAPIInventory", dict(OPTIONS, limit="austin"), str(tmp_path), ttl=10)
+    cached3 = CachedInventory(
+        "NetBoxAPIInventory", dict(OPTIONS, settings=dict(address="http://other")), str(tmp_path), ttl=10
+    )
+
+    assert len({cached1.path, cached2.path, cached3.path}) == 3
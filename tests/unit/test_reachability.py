@@ -0,0 +1,50 @@
+"""test for the reachability check."""
+import socket
+
+from network_importer.inventory import NetworkImporterHost
+from network_importer.reachability import check_hosts_reachable
+
+
+def test_check_hosts_reachable():
+    """Validate that the hosts accepting the connection are still reachable."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(5)
+    port = server.getsockname()[1]
+
+    hosts = {
+        "dev1": NetworkImporterHost(name="dev1", hostname="127.0.0.1"),
+        "dev2": NetworkImporterHost(name="dev2", hostname="127.0.0.1"),
+    }
+    for host in hosts.values():
+        host.is_reachable = True
+
+    try:
+        results = check_hosts_reachable(hosts, port=port, timeout=1, concurrency=1)
+    finally:
+        server.close()
+
+    assert results == {"dev1": True, "dev2": True}
+    assert hosts["dev1"].is_reachable
+    assert hosts["dev1"].status == "ok"
+
+
+def test_check_hosts_not_reachable():
+    """Validate that the hosts not accepting the connection are marked as not reachable."""
+    skt = socket.socket()
+    skt.bind(("127.0.0.1", 0))
+    port = skt.getsockname()[1]
+    skt.close()
+
+    hosts = {
+        "dev1": NetworkImporterHost(name="dev1", hostname="127.0.0.1"),
+        "dev2": NetworkImporterHost(name="dev2"),
+    }
+    for host in hosts.values():
+        host.is_reachable = True
+
+    assert check_hosts_reachable(hosts, port=port, timeout=1) == {"dev1": False}
+    assert hosts["dev1"].is_reachable is False
+    assert hosts["dev1"].status == "fail-ip"
+    assert hosts["dev1"].not_reachable_reason == f"device not reachable on port {port}"
+    assert hosts["dev2"].is_reachable
@@ -0,0 +1,141 @@
+"""Unit tests for ParallelSyncer."""
+import threading
+
+from diffsync import DiffSync
+
+from network_importer.diff import NetworkImporterDiff
+from network_importer.models import Site, Device, Interface, Cable, Vlan
+from network_importer.sync import ParallelSyncer
+
+
+class Recorder:
+    """Record the order in which the objects are created."""
+
+    def __init__(self):
+        self.created = []
+        self.lock = threading.Lock()
+
+    def record(self, item):
+        with self.lock:
+            self.created.append(item.get_unique_id())
+
+
+RECORDER = Recorder()
+
+
+class RecordedSite(Site):
+    @classmethod
+    def create(cls, diffsync, ids, attrs):
+        item = super().create(diffsync=diffsync, ids=ids, attrs=attrs)
+        RECORDER.record(item)
+        return item
+
+
+class RecordedDevice(Device):
+    @classmethod
+    def create(cls, diffsync, ids, attrs):
+        item = super().create(diffsync=diffsync, ids=ids, attrs=attrs)
+        RECORDER.record(item)
+        return item
+
+
+class RecordedInterface(Interface):
+    @classmethod
+    def create(cls, diffsync, ids, attrs):
+        item = super().create(diffsync=diffsync, ids=ids, attrs=attrs)
+        RECORDER.record(item)
+        return item
+
+
+class RecordedVlan(Vlan):
+    @classmethod
+    def create(cls, diffsync, ids, attrs):
+        item = super().create(diffsync=diffsync, ids=ids, attrs=attrs)
+        RECORDER.record(item)
+        return item
+
+
+class RecordedCable(Cable):
+    @classmethod
+    def create(cls, diffsync, ids, attrs):
+        item = super().create(diffsync=diffsync, ids=ids, attrs=attrs)
+        RECORDER.record(item)
+        return item
+
+
+class Network(DiffSync):
+    site = Site
+    device = Device
+    interface = Interface
+    vlan = Vlan
+    cable = Cable
+    top_level = ["site", "device", "cable"]
+
+
+class SOT(Network):
+    site = RecordedSite
+    device = RecordedDevice
+    interface = RecordedInterface
+    vlan = RecordedVlan
+    cable = RecordedCable
+
+    completed = False
+
+    def sync_complete(self, source, *args, **kwargs):
+        self.completed = True
+
+
+def build_network():
+    network = Network()
+    site = Site(name="nyc")
+    network.add(site)
+    vlan = Vlan(vid=10, site_name="nyc")
+    network.add(vlan)
+    site.add_child(vlan)
+
+    for dev_name in ["dev1", "dev2", "dev3"]:
+        device = Device(name=dev_name, site_name="nyc")
+        network.add(device)
+        for intf in [
+            Interface(name="eth0", device_name=dev_name, is_lag_member=True, parent="ae0"),
+            Interface(name="ae0", device_name=dev_name, is_lag=True),
+            Interface(name="eth1", device_name=dev_name),
+        ]:
+            network.add(intf)
+            device.add_child(intf)
+
+    network.add(Cable(device_a_name="dev1", interface_a_name="eth1", device_z_name="dev2", interface_z_name="eth1"))
+    return network
+
+
+def test_parallel_syncer():
+    network = build_network()
+    sot = SOT()
+    RECORDER.created = []
+
+    diff = sot.diff_from(network, diff_class=NetworkImporterDiff)
+    ParallelSyncer(diff=diff, src_diffsync=network, dst_diffsync=sot, max_workers=3).sync()
+
+    assert sot.completed
+    assert len(sot.get_all("interface")) == 9
+    assert not sot.diff_from(network, diff_class=NetworkImporterDiff).has_diffs()
+
+    created = RECORDER.created
+    assert created[:2] == ["nyc", "nyc__10"]
+    assert created[-1] == "dev1__eth1__dev2__eth1"
+    for dev_name in ["dev1", "dev2", "dev3"]:
+        assert created.index(dev_name) < created.index(f"{dev_name}__eth1")
+        assert created.index(f"{dev_name}__eth1") < created.index(f"{dev_name}__ae0")
+        assert created.index(f"{dev_name}__ae0") < created.index(f"{dev_name}__eth0")
+
+
+def test_parallel_syncer_no_changes():
+    network = build_network()
+    sot = SOT()
+    diff = sot.diff_from(network, diff_class=NetworkImporterDiff)
+    ParallelSyncer(diff=diff, src_diffsync=network, dst_diffsync=sot, max_workers=3).sync()
+
+    sot.completed = False
+    diff = sot.diff_from(network, diff_class=NetworkImporterDiff)
+    ParallelSyncer(diff=diff, src_diffsync=network, dst_diffsync=sot, max_workers=3).sync()
+    assert not sot.completed
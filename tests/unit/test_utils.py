@@ -1,4 +1,6 @@
 """Test utilities."""
+import pynetbox
+from pynetbox.core.query import Request
 
 from network_importer.utils import (
     expand_vlans_list,
@@ -7,6 +9,8 @@ from network_importer.utils import (
     is_interface_lag,
     is_mac_address,
     build_filter_params,
+    fetch_all_pages,
+    slugify,
 )
 
 
@@ -128,3 +132,34 @@ def test_build_filter_params():
     params = {"site": "jcy"}
     build_filter_params(["site", "device=dev"], params)
     assert params == {"device": "dev", "site": "jcy"}
+
+
+def test_fetch_all_pages(requests_mock):
+    """
+    Test fetching the pages of an endpoint concurrently, with a server enforcing a page size of 2
+    """
+    netbox = pynetbox.api(url="http://mock", token="1234567890")
+    vlans = [{"id": idx, "vid": idx, "name": f"vlan{idx}"} for idx in range(1, 6)]
+
+    for offset in [0, 2, 4]:
+        requests_mock.get(
+            f"http://mock/api/ipam/vlans/?site=nyc&offset={offset}",
+            json={"count": 5, "next": None if offset == 4 else "next", "results": vlans[offset : offset + 2]},
+        )
+
+    results = fetch_all_pages(netbox.ipam.vlans, Request, dict(site="nyc"), page_size=1000, max_workers=4)
+    assert [vlan.vid for vlan in results] == [1, 2, 3, 4, 5]
+    assert len(requests_mock.request_history) == 3
+    assert requests_mock.request_history[1].qs["limit"] == ["2"]
+
+
+def test_slugify():
+    """
+    Test the conversion of names into file names
+    """
+    assert slugify("hq_01.site-a") == "hq_01.site-a"
+    assert slugify("../etc").startswith("etc-")
+    assert "/" not in slugify("paris/center")
+    assert " " not in slugify("new york")
+    assert slugify("new york") != slugify("new/york")
+    assert slugify("..") not in ["", ".", ".."]